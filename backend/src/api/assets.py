@@ -0,0 +1,161 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: installed with the "production" extra
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+MIN_COMPRESS_BYTES = 256
+
+# Vite emits content-hashed names such as "index-BfX3k9aZ.js"
+_HASHED_NAME = re.compile(r"[-.][A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+# Variants written next to an asset at build time (e.g. by a compression plugin)
+_PRECOMPRESSED_EXTENSIONS = {".gz": "gzip", ".br": "br"}
+_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+class StaticAsset:
+    """
+    A static file held in memory together with its precompressed variants.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        body: bytes,
+        immutable: bool,
+        precompressed: Optional[Dict[str, bytes]] = None,
+    ):
+        """
+        Args:
+            path: URL path of the asset relative to the bundle root.
+            body: Raw file contents.
+            immutable: Whether the name is content-hashed and may be cached forever.
+            precompressed: Variants compressed at build time, by encoding; the
+                others are compressed here.
+        """
+        content_type, _ = mimetypes.guess_type(path)
+        self.content_type = content_type or "application/octet-stream"
+        if self.content_type.startswith("text/") or self.content_type == "application/javascript":
+            self.content_type += "; charset=utf-8"
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+
+        digest = hashlib.sha1(body).hexdigest()[:16]
+        self.__variants: Dict[str, Tuple[bytes, str]] = {"identity": (body, f'"{digest}"')}
+        if len(body) >= MIN_COMPRESS_BYTES and self.content_type.startswith(_COMPRESSIBLE_TYPES):
+            for encoding, compressed in _compress(body, precompressed or {}):
+                if len(compressed) < len(body):
+                    self.__variants[encoding] = (compressed, f'"{digest}-{encoding}"')
+
+    @property
+    def encodings(self) -> Tuple[str, ...]:
+        return tuple(self.__variants)
+
+    def select(self, accept_encoding: Optional[str]) -> Tuple[str, bytes, str]:
+        """
+        Pick the best variant for an Accept-Encoding header.
+
+        Returns:
+            (content encoding, body, etag)
+        """
+        accepted = _parse_accept_encoding(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.__variants and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                body, etag = self.__variants[encoding]
+                return encoding, body, etag
+        body, etag = self.__variants["identity"]
+        return "identity", body, etag
+
+
+class StaticBundle:
+    """
+    The built frontend loaded into memory once, so requests never touch the disk.
+    """
+
+    def __init__(self, assets: Optional[Dict[str, StaticAsset]] = None):
+        self.__assets = assets or {}
+
+    @classmethod
+    def load(cls, directory: str) -> "StaticBundle":
+        """
+        Read every file under a directory.
+
+        Files below `assets/` with content-hashed names are marked immutable;
+        everything else (index.html, favicons) must be revalidated.
+        `.gz` and `.br` files next to an asset are used as its variants
+        instead of compressing it here, which keeps maximum-quality brotli
+        out of startup. A missing directory yields an empty bundle.
+        """
+        assets = {}
+        for root, _, files in os.walk(directory):
+            names = set(files)
+            for name in files:
+                base, extension = os.path.splitext(name)
+                if extension in _PRECOMPRESSED_EXTENSIONS and base in names:
+                    continue
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, directory).replace(os.sep, "/")
+                body = _read(full_path)
+                precompressed = {
+                    encoding: _read(f"{full_path}{extension}")
+                    for extension, encoding in _PRECOMPRESSED_EXTENSIONS.items()
+                    if f"{name}{extension}" in names
+                }
+                immutable = path.startswith("assets/") and bool(_HASHED_NAME.search(name))
+                assets[path] = StaticAsset(path, body, immutable, precompressed)
+        return cls(assets)
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        return self.__assets.get(path)
+
+    def __len__(self) -> int:
+        return len(self.__assets)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def _compress(body: bytes, precompressed: Dict[str, bytes]) -> Iterable[Tuple[str, bytes]]:
+    if "gzip" in precompressed:
+        yield "gzip", precompressed["gzip"]
+    else:
+        yield "gzip", gzip.compress(body, compresslevel=9, mtime=0)
+    if "br" in precompressed:
+        yield "br", precompressed["br"]
+    elif brotli is not None:
+        yield "br", brotli.compress(body, quality=11)
+
+
+def _parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    accepted = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    return accepted
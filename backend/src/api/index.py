@@ -1,7 +1,9 @@
 import os
-from fastapi import APIRouter, FastAPI, Request
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.responses import Response
+
+from src.api.assets import StaticBundle, etag_matches
+from src.metrics.metrics import cache_lookups
 
 router = APIRouter()
 
@@ -9,14 +11,43 @@ router = APIRouter()
 def mount_static_files(app: FastAPI):
     """
     Setup static file serving for the React frontend.
+
+    The built `frontend/dist` is loaded into memory (with gzip and, when
+    available, brotli variants) once at startup and served from there.
     """
     current_dir = os.path.dirname(os.path.abspath(__file__))
     static_dir = os.path.abspath(os.path.join(current_dir, "../../../frontend/dist"))
-    assets_dir = os.path.join(static_dir, "assets")
 
-    if os.path.exists(assets_dir):
-        app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
     app.state.static_dir = static_dir
+    app.state.static_bundle = StaticBundle.load(static_dir)
+
+
+def _serve(request: Request, path: str) -> Response:
+    bundle = getattr(request.app.state, "static_bundle", None)
+    asset = bundle.get(path) if bundle is not None else None
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    encoding, body, etag = asset.select(request.headers.get("accept-encoding"))
+    headers = {"ETag": etag, "Cache-Control": asset.cache_control}
+    if len(asset.encodings) > 1:
+        headers["Vary"] = "Accept-Encoding"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        cache_lookups.inc("static_etag", "hit")
+        return Response(status_code=304, headers=headers)
+    cache_lookups.inc("static_etag", "miss")
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, headers=headers, media_type=asset.content_type)
+
+
+@router.get("/assets/{path:path}")
+async def read_asset(path: str, request: Request):
+    """
+    Serve a bundled frontend asset from memory.
+    """
+    return _serve(request, f"assets/{path}")
 
 
 @router.get("/")
@@ -24,11 +55,4 @@ async def read_index(request: Request):
     """
     Serve the main index.html for the game frontend.
     """
-    static_dir = getattr(request.app.state, "static_dir", None)
-
-    if not static_dir:
-        # Fallback if not set (though it should be)
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        static_dir = os.path.abspath(os.path.join(current_dir, "../../../frontend/dist"))
-
-    return FileResponse(os.path.join(static_dir, "index.html"))
+    return _serve(request, "index.html")
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+
+from src.api.models import (
+    LeaderboardEntry,
+    LeaderboardResponse,
+    LeaderboardStatsResponse,
+    RecommenderStatsInfo,
+)
+from src.config.limiter import limiter
+from src.config.settings import SETTINGS
+from src.leaderboard import leaderboard as leaderboard_module
+
+router = APIRouter()
+
+
+def _leaderboard():
+    """The configured leaderboard; the endpoints do not exist while it is disabled."""
+    board = leaderboard_module.leaderboard
+    if board is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return board
+
+
+@router.get("/leaderboard", response_model=LeaderboardResponse)
+@limiter.limit(SETTINGS.rate_limit.leaderboard)
+async def top_games(
+    request: Request,
+    board: str = Query(default="all", pattern=r"^(all|today|\d{4}-\d{2}-\d{2})$"),
+    limit: int = Query(default=10, ge=1),
+):
+    """
+    Best finished games, best first, for all time ("all"), the current UTC
+    day ("today") or a given UTC day ("YYYY-MM-DD").
+    """
+    # SQLite reads share a lock with the writes, so keep them off the event loop
+    games = await run_in_threadpool(_leaderboard().top, board, limit)
+    return LeaderboardResponse(
+        board=board,
+        entries=[
+            LeaderboardEntry(
+                score=game.score,
+                largest_number=game.largest_number,
+                turns=game.turns,
+                status=game.status,
+                recommender=game.recommender,
+                source=game.source,
+                finished_at=game.finished_at,
+            )
+            for game in games
+        ],
+    )
+
+
+@router.get("/leaderboard/stats", response_model=LeaderboardStatsResponse)
+@limiter.limit(SETTINGS.rate_limit.leaderboard)
+async def outcome_stats(request: Request, hours: float = Query(default=24.0, gt=0)):
+    """
+    Games, wins, largest tile distribution and turns histogram per
+    recommender over the last `hours`, at the granularity of the
+    statistics buckets.
+    """
+    stats = await run_in_threadpool(_leaderboard().stats, hours * 3600)
+    return LeaderboardStatsResponse(
+        hours=hours,
+        recommenders=[
+            RecommenderStatsInfo(
+                recommender=entry.recommender,
+                games=entry.games,
+                wins=entry.wins,
+                win_rate=entry.win_rate,
+                max_tiles=entry.max_tiles,
+                turns=entry.turns,
+            )
+            for entry in stats
+        ],
+    )
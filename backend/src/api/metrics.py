@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from src.metrics.metrics import metrics
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """
+    Expose the metrics of this worker process in the Prometheus text format.
+    """
+    return Response(content=metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,36 +1,80 @@
-from typing import List
-from pydantic import BaseModel
+from typing import Dict, List, Optional
+from pydantic import BaseModel, model_validator
 
 from src.game.board import Board
+from src.game.codec import EncodedGrid, GridFormat, decode_grid
 
 
 class MoveRequest(BaseModel):
-    """Schema for a move request containing the current grid and direction."""
-    grid: Board
+    """
+    Schema for a move request.
+
+    Either carries the signed state token of the last response (stateless
+    mode), the current grid and turn count (unverified stateless mode), or
+    only the id of a server-side session returned by `/new?session=true`.
+    The grid may be sent in any `GridFormat`; it is decoded to a nested
+    `Board` on validation, and the response grid uses the same format.
+    """
+    grid: Optional[EncodedGrid] = None
     direction: str
-    turns: int
+    turns: Optional[int] = None
+    session_id: Optional[str] = None
+    state_token: Optional[str] = None
+    grid_format: GridFormat = GridFormat.NESTED
+    recommender: Optional[str] = None  # "provider/model" followed by the player, for statistics
+
+    @model_validator(mode="after")
+    def check_state_source(self) -> "MoveRequest":
+        """Require a session id, a state token, or both the grid and the turn count."""
+        if self.session_id is None and self.state_token is None and (self.grid is None or self.turns is None):
+            raise ValueError("Provide either session_id, state_token, or both grid and turns")
+        if self.grid is not None:
+            self.grid = decode_grid(self.grid, self.grid_format)
+        return self
 
 
 class MoveResponse(BaseModel):
-    """Schema for a move response containing the new grid, status, best tile, and turn count."""
-    grid: Board
+    """
+    Schema for a move response containing the new grid, status, best tile, and turn count.
+    Stateless seeded games also get the signed token to send with the next move.
+    """
+    grid: EncodedGrid
     status: str
     largest_number: int
     turns: int
+    state_token: Optional[str] = None
+
+
+class HistoryRequest(BaseModel):
+    """Schema for an undo or redo request on a server-side session."""
+    session_id: str
+    grid_format: GridFormat = GridFormat.NESTED
 
 
 class RecommendationRequest(BaseModel):
-    """Schema for a recommendation request."""
-    grid: Board
+    """
+    Schema for a recommendation request.
+
+    The grid may be sent in any `GridFormat`; it is decoded to a nested
+    `Board` on validation, and the predicted grid uses the same format.
+    """
+    grid: EncodedGrid
     provider: str  # e.g., "ollama", "gemini", "heuristic"
     model: str  # e.g., "deepseek", "gemini-2.5-flash", "simple"
+    grid_format: GridFormat = GridFormat.NESTED
+
+    @model_validator(mode="after")
+    def decode_grid_format(self) -> "RecommendationRequest":
+        """Decode the grid from its wire format."""
+        self.grid = decode_grid(self.grid, self.grid_format)
+        return self
 
 
 class RecommendationResponse(BaseModel):
     """Schema for a recommendation response."""
     suggested_move: str
     rationale: str
-    predicted_grid: Board
+    predicted_grid: EncodedGrid
 
 
 class ModelInfo(BaseModel):
@@ -38,8 +82,53 @@ class ModelInfo(BaseModel):
     provider: str  # e.g., "ollama", "gemini", "heuristic"
     model: str  # e.g., "deepseek", "gemini-2.5-flash", "simple"
     display_name: str  # e.g., "Ollama - DeepSeek", "Gemini 2.5 Flash"
+    circuit_state: str = "closed"  # e.g., "closed", "open", "half_open"
 
 
 class ModelsResponse(BaseModel):
     """Schema for listing available models."""
     models: List[ModelInfo]
+
+
+class ProfileInfo(BaseModel):
+    """Schema for a stored request profile."""
+    name: str
+    size: int
+
+
+class ProfilesResponse(BaseModel):
+    """Schema for the list of stored request profiles, newest first."""
+    profiles: List[ProfileInfo]
+
+
+class LeaderboardEntry(BaseModel):
+    """Schema for a finished game on the leaderboard."""
+    score: int
+    largest_number: int
+    turns: int
+    status: str
+    recommender: str
+    source: str
+    finished_at: float
+
+
+class LeaderboardResponse(BaseModel):
+    """Schema for the best games of a leaderboard, best first."""
+    board: str
+    entries: List[LeaderboardEntry]
+
+
+class RecommenderStatsInfo(BaseModel):
+    """Schema for the outcomes of the games played with one recommender ("" for none)."""
+    recommender: str
+    games: int
+    wins: int
+    win_rate: float
+    max_tiles: Dict[int, int]
+    turns: Dict[int, int]
+
+
+class LeaderboardStatsResponse(BaseModel):
+    """Schema for outcome statistics per recommender over a time window."""
+    hours: float
+    recommenders: List[RecommenderStatsInfo]
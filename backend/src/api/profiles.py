@@ -0,0 +1,46 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from src.api.models import ProfileInfo, ProfilesResponse
+from src.config.settings import SETTINGS
+from src.profiling.profiler import profile_store
+
+router = APIRouter()
+
+
+def _authorize(token: Optional[str]) -> None:
+    """Hide the profile endpoints unless the admin token is configured and matches."""
+    admin_token = SETTINGS.profiling.admin_token
+    # Compared as bytes: compare_digest rejects non-ASCII str, and headers arrive latin-1 decoded
+    if not admin_token or token is None or not hmac.compare_digest(
+        token.encode("latin-1"), admin_token.encode()
+    ):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.get("/profiles", response_model=ProfilesResponse)
+async def list_profiles(x_profile_token: Optional[str] = Header(default=None)):
+    """
+    List the stored request profiles, newest first.
+    Requires the `X-Profile-Token` admin header.
+    """
+    _authorize(x_profile_token)
+    return ProfilesResponse(
+        profiles=[ProfileInfo(name=name, size=size) for name, size in profile_store.list()]
+    )
+
+
+@router.get("/profiles/{name}")
+async def download_profile(name: str, x_profile_token: Optional[str] = Header(default=None)):
+    """
+    Download a stored profile in the folded stack format.
+    Requires the `X-Profile-Token` admin header.
+    """
+    _authorize(x_profile_token)
+    path = profile_store.path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=name)
@@ -1,11 +1,26 @@
-from fastapi import APIRouter, HTTPException, Request
+import asyncio
+import hashlib
+from copy import deepcopy
+from functools import lru_cache
+from typing import Awaitable, Optional, Tuple, TypeVar
 
-from src.game.board import GameBoard
+from fastapi import APIRouter, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from src.game.board import GameBoard, new_seed
 from src.config.settings import SETTINGS
+from src.game.codec import MAX_EXPONENT, encode_grid
 from src.game.direction import Direction
+from src.game.session import sessions
+from src.game.state_token import StateTokenException, state_tokens
+from src.leaderboard.leaderboard import record_outcome
+from src.metrics.metrics import cache_lookups
+from src.recommendation.breaker import breakers
 from src.recommendation.registry import registry
 from src.recommendation.service import RecommendationService
+from src.recommendation.speculation import speculate
 from src.api.models import (
+    HistoryRequest,
     MoveRequest,
     MoveResponse,
     RecommendationRequest,
@@ -20,22 +35,66 @@ from src.config.limiter import limiter
 
 router = APIRouter()
 
+DISCONNECT_POLL_SECONDS = 0.1
+"""How often a long-running request checks whether its client is still connected."""
+
+CLIENT_CLOSED_REQUEST = 499
+
+T = TypeVar("T")
+
+
+async def _cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> Tuple[bool, T]:
+    """
+    Await a result, cancelling the work if the client disconnects first.
+
+    Returns:
+        (True, result) when the work completed, (False, None) when the client left.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return True, task.result()
+            if await request.is_disconnected():
+                return False, None
+    finally:
+        task.cancel()
+
 
 @router.post("/new", response_model=Board)
 @limiter.limit(SETTINGS.rate_limit.new_game)
-async def new_game(request: Request):
+async def new_game(request: Request, response: Response, session: bool = False):
     """
     Initialize a new game and return the starting grid.
+
+    With ``session=true`` the game state is kept on the server and its id is
+    returned in the ``X-Session-Id`` header, so later moves only need to send
+    the session id and direction. Otherwise the signed state of the game is
+    returned in the ``X-State-Token`` header, to be sent with the first move.
+    Answers 400 for ``session=true`` when sessions are disabled.
     """
-    game = GameBoard.create_new()
+    if session and not SETTINGS.session.enabled:
+        raise HTTPException(status_code=400, detail="Server-side sessions are disabled.")
+    # Games are seeded, so spawns are reproducible from the seed and turn count
+    game = GameBoard.create_new(seed=new_seed())
+    if session:
+        response.headers["X-Session-Id"] = sessions.create(game)
+    else:
+        response.headers["X-State-Token"] = state_tokens.issue(game)
     return game.get_board()
 
 
-@router.get("/models", response_model=ModelsResponse)
-@limiter.limit(SETTINGS.rate_limit.models)
-async def list_models(request: Request):
+@lru_cache(maxsize=1)
+def _render_models(revision: Tuple[int, int]) -> Tuple[bytes, str]:  # pylint: disable=unused-argument
     """
-    List all available recommendation models from the registry.
+    Serialize the model list once per registry and circuit breaker revision.
+
+    `revision` is not read: it only keys the cache, so a new revision
+    renders the list again.
+
+    Returns:
+        Tuple of (JSON body, ETag) for the models response.
     """
     models = registry.list_models()
     # Convert registry ModelInfo to API ModelInfo
@@ -43,11 +102,64 @@ async def list_models(request: Request):
         ModelInfo(
             provider=m.provider,
             model=m.model,
-            display_name=m.display_name
+            display_name=m.display_name,
+            circuit_state=breakers.state(m.provider, m.model).value,
         )
         for m in models
     ]
-    return ModelsResponse(models=api_models)
+    body = ModelsResponse(models=api_models).model_dump_json().encode()
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    return body, etag
+
+
+@router.get("/models", response_model=ModelsResponse)
+@limiter.limit(SETTINGS.rate_limit.models)
+async def list_models(request: Request):
+    """
+    List all available recommendation models from the registry.
+
+    Each model reports the state of its circuit breaker so clients can avoid
+    failing ones. The response is precomputed per registry and breaker
+    revision and carries an ETag, so clients revalidating with
+    ``If-None-Match`` get an empty 304.
+    """
+    registry.ensure_fresh()
+    misses = _render_models.cache_info().misses
+    body, etag = _render_models((registry.revision, breakers.revision))
+    rendered = _render_models.cache_info().misses != misses
+    cache_lookups.inc("models_render", "miss" if rendered else "hit")
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        cache_lookups.inc("models_etag", "hit")
+        return Response(status_code=304, headers=headers)
+    cache_lookups.inc("models_etag", "miss")
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _recommender_label(recommender: Optional[str]) -> str:
+    """The "provider/model" a player declared following, if it is a registered model."""
+    if not recommender or "/" not in recommender:
+        return ""
+    provider, model = recommender.split("/", 1)
+    return recommender if registry.has_model(provider, model) else ""
+
+
+def _exceeds_largest_tile(game: GameBoard, direction: Direction) -> bool:
+    """
+    Whether a move would leave a tile too large for the packed board encodings
+    (sessions, state tokens and the compact grid formats).
+
+    The move is tried on a copy, and only when the board already holds the
+    largest supported tile, so the game itself is left untouched.
+    """
+    largest_tile = 1 << MAX_EXPONENT
+    if game.largest_number() < largest_tile:
+        return False
+    trial = deepcopy(game)
+    direction.apply_to_board(trial)
+    return trial.largest_number() > largest_tile
 
 
 @router.post("/move", response_model=MoveResponse)
@@ -56,33 +168,114 @@ async def move(request: Request, move_request: MoveRequest):
     """
     Process a move based on the provided grid and direction.
     
-    This endpoint is stateless. It reconstructs the game state from the 
-    provided grid, performs the move, and returns the result.
-    """
-    # Reconstruct game state from the client-provided grid
-    game = GameBoard(
-        board=move_request.grid,
-        goal=SETTINGS.game.goal_number,
-        prop_numbers=[SETTINGS.game.start_number, SETTINGS.game.start_number * 2],
-        turns=move_request.turns
-    )
+    Without a session this endpoint is stateless. It reconstructs the game
+    state from the signed state token (or, unless tokens are required, the
+    provided grid), performs the move, and returns the result with the token
+    of the new state. With a session id, the state is loaded from and saved
+    to the session. Answers 409, leaving the game as it was, when the move
+    would merge two tiles of the largest supported value (32768).
+    """
+    session = None
+    if move_request.session_id is not None:
+        session = sessions.get(move_request.session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Session not found or expired.")
+        game = session.to_game()
+    elif move_request.state_token is not None:
+        try:
+            game = state_tokens.verify(move_request.state_token)
+        except StateTokenException as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+    else:
+        if SETTINGS.state_token.required:
+            raise HTTPException(status_code=400, detail="A state_token is required for stateless moves.")
+        # Reconstruct game state from the client-provided grid
+        game = GameBoard(
+            board=move_request.grid,
+            goal=SETTINGS.game.goal_number,
+            prop_numbers=[SETTINGS.game.start_number, SETTINGS.game.start_number * 2],
+            turns=move_request.turns
+        )
 
+    turns = game.turns
     try:
         direction = Direction(move_request.direction.lower())
-        direction.apply_to_board(game)
-    except ValueError:
+    except ValueError as e:
         raise HTTPException(
             status_code=400,
             detail="Invalid direction. Use up, down, left, or right."
+        ) from e
+    if _exceeds_largest_tile(game, direction):
+        raise HTTPException(
+            status_code=409,
+            detail=f"This move would create a tile above {1 << MAX_EXPONENT}, the largest one supported."
         )
+    try:
+        direction.apply_to_board(game)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    if session is not None:
+        session.update(game, direction)
+    if game.turns > turns and game.status().is_terminal:
+        # This move ended the game. Games rebuilt from a client-supplied grid
+        # are not recorded, as their state was never produced by the server
+        if session is not None and not (session.recorded or session.assisted):
+            # Games in which a move was undone are not recorded
+            session.recorded = True
+            await run_in_threadpool(record_outcome, game, "session", _recommender_label(move_request.recommender))
+        elif session is None and move_request.state_token is not None:
+            await run_in_threadpool(record_outcome, game, "token", _recommender_label(move_request.recommender))
+    elif game.turns > turns:
+        # The player will likely ask its recommender about the new board next
+        speculate(_recommender_label(move_request.recommender), game.get_board())
 
     return MoveResponse(
-        grid=game.get_board(),
+        grid=encode_grid(game.get_board(), move_request.grid_format),
         status=game.status().name,
         largest_number=game.largest_number(),
-        turns=game.turns
+        turns=game.turns,
+        state_token=state_tokens.issue(game) if session is None and game.seed is not None else None,
+    )
+
+
+@router.post("/undo", response_model=MoveResponse)
+@limiter.limit(SETTINGS.rate_limit.move)
+async def undo(request: Request, history_request: HistoryRequest):
+    """
+    Take back the last move of a session game.
+
+    Answers 409 when there is no move left to undo (the start of the game,
+    or the configured undo depth was reached) or the game is over. Games in
+    which a move was undone are not recorded on the leaderboard.
+    """
+    return _step_history(history_request, forward=False)
+
+
+@router.post("/redo", response_model=MoveResponse)
+@limiter.limit(SETTINGS.rate_limit.move)
+async def redo(request: Request, history_request: HistoryRequest):
+    """
+    Play the last undone move of a session game again, with the same spawn.
+
+    Answers 409 when there is no undone move, or a new move was played since.
+    """
+    return _step_history(history_request, forward=True)
+
+
+def _step_history(history_request: HistoryRequest, forward: bool) -> MoveResponse:
+    session = sessions.get(history_request.session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired.")
+    if not (session.redo() if forward else session.undo()):
+        raise HTTPException(status_code=409, detail=f"Nothing to {'redo' if forward else 'undo'}.")
+
+    game = session.to_game()
+    return MoveResponse(
+        grid=encode_grid(game.get_board(), history_request.grid_format),
+        status=game.status().name,
+        largest_number=game.largest_number(),
+        turns=game.turns,
     )
 
 
@@ -91,15 +284,24 @@ async def move(request: Request, move_request: MoveRequest):
 async def recommend(request: Request, rec_request: RecommendationRequest):
     """
     Get a move recommendation using the specified model.
+
+    Slow provider calls run in the threadpool and CPU-bound recommenders in
+    the process pool, so neither blocks the event loop. If the client
+    disconnects first, pending work is cancelled.
     """
-    result = RecommendationService.get_recommendation(
-        grid=rec_request.grid,
-        provider=rec_request.provider,
-        model=rec_request.model
+    completed, result = await _cancel_on_disconnect(
+        request,
+        RecommendationService.get_recommendation_async(
+            grid=rec_request.grid,
+            provider=rec_request.provider,
+            model=rec_request.model,
+        ),
     )
+    if not completed:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
 
     return RecommendationResponse(
         suggested_move=result.suggested_move,
         rationale=result.rationale,
-        predicted_grid=result.predicted_grid
+        predicted_grid=encode_grid(result.predicted_grid, rec_request.grid_format)
     )
@@ -0,0 +1,223 @@
+import asyncio
+from collections import Counter
+from copy import deepcopy
+from typing import Any, Dict, Optional, Set
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+from slowapi.util import get_remote_address
+from starlette.concurrency import run_in_threadpool
+
+from src.config.settings import SETTINGS
+# Registers the "shm://" storage scheme with `limits`
+from src.config import shared_storage  # pylint: disable=unused-import
+from src.game.board import GameBoard, new_seed
+from src.game.direction import Direction
+from src.game.journal import MoveLog, record_game
+from src.leaderboard.leaderboard import record_outcome
+from src.metrics.metrics import rate_limit_rejections
+from src.recommendation.registry import registry
+from src.recommendation import speculation
+from src.recommendation.service import RecommendationService
+
+router = APIRouter()
+
+# Rate limits per client address with the limits of the equivalent HTTP endpoints, counted
+# separately from them (under "ws" keys) in a storage of the same kind: per process for
+# "memory://", shared by the workers for "shm://" or Redis. Opening a new connection does not
+# reset them.
+_rate_storage = storage_from_string(SETTINGS.rate_limit.storage_uri)
+_rate_limiter = FixedWindowRateLimiter(_rate_storage)
+_RATE_LIMITS = {
+    "new": parse(SETTINGS.rate_limit.new_game),
+    "move": parse(SETTINGS.rate_limit.move),
+    "recommend": parse(SETTINGS.rate_limit.recommend),
+}
+
+
+class GameChannel:
+    """
+    State of a single `/ws/game` connection: the game being played and the
+    recommendation requests still in flight.
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.client_address = get_remote_address(websocket)
+        self.game: Optional[GameBoard] = None
+        self.moves = MoveLog()
+        self.recommenders: Counter = Counter()
+        self.pending: Set[asyncio.Task] = set()
+        self.__send_lock = asyncio.Lock()
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        """Send a message, serializing writes from concurrent tasks."""
+        async with self.__send_lock:
+            await self.websocket.send_json(message)
+
+    async def handle(self, message: Dict[str, Any]) -> None:
+        """Dispatch a single client message."""
+        kind = message.get("type")
+        if kind not in _RATE_LIMITS:
+            await self.send_error(message, f"Unknown message type: {kind}")
+            return
+        limit = _RATE_LIMITS[kind]
+        if not _rate_limiter.hit(limit, "ws", self.client_address, kind):
+            rate_limit_rejections.inc("/ws/game")
+            await self.send_error(message, f"Rate limit exceeded: {limit}")
+            return
+
+        if kind == "new":
+            self.record_game()
+            self.game = GameBoard.create_new(seed=new_seed())
+            self.moves = MoveLog()
+            self.recommenders.clear()
+            await self.send_board()
+        elif kind == "move":
+            await self.move(message)
+        else:
+            task = asyncio.create_task(self.recommend(message))
+            self.pending.add(task)
+            task.add_done_callback(self.pending.discard)
+
+    async def move(self, message: Dict[str, Any]) -> None:
+        """Apply a move to the current game."""
+        if self.game is None:
+            await self.send_error(message, "No game in progress, send a 'new' message first.")
+            return
+        try:
+            direction = Direction(str(message.get("direction", "")).lower())
+        except ValueError:
+            await self.send_error(message, "Invalid direction. Use up, down, left, or right.")
+            return
+        turns = self.game.turns
+        try:
+            direction.apply_to_board(self.game)
+        except Exception as e:
+            await self.send_error(message, str(e))
+            return
+        if self.game.turns > turns:
+            self.moves.append(direction)
+            if self.game.status().is_terminal:
+                await run_in_threadpool(record_outcome, self.game, "websocket", self.__main_recommender())
+            else:
+                speculation.speculate(self.__main_recommender(), self.game.get_board())
+        await self.send_board()
+
+    async def recommend(self, message: Dict[str, Any]) -> None:
+        """Answer a recommendation request for the board as it is now."""
+        if self.game is None:
+            await self.send_error(message, "No game in progress, send a 'new' message first.")
+            return
+        if self.game.status().is_terminal:
+            await self.send_error(message, f"The game is over ({self.game.status().name}), send a 'new' message.")
+            return
+        provider = str(message.get("provider", "heuristic"))
+        model = str(message.get("model", "simple"))
+        try:
+            result = await RecommendationService.get_recommendation_async(
+                grid=self.game.get_board(),
+                provider=provider,
+                model=model,
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            await self.send_error(message, str(e))
+            return
+        await self.send({
+            "type": "recommendation",
+            "id": message.get("id"),
+            "suggested_move": result.suggested_move,
+            "rationale": result.rationale,
+            "predicted_grid": result.predicted_grid,
+        })
+        if registry.has_model(provider, model):
+            self.recommenders[f"{provider}/{model}"] += 1
+            self.speculate_successor(f"{provider}/{model}", result.suggested_move)
+
+    def speculate_successor(self, recommender: str, suggested_move: str) -> None:
+        """
+        Precompute the recommendation for the board after the suggested move.
+
+        The game is seeded, so the tile that move spawns is known and the
+        successor is exactly the board the player asks about next if they
+        follow the suggestion. Speculation is best effort and never fails
+        the recommendation it follows.
+        """
+        if speculation.speculator is None or self.game.status().is_terminal:
+            return
+        successor = deepcopy(self.game)
+        turns = successor.turns
+        try:
+            Direction(suggested_move).apply_to_board(successor)
+            if successor.turns > turns and not successor.status().is_terminal:
+                speculation.speculate(recommender, successor.get_board())
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+
+    async def send_board(self) -> None:
+        """Send the current state of the game."""
+        game = self.game
+        await self.send({
+            "type": "board",
+            "grid": game.get_board(),
+            "status": game.status().name,
+            "largest_number": game.largest_number(),
+            "turns": game.turns,
+        })
+
+    async def send_error(self, message: Dict[str, Any], detail: str) -> None:
+        """Send an error in reply to a client message."""
+        await self.send({"type": "error", "id": message.get("id"), "detail": detail})
+
+    def record_game(self) -> None:
+        """Journal the current game, if any, before it is replaced or the connection closes."""
+        if self.game is not None:
+            record_game(self.game.seed, len(self.game.get_board()), self.moves)
+
+    def __main_recommender(self) -> str:
+        """The recommender asked most often during the game, "" if none was."""
+        most_common = self.recommenders.most_common(1)
+        return most_common[0][0] if most_common else ""
+
+    def close(self) -> None:
+        """Journal the game and cancel outstanding work; the client's rate limit counters are kept."""
+        self.record_game()
+        for task in self.pending:
+            task.cancel()
+
+
+@router.websocket("/ws/game")
+async def game_channel(websocket: WebSocket):
+    """
+    Play a whole game over a single WebSocket connection.
+
+    Client messages are JSON objects with a ``type``:
+        - ``{"type": "new"}`` starts a game and replies with a ``board`` message.
+        - ``{"type": "move", "direction": "up"}`` replies with a ``board`` message.
+        - ``{"type": "recommend", "id": 1, "provider": "heuristic", "model": "simple"}``
+          replies with a ``recommendation`` message carrying the same ``id``. Moves
+          keep being processed while recommendations are computed.
+
+    Invalid or rate-limited messages get an ``error`` reply without closing
+    the connection. Rate limits apply per client address, across connections.
+    """
+    await websocket.accept()
+    channel = GameChannel(websocket)
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except (ValueError, KeyError):
+                # KeyError: a binary frame, which has no text to decode
+                await channel.send_error({}, "Messages must be JSON objects.")
+                continue
+            if not isinstance(message, dict):
+                await channel.send_error({}, "Messages must be JSON objects.")
+                continue
+            await channel.handle(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        channel.close()
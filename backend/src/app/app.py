@@ -1,4 +1,9 @@
-from fastapi import FastAPI
+# Imported first, so the import phase of the startup report covers everything below
+from src.app.startup import startup_timer  # pylint: disable=wrong-import-order
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -6,15 +11,81 @@ from slowapi.middleware import SlowAPIMiddleware
 
 from src.api.index import mount_static_files
 from src.api.index import router as index_router
+from src.api.leaderboard import router as leaderboard_router
+from src.api.metrics import router as metrics_router
+from src.api.profiles import router as profiles_router
 from src.api.routes import router as api_router
+from src.api.websocket import router as websocket_router
 from src.config.limiter import limiter
 from src.config.settings import SETTINGS
+from src.game.journal import journal
+from src.game.session import sessions
+from src.leaderboard.leaderboard import leaderboard
+from src.metrics.metrics import EventLoopLagMonitor, event_loop_lag, metrics, rate_limit_rejections
+from src.metrics.middleware import MetricsMiddleware
+from src.profiling.middleware import ProfilingMiddleware
+from src.profiling.profiler import profile_store
+from src.recommendation.offload import offload_pool
+from src.recommendation.registry import registry
+
+loop_lag_monitor = EventLoopLagMonitor(
+    event_loop_lag,
+    interval=SETTINGS.metrics.event_loop_lag_interval_seconds if SETTINGS.metrics.enabled else 0,
+)
+metrics.callback(
+    "recommendation_pool_pending", "Requests queued or running in the recommendation process pool.",
+    lambda: {(): offload_pool.pending},
+)
+metrics.callback(
+    "recommendation_pool_speculating", "Speculative requests queued or running in the recommendation process pool.",
+    lambda: {(): offload_pool.speculating},
+)
+metrics.callback(
+    "game_sessions", "Server-side game sessions held in memory.",
+    lambda: {(): len(sessions)},
+)
+metrics.callback(
+    "startup_phase_seconds", "Duration of the startup phases of the worker.",
+    lambda: {
+        **{(name,): seconds for name, seconds in startup_timer.phases.items()},
+        **({("discovery",): registry.discovery_seconds} if registry.discovery_seconds is not None else {}),
+    },
+    labels=("phase",),
+)
+
 
-app = FastAPI(title="Khair 2048 Backend")
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """
+    Start model discovery in the background and warm the recommendation process
+    pool, so the first request pays for neither, then print the startup report.
+    """
+    with startup_timer.phase("lifespan"):
+        registry.refresh_in_background()
+        offload_pool.start()
+        loop_lag_monitor.start()
+    print(startup_timer.report(registry.discovery_seconds))
+    yield
+    await loop_lag_monitor.stop()
+    offload_pool.shutdown()
+    sessions.clear()
+    if journal is not None:
+        journal.close()
+    if leaderboard is not None:
+        leaderboard.close()
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
+    """Count the rejection, then answer with slowapi's 429 response."""
+    rate_limit_rejections.inc(request.url.path)
+    return _rate_limit_exceeded_handler(request, exc)
+
+
+app = FastAPI(title="Khair 2048 Backend", lifespan=lifespan)
 
 # Initialize Rate Limiter
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 app.add_middleware(SlowAPIMiddleware)
 
 # Add CORS allow origins middleware
@@ -29,14 +100,44 @@ app.add_middleware(
         "X-RateLimit-Reset",
         "X-RateLimit-Remaining",
         "X-RateLimit-Limit",
+        "X-Session-Id",
+        "X-State-Token",
+        "X-Profile-Id",
     ],
 )
 
+# Profile requests on demand (admin header) or by sampling
+if SETTINGS.profiling.admin_token or SETTINGS.profiling.sample_rate > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        admin_token=SETTINGS.profiling.admin_token,
+        sample_rate=SETTINGS.profiling.sample_rate,
+        routes=SETTINGS.profiling.routes,
+        interval=SETTINGS.profiling.interval_seconds,
+    )
+
+# Record request counts and latency, outermost so rate-limited requests are included
+if SETTINGS.metrics.enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Include the API router with the prefix
 app.include_router(api_router, prefix="/api")
+app.include_router(profiles_router, prefix="/api")
+app.include_router(leaderboard_router, prefix="/api")
+
+# Include the WebSocket game channel
+app.include_router(websocket_router)
+
+# Expose metrics for Prometheus scraping
+if SETTINGS.metrics.enabled:
+    app.include_router(metrics_router)
+
+startup_timer.mark("import")
 
 # Mount static files
-mount_static_files(app)
+with startup_timer.phase("static"):
+    mount_static_files(app)
 
 # Include the index router (for root "/")
 app.include_router(index_router)
@@ -0,0 +1,163 @@
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Set
+
+import uvicorn
+
+from src.config.settings import SETTINGS, AppSettings
+
+APP_PATH = "src.app.app:app"
+RESPAWN_DELAY_SECONDS = 1.0
+
+
+def resolve_workers(app_settings: AppSettings) -> int:
+    """Number of worker processes to run, one per CPU when not configured."""
+    return app_settings.workers or os.cpu_count() or 1
+
+
+def build_config(app_settings: AppSettings) -> uvicorn.Config:
+    """
+    Build the uvicorn configuration of a production worker.
+
+    Args:
+        app_settings: Application server settings.
+
+    Returns:
+        The uvicorn configuration.
+    """
+    return uvicorn.Config(
+        APP_PATH,
+        host=app_settings.host,
+        port=app_settings.port,
+        loop=app_settings.loop,
+        http=app_settings.http,
+        backlog=app_settings.backlog,
+        timeout_keep_alive=app_settings.timeout_keep_alive,
+        timeout_graceful_shutdown=app_settings.timeout_graceful_shutdown,
+        proxy_headers=True,
+        server_header=False,
+    )
+
+
+def preload(config: uvicorn.Config) -> None:
+    """
+    Load the app and its shared read-only data in the current process.
+
+    Called in the supervisor before forking, so workers inherit everything
+    imported here. Objects are then frozen out of the garbage collector's
+    reach, so collections in workers do not touch (and copy) the shared pages.
+    """
+    config.load()
+    gc.collect()
+    gc.freeze()
+
+
+def serve(app_settings: AppSettings) -> None:
+    """
+    Run the server in production mode.
+
+    The supervisor binds the listening socket, optionally preloads the app,
+    then forks the workers which all accept on the shared socket. Workers
+    that die unexpectedly are replaced. SIGTERM or SIGINT is forwarded to
+    every worker, which stops accepting, finishes in-flight requests within
+    the graceful shutdown timeout, then exits.
+
+    Args:
+        app_settings: Application server settings.
+    """
+    config = build_config(app_settings)
+    workers = resolve_workers(app_settings)
+    if workers > 1 and SETTINGS.session.enabled:
+        print(
+            f"Warning: running {workers} workers with server-side sessions enabled. Sessions are kept "
+            "per worker, so they need a single worker (APP__WORKERS=1) or sticky routing; "
+            "set SESSION__ENABLED=false to serve stateless token games only."
+        )
+
+    if not hasattr(os, "fork"):
+        # No fork (e.g. Windows): fall back to uvicorn's own spawn-based workers
+        uvicorn.run(
+            APP_PATH,
+            host=config.host,
+            port=config.port,
+            workers=workers,
+            loop=config.loop,
+            http=config.http,
+            backlog=config.backlog,
+            timeout_keep_alive=config.timeout_keep_alive,
+            timeout_graceful_shutdown=config.timeout_graceful_shutdown,
+        )
+        return
+
+    if app_settings.preload:
+        preload(config)
+    sock = config.bind_socket()
+    if workers == 1:
+        uvicorn.Server(config).run(sockets=[sock])
+        return
+
+    Supervisor(config, sock, workers).run()
+
+
+class Supervisor:
+    """
+    Pre-fork supervisor running uvicorn workers on a shared listening socket.
+    """
+
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int):
+        self.__config = config
+        self.__sock = sock
+        self.__workers = workers
+        self.__children: Set[int] = set()
+        self.__stopping = False
+
+    def run(self) -> None:
+        """Fork the workers and keep them running until a shutdown signal arrives."""
+        for _ in range(self.__workers):
+            self.__spawn()
+
+        signal.signal(signal.SIGTERM, self.__stop)
+        signal.signal(signal.SIGINT, self.__stop)
+        print(f"Supervising {self.__workers} workers (pid {os.getpid()}).")
+
+        while self.__children:
+            try:
+                pid, _ = os.wait()
+            except ChildProcessError:
+                break
+            self.__children.discard(pid)
+            if not self.__stopping:
+                print(f"Worker {pid} exited unexpectedly, starting a replacement.")
+                time.sleep(RESPAWN_DELAY_SECONDS)
+                self.__spawn()
+
+        self.__sock.close()
+
+    def __stop(self, _signum: int, _frame: object) -> None:
+        self.__stopping = True
+        for pid in list(self.__children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def __spawn(self) -> None:
+        pid = os.fork()
+        if pid != 0:
+            self.__children.add(pid)
+            return
+
+        # Own process group, so a terminal Ctrl+C reaches only the supervisor,
+        # which forwards a single shutdown signal
+        os.setpgid(0, 0)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            uvicorn.Server(self.__config).run(sockets=[self.__sock])
+        except BaseException:  # pylint: disable=broad-exception-caught
+            exit_code = 1
+        os._exit(exit_code)
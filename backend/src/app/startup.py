@@ -0,0 +1,53 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+
+class StartupTimer:
+    """
+    Durations of the phases a worker goes through before serving requests.
+
+    Created when this module is first imported, which `src.app.app` does
+    before anything else, so the "import" phase covers loading the whole
+    backend. Model discovery runs in the background and is reported by the
+    registry once it has finished.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.__clock = clock
+        self.__started = clock()
+        self.__phase_started = self.__started
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        """End a phase that started when the previous phase ended."""
+        now = self.__clock()
+        self.phases[name] = now - self.__phase_started
+        self.__phase_started = now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block as a phase."""
+        start = self.__clock()
+        try:
+            yield
+        finally:
+            self.__phase_started = self.__clock()
+            self.phases[name] = self.__phase_started - start
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the timer was created."""
+        return self.__clock() - self.__started
+
+    def report(self, discovery_seconds: Optional[float] = None) -> str:
+        """One-line summary of the phases, e.g. for the server log."""
+        parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items()]
+        if discovery_seconds is None:
+            parts.append("discovery in background")
+        else:
+            parts.append(f"discovery {discovery_seconds * 1000:.0f}ms")
+        return f"Startup: ready in {self.elapsed * 1000:.0f}ms ({', '.join(parts)})"
+
+
+startup_timer = StartupTimer()
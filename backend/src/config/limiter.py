@@ -1,6 +1,10 @@
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from src.config.settings import SETTINGS
+# Registers the "shm://" storage scheme with `limits`
+from src.config import shared_storage  # pylint: disable=unused-import
+
 # Initialize the global limiter
 # It uses the client's IP address (remote address) as the unique identifier for tracking limits.
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_remote_address, storage_uri=SETTINGS.rate_limit.storage_uri)
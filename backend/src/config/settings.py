@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Literal
 
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -13,11 +13,34 @@ class AppSettings(BaseModel):
         port (int): Port number the server listens on. Defaults to 8000.
         hot_reload (bool): Enable auto-reload for development. Defaults to True.
         cors_allow_origins (List[str]): Hostnames to allow CORS middleware. Defaults to ["*"].
+        server_mode (str): "development" runs a single (optionally reloading) process,
+                           "production" runs pre-forked workers. Defaults to "development".
+        workers (int): Number of worker processes in production mode; 0 uses one per CPU.
+                       Defaults to 0.
+        loop (str): Event loop implementation ("auto", "asyncio" or "uvloop"). "auto" picks
+                    uvloop when installed. Defaults to "auto".
+        http (str): HTTP protocol implementation ("auto", "h11" or "httptools"). "auto" picks
+                    httptools when installed. Defaults to "auto".
+        timeout_keep_alive (int): Seconds to keep idle keep-alive connections open. Defaults to 5.
+        backlog (int): Maximum number of pending connections on the listening socket.
+                       Defaults to 2048.
+        timeout_graceful_shutdown (int): Seconds to let in-flight requests finish on shutdown.
+                                         Defaults to 30.
+        preload (bool): Import the app and its shared read-only data before forking workers,
+                        so workers share those pages copy-on-write. Defaults to True.
     """
     host: str = "127.0.0.1"
     port: int = 8000
     hot_reload: bool = True
     cors_allow_origins: List[str] = ["*"]
+    server_mode: Literal["development", "production"] = "development"
+    workers: int = 0
+    loop: Literal["auto", "asyncio", "uvloop"] = "auto"
+    http: Literal["auto", "h11", "httptools"] = "auto"
+    timeout_keep_alive: int = 5
+    backlog: int = 2048
+    timeout_graceful_shutdown: int = 30
+    preload: bool = True
 
 
 class GameSettings(BaseModel):
@@ -45,8 +68,16 @@ class OllamaSettings(BaseModel):
     Attributes:
         host (str): Base URL for the Ollama API. Defaults to "http://localhost:11434".
         allowed_models (List[str]): List of allowed model names. Empty list means no models allowed.
+        timeout_seconds (float): Timeout applied to every request made by the client. Defaults to 5.0.
+        num_parallel (int): Maximum concurrent chat calls; should match the server's
+                            `OLLAMA_NUM_PARALLEL`. Defaults to 4.
+        batch_window_seconds (float): Time to gather concurrent requests for the same model
+                                      before sending them. Defaults to 0.005.
     """
     host: str = "http://localhost:11434"
+    timeout_seconds: float = 5.0
+    num_parallel: int = 4
+    batch_window_seconds: float = 0.005
     allowed_models: List[str] = [
         "deepseek-r1:8b",
         "llama3.1:8b",
@@ -61,8 +92,10 @@ class GeminiSettings(BaseModel):
         api_key (str): API key for Gemini. Set as an empty string to disable or
                        when not configured. Defaults to "".
         allowed_models (List[str]): List of allowed model names. Defaults to stable versions only.
+        timeout_seconds (float): Timeout applied to every request made by the client. Defaults to 10.0.
     """
     api_key: str = ""
+    timeout_seconds: float = 10.0
     allowed_models: List[str] = [
         "gemini-2.5-flash",
         "gemini-2.0-flash",
@@ -70,6 +103,60 @@ class GeminiSettings(BaseModel):
     ]
 
 
+class CircuitBreakerSettings(BaseModel):
+    """
+    Circuit breaker configuration applied to every provider/model pair.
+
+    Attributes:
+        window_size (int): Number of most recent calls used to compute the failure rate. Defaults to 20.
+        min_calls (int): Minimum calls in the window before the circuit may open. Defaults to 5.
+        failure_rate_threshold (float): Failure rate (0-1) at which the circuit opens. Defaults to 0.5.
+        slow_call_seconds (float): Calls slower than this count as failures. Defaults to 10.0.
+        open_seconds (float): Time an open circuit rejects calls before probing. Defaults to 30.0.
+        half_open_probes (int): Concurrent probe calls allowed while half-open. Defaults to 1.
+    """
+    window_size: int = 20
+    min_calls: int = 5
+    failure_rate_threshold: float = 0.5
+    slow_call_seconds: float = 10.0
+    open_seconds: float = 30.0
+    half_open_probes: int = 1
+
+
+class OffloadSettings(BaseModel):
+    """
+    Process pool for CPU-bound recommenders, so searches never stall the event loop.
+
+    Attributes:
+        workers (int): Pool processes per server worker; 0 disables the pool. Defaults to 2.
+        max_pending (int): Maximum requests queued or running in the pool; further requests
+                           fall back to the simple heuristic. Defaults to 16.
+        models (List[str]): "provider/model" recommenders run in the pool. Only local
+                            (heuristic) recommenders can be offloaded; all others run inline
+                            in the threadpool. Defaults to ["heuristic/expectimax"].
+    """
+    workers: int = 2
+    max_pending: int = 16
+    models: List[str] = ["heuristic/expectimax"]
+
+
+class SpeculationSettings(BaseModel):
+    """
+    Speculative recommendations for the boards players are about to ask about.
+
+    Attributes:
+        enabled (bool): After a move (or a WebSocket recommendation) by a player following an
+                        offloaded recommender, recommend for the next board on an idle pool
+                        worker and cache the result. Defaults to False.
+        cpu_budget (float): Share of the pool's worker CPU time speculation may use, between
+                            0 and 1. Defaults to 0.25.
+        cache_size (int): Recommendations kept in the cache. Defaults to 4096.
+    """
+    enabled: bool = False
+    cpu_budget: float = 0.25
+    cache_size: int = 4096
+
+
 class RecommendationSettings(BaseModel):
     """
     Recommendation system settings, grouping engine-specific configs.
@@ -77,20 +164,151 @@ class RecommendationSettings(BaseModel):
     Attributes:
         ollama (OllamaSettings): Ollama sub-configuration.
         gemini (GeminiSettings): Gemini sub-configuration.
+        discovery_ttl_seconds (float): How long a discovered provider model list is served
+                                       before it is refreshed in the background. Defaults to 300.0.
+        circuit_breaker (CircuitBreakerSettings): Circuit breaker sub-configuration.
+        offload (OffloadSettings): Process pool sub-configuration.
+        speculation (SpeculationSettings): Speculative recommendation sub-configuration.
+        tablebase_directory (str): Directory of the solved tablebases served by the
+                                   "heuristic/perfect" recommender. Defaults to "tablebases".
     """
     ollama: OllamaSettings = OllamaSettings()
     gemini: GeminiSettings = GeminiSettings()
+    discovery_ttl_seconds: float = 300.0
+    circuit_breaker: CircuitBreakerSettings = CircuitBreakerSettings()
+    offload: OffloadSettings = OffloadSettings()
+    speculation: SpeculationSettings = SpeculationSettings()
+    tablebase_directory: str = "tablebases"
 
 
 class RateLimitSettings(BaseModel):
     """
     API rate limiting configuration.
     Values should be in the format "limit/period" (e.g., "60/minute").
+
+    `storage_uri` selects where counters are kept: "memory://" (per process),
+    "shm://[/path][?slots=N]" (a memory-mapped table shared by every worker on
+    the host) or any URI supported by `limits`, such as "redis://localhost:6379"
+    for a local Redis-compatible server (requires the `redis` package).
     """
+    storage_uri: str = "memory://"
     move: str = "60/minute"
     new_game: str = "10/minute"
     recommend: str = "20/minute"
     models: str = "10/minute"
+    leaderboard: str = "30/minute"
+
+
+class SessionSettings(BaseModel):
+    """
+    Server-side game session configuration.
+
+    Attributes:
+        enabled (bool): Allow server-side sessions (``/new?session=true``). Sessions live in the
+                        memory of one worker process, so with several production workers they
+                        need sticky routing; disable them to serve token games only. Defaults to True.
+        idle_seconds (float): Seconds of inactivity after which a session is evicted. Defaults to 1800.
+        max_sessions (int): Maximum number of sessions held in memory; the least recently
+                            used session is evicted beyond it. Defaults to 100000.
+        undo_depth (int): Number of moves of a session that can be undone; 0 disables
+                          undo. Defaults to 16.
+    """
+    enabled: bool = True
+    idle_seconds: float = 1800.0
+    max_sessions: int = 100_000
+    undo_depth: int = 16
+
+
+class StateTokenSettings(BaseModel):
+    """
+    Signed state tokens of stateless games.
+
+    Attributes:
+        secret (str): Secret the token's HMAC and seed encryption keys are derived from,
+                      shared by every server accepting the tokens. Empty uses a
+                      random key per process, valid across workers only when the app is
+                      preloaded before forking. Defaults to "".
+        required (bool): Reject stateless moves that send a grid instead of a token.
+                         Defaults to False.
+    """
+    secret: str = ""
+    required: bool = False
+
+
+class JournalSettings(BaseModel):
+    """
+    Append-only journal of server-side games (sessions and WebSocket games).
+
+    Attributes:
+        enabled (bool): Record every server-side game when it ends or is evicted. Defaults to False.
+        directory (str): Directory holding the journal segment files. Defaults to "journal".
+        segment_bytes (int): Size after which a new segment file is started. Defaults to 64 MiB.
+    """
+    enabled: bool = False
+    directory: str = "journal"
+    segment_bytes: int = 64 * 1024 * 1024
+
+
+class LeaderboardSettings(BaseModel):
+    """
+    Leaderboard and outcome statistics of finished games.
+
+    Attributes:
+        enabled (bool): Record finished games and serve `/api/leaderboard`. Defaults to False.
+        path (str): SQLite database file, which worker processes may share.
+                    Defaults to "leaderboard.sqlite3".
+        top_k (int): Number of games kept on each board (all time and per UTC day). Defaults to 100.
+        bucket_seconds (int): Width of the time buckets statistics are aggregated in.
+                              Defaults to 3600.
+        retention_days (int): Days of daily boards, statistics and recorded game seeds kept. Defaults to 30.
+    """
+    enabled: bool = False
+    path: str = "leaderboard.sqlite3"
+    top_k: int = 100
+    bucket_seconds: int = 3600
+    retention_days: int = 30
+
+
+class MetricsSettings(BaseModel):
+    """
+    Built-in metrics configuration.
+
+    Attributes:
+        enabled (bool): Record metrics and expose them at `/metrics`. Defaults to True.
+        event_loop_lag_interval_seconds (float): Interval of the task measuring event loop lag;
+                                                 0 disables it. Defaults to 0.5.
+    """
+    enabled: bool = True
+    event_loop_lag_interval_seconds: float = 0.5
+
+
+class ProfilingSettings(BaseModel):
+    """
+    On-demand request profiling configuration.
+
+    A request is profiled when it carries the `X-Profile-Token` header with the
+    configured admin token, or at random with probability `sample_rate`.
+    Profiles are stack samples in the folded format used by flame graph tools.
+
+    Attributes:
+        admin_token (str): Token enabling header-triggered profiling and the profile
+                           download endpoints. Empty disables both. Defaults to "".
+        sample_rate (float): Fraction (0-1) of requests to the profiled routes that are
+                             profiled at random. Defaults to 0.0.
+        routes (List[str]): Routes that may be profiled. Defaults to
+                            ["/api/move", "/api/recommend"].
+        interval_seconds (float): Stack sampling interval. Defaults to 0.001.
+        directory (str): Directory holding the profile files. Empty uses
+                         "<temp dir>/khair-2048-profiles". Defaults to "".
+        max_files (int): Number of profiles kept; the oldest is deleted beyond it.
+                         Defaults to 50.
+    """
+    admin_token: str = ""
+    sample_rate: float = 0.0
+    routes: List[str] = ["/api/move", "/api/recommend"]
+    interval_seconds: float = 0.001
+    directory: str = ""
+    max_files: int = 50
 
 
 class Settings(BaseSettings):
@@ -102,6 +320,12 @@ class Settings(BaseSettings):
         game (GameSettings): Game configuration settings.
         recommendation (RecommendationSettings): Recommendation subsystem settings.
         rate_limit (RateLimitSettings): API rate limiting settings.
+        session (SessionSettings): Server-side game session settings.
+        state_token (StateTokenSettings): Signed state token settings.
+        journal (JournalSettings): Game journal settings.
+        leaderboard (LeaderboardSettings): Leaderboard settings.
+        metrics (MetricsSettings): Built-in metrics settings.
+        profiling (ProfilingSettings): On-demand request profiling settings.
 
     Notes:
         - Uses `env_nested_delimiter="__"` to support nested env vars like
@@ -112,6 +336,12 @@ class Settings(BaseSettings):
     game: GameSettings = GameSettings()
     recommendation: RecommendationSettings = RecommendationSettings()
     rate_limit: RateLimitSettings = RateLimitSettings()
+    session: SessionSettings = SessionSettings()
+    state_token: StateTokenSettings = StateTokenSettings()
+    journal: JournalSettings = JournalSettings()
+    leaderboard: LeaderboardSettings = LeaderboardSettings()
+    metrics: MetricsSettings = MetricsSettings()
+    profiling: ProfilingSettings = ProfilingSettings()
 
     model_config = SettingsConfigDict(
         env_nested_delimiter="__",
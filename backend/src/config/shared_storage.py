@@ -0,0 +1,206 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from limits.storage import Storage
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+_HEADER = struct.Struct("<8sQ")
+_SLOT = struct.Struct("<Qqd")
+_MAGIC = b"K2048RL1"
+_MAX_PROBE = 16
+
+DEFAULT_SLOTS = 65536
+"""Default number of keys the table can hold at once (24 bytes each)."""
+
+
+def _default_path() -> str:
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "khair-2048-ratelimit")
+
+
+class SharedMemoryStorage(Storage):
+    """
+    Rate limit counter storage shared by every worker process on a host.
+
+    Counters live in a memory-mapped file as a fixed-size open-addressing hash
+    table, so memory is constant per active key (24 bytes) and bounded
+    overall. Keys whose window has expired are reused in place, and when a
+    probe window is full the entry closest to expiry is evicted. Updates are
+    serialized with a POSIX record lock on the file, which excludes other
+    processes (including forked ones sharing the file descriptor), plus a
+    thread lock within the process.
+
+    URI format: ``shm:///path/to/file?slots=65536``. The path defaults to
+    ``/dev/shm/khair-2048-ratelimit`` (or the temp directory). The slot count
+    is stored in the file, and attaching with a different one raises
+    ``ValueError`` rather than resizing a table other processes are using.
+    """
+
+    STORAGE_SCHEME = ["shm"]
+
+    def __init__(self, uri: Optional[str] = None, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        parsed = urlparse(uri or "shm://")
+        path = parsed.path or _default_path()
+        slots = int(parse_qs(parsed.query).get("slots", [options.get("slots", DEFAULT_SLOTS)])[0])
+
+        self.__slots = max(_MAX_PROBE, slots)
+        self.__size = _HEADER.size + self.__slots * _SLOT.size
+        self.__fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self.__lock = _FileLock(self.__fd, threading.Lock())
+        try:
+            with self.__lock:
+                self.__attach(path)
+        except ValueError:
+            os.close(self.__fd)
+            raise
+        self.__map = mmap.mmap(self.__fd, self.__size)
+
+    def __attach(self, path: str) -> None:
+        """
+        Initialize a new table file, or check that an existing one matches.
+
+        A table in use is never resized, since other processes have it mapped
+        and would fault on reading past a shrunk file.
+        """
+        header = os.pread(self.__fd, _HEADER.size, 0)
+        if len(header) < _HEADER.size or header == bytes(_HEADER.size):
+            os.ftruncate(self.__fd, self.__size)
+            os.pwrite(self.__fd, _HEADER.pack(_MAGIC, self.__slots), 0)
+            return
+
+        magic, slots = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a rate limit table")
+        if slots != self.__slots:
+            raise ValueError(
+                f"{path} holds a table of {slots} slots, not {self.__slots}; "
+                "use the same slots in every process or a different path"
+            )
+
+    @property
+    def base_exceptions(self) -> Tuple[type, ...]:
+        return (OSError, ValueError)
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        key_hash = self.__hash(key)
+        with self.__lock:
+            match, free = self.__find(key_hash, now)
+            if match is not None:
+                _, count, expires_at = self.__read(match)
+                if expires_at <= now:
+                    count, expires_at = 0, now + expiry
+                count += amount
+                self.__write(match, key_hash, count, expires_at)
+                return count
+
+            if free is None:
+                free = self.__evictee(key_hash)
+            self.__write(free, key_hash, amount, now + expiry)
+            return amount
+
+    def get(self, key: str) -> int:
+        now = time.time()
+        with self.__lock:
+            match, _ = self.__find(self.__hash(key), now)
+            if match is None:
+                return 0
+            _, count, expires_at = self.__read(match)
+            return count if expires_at > now else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        with self.__lock:
+            match, _ = self.__find(self.__hash(key), now)
+            if match is None:
+                return now
+            _, _, expires_at = self.__read(match)
+            return max(expires_at, now)
+
+    def check(self) -> bool:
+        return not self.__map.closed
+
+    def reset(self) -> Optional[int]:
+        now = time.time()
+        with self.__lock:
+            active = sum(
+                1 for index in range(self.__slots)
+                if self.__read(index)[2] > now
+            )
+            self.__map[_HEADER.size:] = bytes(self.__size - _HEADER.size)
+            return active
+
+    def clear(self, key: str) -> None:
+        with self.__lock:
+            key_hash = self.__hash(key)
+            match, _ = self.__find(key_hash, time.time())
+            if match is not None:
+                # Keep the hash so probe chains through this slot stay intact
+                self.__write(match, key_hash, 0, 0.0)
+
+    @staticmethod
+    def __hash(key: str) -> int:
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    def __find(self, key_hash: int, now: float) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Probe the slots of a key.
+
+        Returns:
+            (index of the key's slot, first reusable slot), either may be None.
+        """
+        free = None
+        start = key_hash % self.__slots
+        for offset in range(_MAX_PROBE):
+            index = (start + offset) % self.__slots
+            slot_hash, _, expires_at = self.__read(index)
+            if slot_hash == key_hash:
+                return index, free
+            if slot_hash == 0:
+                return None, index if free is None else free
+            if free is None and expires_at <= now:
+                free = index
+        return None, free
+
+    def __evictee(self, key_hash: int) -> int:
+        """Slot closest to expiry within the probe window of a key."""
+        start = key_hash % self.__slots
+        indices = [(start + offset) % self.__slots for offset in range(_MAX_PROBE)]
+        return min(indices, key=lambda index: self.__read(index)[2])
+
+    def __read(self, index: int) -> Tuple[int, int, float]:
+        return _SLOT.unpack_from(self.__map, _HEADER.size + index * _SLOT.size)
+
+    def __write(self, index: int, key_hash: int, count: int, expires_at: float) -> None:
+        _SLOT.pack_into(self.__map, _HEADER.size + index * _SLOT.size, key_hash, count, expires_at)
+
+
+class _FileLock:
+    """Context manager holding the thread lock and an exclusive record lock on a file."""
+
+    def __init__(self, fd: int, thread_lock: threading.Lock):
+        self.__fd = fd
+        self.__thread_lock = thread_lock
+
+    def __enter__(self) -> None:
+        self.__thread_lock.acquire()
+        if fcntl is not None:
+            fcntl.lockf(self.__fd, fcntl.LOCK_EX, 1, 0)
+
+    def __exit__(self, *_) -> None:
+        if fcntl is not None:
+            fcntl.lockf(self.__fd, fcntl.LOCK_UN, 1, 0)
+        self.__thread_lock.release()
@@ -0,0 +1,138 @@
+from typing import List, Optional, Tuple
+
+from src.game.codec import CELL_BITS, MAX_EXPONENT
+from src.game.direction import Direction
+
+ROW_BITS = 4 * CELL_BITS
+ROW_MASK = (1 << ROW_BITS) - 1
+CELL_MASK = MAX_EXPONENT
+_LOW_BITS = 0x1111111111111111
+
+DIRECTIONS: Tuple[Direction, ...] = (Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT)
+
+
+class RowTables:
+    """
+    Precomputed results for every possible 4-cell row (65536 entries each).
+
+    A row is 16 bits holding four exponents, the first cell in the lowest
+    bits, exactly as produced by `src.game.codec.pack_board`. Moving a whole
+    4x4 board is then four table lookups instead of per-cell Python work.
+
+    Attributes:
+        left (List[int]): Row after sliding towards the first cell.
+        right (List[int]): Row after sliding towards the last cell.
+        score (List[int]): Sum of the tiles created by merges when sliding
+                           (identical for both directions).
+    """
+
+    def __init__(self):
+        self.left: List[int] = [0] * (ROW_MASK + 1)
+        self.right: List[int] = [0] * (ROW_MASK + 1)
+        self.score: List[int] = [0] * (ROW_MASK + 1)
+
+        for row in range(ROW_MASK + 1):
+            cells = [(row >> (CELL_BITS * i)) & CELL_MASK for i in range(4)]
+            merged, gained = _slide(cells)
+            self.left[row] = _join(merged)
+            self.score[row] = gained
+
+            reversed_merged, _ = _slide(cells[::-1])
+            self.right[row] = _join(reversed_merged[::-1])
+
+
+_tables: Optional[RowTables] = None
+
+
+def row_tables() -> RowTables:
+    """Return the process-wide row tables, building them on first use (under a second)."""
+    global _tables  # pylint: disable=global-statement
+    if _tables is None:
+        _tables = RowTables()
+    return _tables
+
+
+def transpose(board: int) -> int:
+    """Swap rows and columns of a packed 4x4 board using nibble-block swaps."""
+    a = (
+        (board & 0xF0F00F0FF0F00F0F)
+        | ((board & 0x0000F0F00000F0F0) << 12)
+        | ((board & 0x0F0F00000F0F0000) >> 12)
+    )
+    return (
+        (a & 0xFF00FF0000FF00FF)
+        | ((a & 0x00FF00FF00000000) >> 24)
+        | ((a & 0x00000000FF00FF00) << 24)
+    )
+
+
+def move(board: int, direction: Direction, tables: Optional[RowTables] = None) -> Tuple[int, int]:
+    """
+    Apply a move to a packed 4x4 board without spawning a tile.
+
+    Args:
+        board: Board packed with `src.game.codec.pack_board`.
+        direction: Direction to move.
+        tables: Row tables to use, defaults to the process-wide tables.
+
+    Returns:
+        (board after the move, score gained by merges). The board is unchanged
+        when the move is not legal.
+    """
+    tables = tables or row_tables()
+    vertical = direction in (Direction.UP, Direction.DOWN)
+    line_table = tables.left if direction in (Direction.UP, Direction.LEFT) else tables.right
+    source = transpose(board) if vertical else board
+
+    result = 0
+    gained = 0
+    for r in range(4):
+        row = (source >> (ROW_BITS * r)) & ROW_MASK
+        result |= line_table[row] << (ROW_BITS * r)
+        gained += tables.score[row]
+    return (transpose(result) if vertical else result), gained
+
+
+def empty_cells(board: int) -> List[int]:
+    """Indices (row-major) of the empty cells of a packed 4x4 board."""
+    return [i for i in range(16) if not (board >> (CELL_BITS * i)) & CELL_MASK]
+
+
+def max_exponent(board: int) -> int:
+    """Largest tile exponent on a packed 4x4 board."""
+    return max((board >> (CELL_BITS * i)) & CELL_MASK for i in range(16))
+
+
+def can_move(board: int, tables: Optional[RowTables] = None) -> bool:
+    """Whether any move changes a packed 4x4 board, i.e. the game is not lost."""
+    # A cell is empty when none of its four bits are set
+    occupied = board | (board >> 1)
+    occupied |= occupied >> 2
+    if occupied & _LOW_BITS != _LOW_BITS:
+        return True
+    # A full board can only change by merging, which both directions of an axis detect
+    return move(board, Direction.LEFT, tables)[0] != board or move(board, Direction.UP, tables)[0] != board
+
+
+def _slide(cells: List[int]) -> Tuple[List[int], int]:
+    """Slide and merge exponents towards the first cell, merging each tile once."""
+    tiles = [cell for cell in cells if cell]
+    merged: List[int] = []
+    gained = 0
+    index = 0
+    while index < len(tiles):
+        if index + 1 < len(tiles) and tiles[index] == tiles[index + 1] and tiles[index] < MAX_EXPONENT:
+            merged.append(tiles[index] + 1)
+            gained += 1 << (tiles[index] + 1)
+            index += 2
+        else:
+            merged.append(tiles[index])
+            index += 1
+    return merged + [0] * (len(cells) - len(merged)), gained
+
+
+def _join(cells: List[int]) -> int:
+    row = 0
+    for i, cell in enumerate(cells):
+        row |= cell << (CELL_BITS * i)
+    return row
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import random
+import secrets
 from copy import deepcopy
 from typing import Any, List, Optional, Tuple
 
@@ -15,6 +16,24 @@ class GameBoardException(Exception):
     """Raised when an invalid operation is performed on the game board."""
 
 
+def new_seed() -> int:
+    """Draw a fresh seed for a replayable game."""
+    return secrets.randbits(63)
+
+
+def spawn_random(seed: Optional[int], turns: int) -> Any:
+    """
+    Random generator for the tiles spawned at a given turn.
+
+    Seeded games derive one generator per turn from the seed, so the spawns
+    of a turn depend only on the seed and the turn number and a game can be
+    replayed from its seed and moves. Unseeded games use the global generator.
+    """
+    if seed is None:
+        return random
+    return random.Random((seed << 32) | turns)
+
+
 
 
 class GameBoard:
@@ -31,6 +50,7 @@ class GameBoard:
         goal: int,
         prop_numbers: List[int],
         turns: int = 0,
+        seed: Optional[int] = None,
     ):
         """
         Create a game board with an existing grid state.
@@ -41,6 +61,8 @@ class GameBoard:
             goal: The target number required to win the game.
             prop_numbers: Possible numbers that may be spawned after a move.
             turns: Number of turns already taken.
+            seed: Non-negative seed making tile spawns deterministic (see
+                `spawn_random`). Unseeded games spawn tiles at random.
 
         Raises:
             ValueError: If the provided board is empty or malformed.
@@ -52,6 +74,7 @@ class GameBoard:
         self.goal = goal
         self.__prop_numbers = prop_numbers
         self.turns = turns
+        self.seed = seed
 
         self.__rows = len(board)
         self.__cols = len(board[0])
@@ -63,6 +86,7 @@ class GameBoard:
         min_starting_count: int = SETTINGS.game.min_start_count,
         max_starting_count: int = SETTINGS.game.max_start_count,
         starting_number: int = SETTINGS.game.start_number,
+        seed: Optional[int] = None,
     ) -> GameBoard:
         """
         Create a new game board with a fresh grid and randomly placed
@@ -74,6 +98,7 @@ class GameBoard:
             max_starting_count: Maximum number of starting tiles to place.
             min_starting_count: Minimum number of starting tiles to place.
             starting_number: Value of each starting tile.
+            seed: Seed for the starting tiles and every later spawn.
 
         Returns:
             GameBoard: A newly initialised game board.
@@ -83,8 +108,9 @@ class GameBoard:
             for _ in range(grid_length)
         ]
 
-        starting_count = random.randint(min_starting_count, max_starting_count)
-        rng = lambda: random.randint(0, grid_length - 1)
+        generator = spawn_random(seed, 0)
+        starting_count = generator.randint(min_starting_count, max_starting_count)
+        rng = lambda: generator.randint(0, grid_length - 1)
         for _ in range(starting_count):
             r, c = rng(), rng()
             while board[r][c] == starting_number:
@@ -95,6 +121,7 @@ class GameBoard:
             board=board,
             goal=goal_number,
             prop_numbers=[starting_number, starting_number * 2],
+            seed=seed,
         )
 
     def get_board(self) -> Board:
@@ -275,8 +302,9 @@ class GameBoard:
         free_slots = self.__get_empty_coords()
         if not free_slots or not self.__prop_numbers:
             return
-        next_number = random.choice(self.__prop_numbers)
-        r, c = random.choice(free_slots)
+        generator = spawn_random(self.seed, self.turns)
+        next_number = generator.choice(self.__prop_numbers)
+        r, c = generator.choice(free_slots)
         self.__board[r][c] = next_number
 
     def __copy__(self) -> GameBoard:
@@ -285,6 +313,7 @@ class GameBoard:
             goal=self.goal,
             prop_numbers=deepcopy(self.__prop_numbers),
             turns=self.turns,
+            seed=self.seed,
         )
 
     def __deepcopy__(self, memo: Any)-> GameBoard:
@@ -0,0 +1,210 @@
+import base64
+import binascii
+from enum import Enum
+from math import isqrt
+from typing import List, Union
+
+from src.config.settings import SETTINGS
+from src.game.board import Board
+
+EncodedGrid = Union[Board, List[int], str]
+
+CELL_BITS = 4
+"""Bits used per cell when packing a board into an integer."""
+
+MAX_EXPONENT = (1 << CELL_BITS) - 1
+"""Largest tile exponent that fits in a packed cell (2^15 = 32768)."""
+
+
+class BoardCodecException(ValueError):
+    """Raised when a board cannot be encoded or decoded."""
+
+
+def to_exponents(board: Board) -> List[int]:
+    """
+    Flatten a board into row-major log2 exponents.
+
+    Args:
+        board: Board to encode.
+
+    Returns:
+        One exponent per cell, 0 for empty cells and ``log2(value)`` otherwise.
+
+    Raises:
+        BoardCodecException: If a tile is not a power of two greater than one.
+    """
+    exponents: List[int] = []
+    for row in board:
+        for cell in row:
+            if not cell:
+                exponents.append(0)
+                continue
+            exponent = cell.bit_length() - 1
+            if exponent < 1 or cell != 1 << exponent:
+                raise BoardCodecException(f"Tile {cell} is not a power of two")
+            exponents.append(exponent)
+    return exponents
+
+
+def from_exponents(exponents: List[int], grid_length: int) -> Board:
+    """
+    Rebuild a square board from row-major log2 exponents.
+
+    Args:
+        exponents: One exponent per cell, 0 for empty cells.
+        grid_length: Width and height of the board.
+
+    Returns:
+        The decoded board.
+
+    Raises:
+        BoardCodecException: If the number of exponents does not match the
+            grid size or an exponent is negative or above `MAX_EXPONENT`.
+    """
+    if len(exponents) != grid_length * grid_length:
+        raise BoardCodecException(
+            f"Expected {grid_length * grid_length} cells, got {len(exponents)}"
+        )
+    if any(exponent < 0 for exponent in exponents):
+        raise BoardCodecException("Exponents must not be negative")
+    if any(exponent > MAX_EXPONENT for exponent in exponents):
+        raise BoardCodecException(f"Exponents must not exceed {MAX_EXPONENT}")
+    return [
+        [1 << e if e else None for e in exponents[r * grid_length:(r + 1) * grid_length]]
+        for r in range(grid_length)
+    ]
+
+
+def pack_board(board: Board) -> int:
+    """
+    Pack a board into an integer using 4 bits per cell.
+
+    The first cell occupies the lowest bits. A 4x4 board fits into 64 bits.
+
+    Args:
+        board: Board to pack.
+
+    Returns:
+        The packed board.
+
+    Raises:
+        BoardCodecException: If a tile is not a power of two or is larger than 2^15.
+    """
+    packed = 0
+    for index, exponent in enumerate(to_exponents(board)):
+        if exponent > MAX_EXPONENT:
+            raise BoardCodecException(f"Tile {1 << exponent} is too large to pack")
+        packed |= exponent << (index * CELL_BITS)
+    return packed
+
+
+def unpack_board(packed: int, grid_length: int) -> Board:
+    """
+    Unpack a board packed with :func:`pack_board`.
+
+    Args:
+        packed: The packed board.
+        grid_length: Width and height of the board.
+
+    Returns:
+        The decoded board.
+    """
+    cells = grid_length * grid_length
+    exponents = [(packed >> (index * CELL_BITS)) & MAX_EXPONENT for index in range(cells)]
+    return from_exponents(exponents, grid_length)
+
+
+class GridFormat(str, Enum):
+    """
+    Wire encodings of a grid.
+    Inherits from str to allow direct JSON serialization.
+    """
+
+    NESTED = "nested"
+    """Nested list of rows, with ``null`` for empty cells (the default)."""
+
+    EXPONENTS = "exponents"
+    """Flat row-major list of log2 exponents, 0 for empty cells."""
+
+    HEX = "hex"
+    """One hexadecimal digit per cell holding its log2 exponent, row-major."""
+
+    BASE64 = "base64"
+    """URL-safe unpadded base64 of the little-endian packed board (4 bits per cell)."""
+
+
+def _grid_length_of(cells: int) -> int:
+    grid_length = isqrt(cells)
+    if grid_length == 0 or grid_length * grid_length != cells:
+        raise BoardCodecException(f"{cells} cells do not form a square grid")
+    return grid_length
+
+
+def encode_grid(board: Board, grid_format: GridFormat) -> EncodedGrid:
+    """
+    Encode a board in the given wire format.
+
+    Args:
+        board: Board to encode.
+        grid_format: Target format.
+
+    Returns:
+        The encoded grid.
+    """
+    if grid_format == GridFormat.NESTED:
+        return board
+    if grid_format == GridFormat.EXPONENTS:
+        return to_exponents(board)
+    if grid_format == GridFormat.HEX:
+        exponents = to_exponents(board)
+        if any(exponent > MAX_EXPONENT for exponent in exponents):
+            raise BoardCodecException("Tiles larger than 2^15 cannot be hex encoded")
+        return "".join(f"{exponent:x}" for exponent in exponents)
+    cells = len(board) * len(board[0])
+    data = pack_board(board).to_bytes((cells + 1) // 2, "little")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_grid(
+    value: EncodedGrid,
+    grid_format: GridFormat,
+    grid_length: int = SETTINGS.game.grid_length,
+) -> Board:
+    """
+    Decode a grid received in the given wire format.
+
+    Args:
+        value: Encoded grid.
+        grid_format: Format the grid is encoded in.
+        grid_length: Width and height of base64 encoded grids, which do not
+            carry their own size.
+
+    Returns:
+        The decoded board.
+
+    Raises:
+        BoardCodecException: If the value does not match the format.
+    """
+    if grid_format == GridFormat.NESTED:
+        if not isinstance(value, list) or not all(isinstance(row, list) for row in value):
+            raise BoardCodecException("Nested grids must be a list of rows")
+        return value
+    if grid_format == GridFormat.EXPONENTS:
+        if not isinstance(value, list) or not all(isinstance(e, int) for e in value):
+            raise BoardCodecException("Exponent grids must be a flat list of integers")
+        return from_exponents(value, _grid_length_of(len(value)))
+    if not isinstance(value, str):
+        raise BoardCodecException(f"{grid_format.value} grids must be strings")
+    if grid_format == GridFormat.HEX:
+        try:
+            exponents = [int(digit, 16) for digit in value]
+        except ValueError as e:
+            raise BoardCodecException("Hex grids may only contain hex digits") from e
+        return from_exponents(exponents, _grid_length_of(len(exponents)))
+    try:
+        data = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+    except (binascii.Error, ValueError) as e:
+        raise BoardCodecException("Invalid base64 grid") from e
+    if len(data) != (grid_length * grid_length + 1) // 2:
+        raise BoardCodecException(f"Base64 grid does not hold a {grid_length}x{grid_length} board")
+    return unpack_board(int.from_bytes(data, "little"), grid_length)
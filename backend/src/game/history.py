@@ -0,0 +1,66 @@
+from typing import List, Optional, Tuple
+
+from src.game.direction import Direction
+
+
+class GameHistory:
+    """
+    Undo/redo history of a game, as a list of immutable packed boards.
+
+    A board packed with `src.game.codec.pack_board` is a plain integer, so a
+    snapshot shares nothing mutable with the live game and costs O(1) to
+    take; undo and redo only move a cursor. Playing a move after an undo
+    discards the undone boards. At most `depth` moves can be undone; older
+    boards are dropped.
+
+    Tile spawns depend only on the game's seed and turn count, so replaying
+    an undone move spawns the same tile again.
+    """
+    __slots__ = ("depth", "boards", "moves", "cursor")
+
+    def __init__(self, board: int, depth: int):
+        """
+        Args:
+            board: Packed board the history starts from.
+            depth: Maximum number of moves that can be undone.
+        """
+        self.depth = depth
+        self.boards: List[int] = [board]
+        # moves[i] led from boards[i - 1] to boards[i]; moves[0] is unused
+        self.moves: List[Optional[Direction]] = [None]
+        self.cursor = 0
+
+    def push(self, board: int, direction: Direction) -> None:
+        """Record the board after a move that changed it."""
+        del self.boards[self.cursor + 1:]
+        del self.moves[self.cursor + 1:]
+        self.boards.append(board)
+        self.moves.append(direction)
+        if len(self.boards) > self.depth + 1:
+            del self.boards[0]
+            del self.moves[0]
+        self.cursor = len(self.boards) - 1
+
+    @property
+    def can_undo(self) -> bool:
+        """Whether there is a move left to take back."""
+        return self.cursor > 0
+
+    @property
+    def can_redo(self) -> bool:
+        """Whether there is an undone move to play again."""
+        return self.cursor < len(self.boards) - 1
+
+    def undo(self) -> Optional[int]:
+        """Step back one move, returning the previous board or None if there is none."""
+        if not self.can_undo:
+            return None
+        self.cursor -= 1
+        return self.boards[self.cursor]
+
+    def redo(self) -> Optional[Tuple[int, Direction]]:
+        """Replay the last undone move, returning its board and direction, or None."""
+        if not self.can_redo:
+            return None
+        self.cursor += 1
+        return self.boards[self.cursor], self.moves[self.cursor]
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import os
+import re
+import struct
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+
+from src.config.settings import SETTINGS
+from src.game.board import GameBoard
+from src.game.direction import Direction
+
+SEGMENT_MAGIC = b"K2048JN1"
+"""Header written at the start of every segment file."""
+
+MOVE_CODES = {Direction.UP: 0, Direction.DOWN: 1, Direction.LEFT: 2, Direction.RIGHT: 3}
+CODE_MOVES = {code: direction for direction, code in MOVE_CODES.items()}
+
+# grid length, seed, number of moves; followed by the packed moves and a CRC32 of both
+_RECORD_HEADER = struct.Struct("<BQI")
+_CRC = struct.Struct("<I")
+# Each process writes its own segments, "journal-<pid>-<index>.bin", so workers never share a file
+_SEGMENT_NAME = re.compile(r"^journal-(?:(\d+)-)?(\d{6})\.bin$")
+
+
+class JournalException(Exception):
+    """Raised when a journal segment is not a valid journal file."""
+
+
+class MoveLog:
+    """
+    Moves of a game packed 2 bits per move into a growable byte array.
+
+    Only moves that changed the board are logged, so the number of moves
+    equals the game's turn count.
+    """
+    __slots__ = ("data", "count")
+
+    def __init__(self, data: Optional[bytes] = None, count: int = 0):
+        self.data = bytearray(data or b"")
+        self.count = count
+
+    def append(self, direction: Direction) -> None:
+        index, shift = divmod(self.count, 4)
+        if index == len(self.data):
+            self.data.append(0)
+        self.data[index] |= MOVE_CODES[direction] << (2 * shift)
+        self.count += 1
+
+    def truncate(self, count: int) -> None:
+        """Keep only the first `count` moves (used when a move is undone)."""
+        count = max(0, min(count, self.count))
+        del self.data[(count + 3) // 4:]
+        if count % 4:
+            self.data[-1] &= (1 << (2 * (count % 4))) - 1
+        self.count = count
+
+    def __iter__(self) -> Iterator[Direction]:
+        for position in range(self.count):
+            index, shift = divmod(position, 4)
+            yield CODE_MOVES[(self.data[index] >> (2 * shift)) & 0b11]
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class JournalRecord:
+    """A finished or abandoned game: its seed, board size and moves."""
+
+    def __init__(self, seed: int, grid_length: int, moves: MoveLog):
+        self.seed = seed
+        self.grid_length = grid_length
+        self.moves = moves
+
+    @property
+    def turns(self) -> int:
+        return len(self.moves)
+
+    def replay(self, turns: Optional[int] = None) -> GameBoard:
+        """
+        Rebuild the game by replaying its moves through `GameBoard`.
+
+        Args:
+            turns: Stop after this many moves; defaults to the whole game.
+
+        Returns:
+            The game board as it was after `turns` moves.
+        """
+        game = GameBoard.create_new(grid_length=self.grid_length, seed=self.seed)
+        for index, direction in enumerate(self.moves):
+            if turns is not None and index >= turns:
+                break
+            direction.apply_to_board(game)
+        return game
+
+
+class GameJournal:
+    """
+    Append-only binary journal of games split into size-rotated segment files.
+
+    Each record takes 17 bytes plus one byte per four moves, so a typical
+    game of a thousand moves is stored in under 300 bytes. Every record ends
+    with a CRC32, and reading stops at a torn record left by a crash.
+
+    Every process appends to segments named after its pid, so several server
+    workers can share a journal directory without interleaving their writes.
+    Games handed to `submit` are written by a single background thread, off
+    the caller's (and the event loop's) thread.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int):
+        """
+        Args:
+            directory: Directory holding the segment files.
+            segment_bytes: Size after which a new segment is started.
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.__lock = threading.Lock()
+        self.__file = None
+        self.__pid = os.getpid()
+        self.__writer: Optional[ThreadPoolExecutor] = None
+
+    def append(self, record: JournalRecord) -> None:
+        """Append a game to the current segment, rotating it when full."""
+        body = _RECORD_HEADER.pack(record.grid_length, record.seed, record.moves.count)
+        body += bytes(record.moves.data[:(record.moves.count + 3) // 4])
+        payload = body + _CRC.pack(zlib.crc32(body))
+        with self.__lock:
+            file = self.__current_segment()
+            file.write(payload)
+            file.flush()
+
+    def submit(self, record: JournalRecord) -> None:
+        """Queue a game to be appended by the journal's writer thread."""
+        with self.__lock:
+            if self.__writer is None:
+                self.__writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal")
+            self.__writer.submit(self.append, record)
+
+    def close(self) -> None:
+        """Wait for the queued games to be written, then close the current segment."""
+        with self.__lock:
+            writer, self.__writer = self.__writer, None
+        if writer is not None:
+            writer.shutdown(wait=True)
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+
+    def segments(self) -> List[str]:
+        """Paths of the segment files, oldest first."""
+        return segment_paths(self.directory)
+
+    def __iter__(self) -> Iterator[JournalRecord]:
+        for path in self.segments():
+            yield from read_segment(path)
+
+    def __current_segment(self):
+        pid = os.getpid()
+        if pid != self.__pid:
+            # Forked: the inherited segment belongs to the parent, start our own
+            self.__pid = pid
+            self.__file = None
+        if self.__file is not None and self.__file.tell() < self.segment_bytes:
+            return self.__file
+        if self.__file is not None:
+            self.__file.close()
+
+        os.makedirs(self.directory, exist_ok=True)
+        indexes = [
+            int(match.group(2))
+            for match in map(_SEGMENT_NAME.match, os.listdir(self.directory))
+            if match and match.group(1) == str(pid)
+        ]
+        index = max(indexes, default=0)
+        path = os.path.join(self.directory, f"journal-{pid}-{index:06d}.bin")
+        if os.path.exists(path) and os.path.getsize(path) >= self.segment_bytes:
+            path = os.path.join(self.directory, f"journal-{pid}-{index + 1:06d}.bin")
+
+        self.__file = open(path, "ab")  # pylint: disable=consider-using-with
+        if self.__file.tell() == 0:
+            self.__file.write(SEGMENT_MAGIC)
+        return self.__file
+
+
+def segment_paths(directory: str) -> List[str]:
+    """Paths of the journal segment files in a directory, oldest first."""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    paths = [os.path.join(directory, name) for name in names if _SEGMENT_NAME.match(name)]
+    return sorted(paths, key=lambda path: (os.path.getmtime(path), _segment_order(path)))
+
+
+def _segment_order(path: str):
+    match = _SEGMENT_NAME.match(os.path.basename(path))
+    return int(match.group(1) or 0), int(match.group(2))
+
+
+def read_segment(path: str) -> Iterator[JournalRecord]:
+    """
+    Read the records of one segment file, one record at a time.
+
+    Raises:
+        JournalException: If the file does not start with the segment header.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+            raise JournalException(f"{path} is not a journal segment")
+
+        while True:
+            header = file.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+            grid_length, seed, count = _RECORD_HEADER.unpack(header)
+            size = (count + 3) // 4
+            tail = file.read(size + _CRC.size)
+            if len(tail) < size + _CRC.size:
+                return  # torn record at the end of the segment
+            data = tail[:size]
+            (checksum,) = _CRC.unpack_from(tail, size)
+            if checksum != zlib.crc32(header + data):
+                return
+            yield JournalRecord(seed, grid_length, MoveLog(data, count))
+
+
+def record_game(seed: Optional[int], grid_length: int, moves: MoveLog) -> None:
+    """Queue a game for the configured journal; unseeded games cannot be replayed and are skipped."""
+    if journal is not None and seed is not None:
+        # Copy the moves, the caller may keep playing while the writer thread catches up
+        journal.submit(JournalRecord(seed, grid_length, MoveLog(bytes(moves.data), moves.count)))
+
+
+journal: Optional[GameJournal] = (
+    GameJournal(SETTINGS.journal.directory, SETTINGS.journal.segment_bytes)
+    if SETTINGS.journal.enabled else None
+)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from src.config.settings import SETTINGS
+from src.game.board import GameBoard
+from src.game.codec import pack_board, unpack_board
+from src.game.direction import Direction
+from src.game.history import GameHistory
+from src.game.journal import MoveLog, record_game
+
+
+class GameSession:
+    """
+    Server-side state of a single game, with the board packed into an integer.
+    The goal and spawnable numbers come from the game settings. Seeded games
+    also keep their moves (2 bits each) so they can be journaled and replayed.
+    With a non-zero undo depth, the last moves can be undone and redone
+    until the game is over. Games in which a move was undone are marked as
+    assisted, since redoing replays a spawn the player has already seen.
+    """
+    __slots__ = (
+        "board", "grid_length", "turns", "last_seen", "seed", "moves", "history", "finished", "assisted", "recorded",
+    )
+
+    def __init__(self, game: GameBoard, last_seen: float, undo_depth: int = 0):
+        board = game.get_board()
+        self.board = pack_board(board)
+        self.grid_length = len(board)
+        self.turns = game.turns
+        self.last_seen = last_seen
+        self.seed = game.seed
+        self.moves = MoveLog()
+        self.history = GameHistory(self.board, undo_depth) if undo_depth > 0 else None
+        self.finished = game.status().is_terminal
+        self.assisted = False
+        self.recorded = False
+
+    def to_game(self) -> GameBoard:
+        """Rebuild a playable game board from the session state."""
+        return GameBoard(
+            board=unpack_board(self.board, self.grid_length),
+            goal=SETTINGS.game.goal_number,
+            prop_numbers=[SETTINGS.game.start_number, SETTINGS.game.start_number * 2],
+            turns=self.turns,
+            seed=self.seed,
+        )
+
+    def update(self, game: GameBoard, direction: Direction) -> None:
+        """Store the state of a game board after a move was played."""
+        if game.turns <= self.turns:
+            return
+        self.moves.append(direction)
+        self.board = pack_board(game.get_board())
+        self.turns = game.turns
+        self.finished = game.status().is_terminal
+        if self.history is not None:
+            self.history.push(self.board, direction)
+
+    def undo(self) -> bool:
+        """Take back the last move, returning False if there is nothing to undo or the game is over."""
+        board = self.history.undo() if self.history is not None and not self.finished else None
+        if board is None:
+            return False
+        self.assisted = True
+        self.board = board
+        self.turns -= 1
+        self.moves.truncate(self.moves.count - 1)
+        return True
+
+    def redo(self) -> bool:
+        """Play the last undone move again, returning False if there is none."""
+        redone = self.history.redo() if self.history is not None else None
+        if redone is None:
+            return False
+        self.board, direction = redone
+        self.turns += 1
+        self.moves.append(direction)
+        self.finished = self.to_game().status().is_terminal
+        return True
+
+    def record(self) -> None:
+        """Queue the game for the journal, if journaling is enabled."""
+        record_game(self.seed, self.grid_length, self.moves)
+
+
+class SessionStore:
+    """
+    In-process store of game sessions.
+
+    Sessions idle for longer than ``idle_seconds`` are evicted, and once
+    ``max_sessions`` are held the least recently used session is dropped to
+    make room, which bounds memory use.
+    """
+
+    def __init__(
+        self,
+        idle_seconds: float,
+        max_sessions: int,
+        clock: Callable[[], float] = time.monotonic,
+        undo_depth: int = 0,
+    ):
+        """
+        Create an empty store.
+
+        Args:
+            idle_seconds: Seconds of inactivity after which a session expires.
+            max_sessions: Maximum number of sessions held at once.
+            clock: Monotonic clock returning seconds, injectable for tests.
+            undo_depth: Number of moves of each session that can be undone.
+        """
+        self.__idle_seconds = idle_seconds
+        self.__max_sessions = max(1, max_sessions)
+        self.__undo_depth = undo_depth
+        self.__clock = clock
+        self.__sessions: OrderedDict[str, GameSession] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def create(self, game: GameBoard) -> str:
+        """
+        Start a session for a game.
+
+        Args:
+            game: Initial state of the game.
+
+        Returns:
+            The id of the new session.
+        """
+        session_id = secrets.token_urlsafe(16)
+        with self.__lock:
+            now = self.__clock()
+            evicted = self.__evict_idle(now)
+            while len(self.__sessions) >= self.__max_sessions:
+                evicted.append(self.__sessions.popitem(last=False)[1])
+            self.__sessions[session_id] = GameSession(game, now, self.__undo_depth)
+        for session in evicted:
+            session.record()
+        return session_id
+
+    def get(self, session_id: str) -> Optional[GameSession]:
+        """
+        Look up a session, refreshing its idle timer.
+
+        Returns:
+            The session, or None if it does not exist or has expired.
+        """
+        with self.__lock:
+            now = self.__clock()
+            evicted = self.__evict_idle(now)
+            session = self.__sessions.get(session_id)
+            if session is not None:
+                session.last_seen = now
+                self.__sessions.move_to_end(session_id)
+        for expired in evicted:
+            expired.record()
+        return session
+
+    def remove(self, session_id: str) -> None:
+        """Forget a session if it exists."""
+        with self.__lock:
+            session = self.__sessions.pop(session_id, None)
+        if session is not None:
+            session.record()
+
+    def clear(self) -> None:
+        """Forget every session, journaling their games (used at shutdown)."""
+        with self.__lock:
+            remaining = list(self.__sessions.values())
+            self.__sessions.clear()
+        for session in remaining:
+            session.record()
+
+    def __evict_idle(self, now: float) -> List[GameSession]:
+        # Sessions are kept in least recently used order, so expired ones are at the front.
+        # The caller journals the evicted sessions once the lock is released.
+        evicted = []
+        while self.__sessions:
+            session_id, session = next(iter(self.__sessions.items()))
+            if now - session.last_seen < self.__idle_seconds:
+                break
+            del self.__sessions[session_id]
+            evicted.append(session)
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self.__sessions)
+
+
+sessions = SessionStore(
+    idle_seconds=SETTINGS.session.idle_seconds,
+    max_sessions=SETTINGS.session.max_sessions,
+    undo_depth=SETTINGS.session.undo_depth,
+)
@@ -0,0 +1,358 @@
+"""
+Exact solutions of small grids and their compact on-disk tablebase.
+
+Boards are packed like `src.game.codec.pack_board` (4 bits per cell, row-major, the first
+cell in the lowest bits). Positions equivalent under the eight symmetries of the square
+share one entry, stored under the smallest of their packed images.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from itertools import combinations
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+from src.game.bitboard import DIRECTIONS, _join, _slide
+from src.game.codec import CELL_BITS, MAX_EXPONENT
+from src.game.direction import Direction
+from src.game.journal import CODE_MOVES, MOVE_CODES
+
+TABLEBASE_MAGIC = b"2048TBSE"
+TABLEBASE_VERSION = 1
+MAX_GRID_LENGTH = 3
+"""Largest grid solvable in reasonable time; a 4x4 board has far too many positions."""
+
+NO_MOVE = 0xFF
+"""Move code of a position where the game is over."""
+
+# magic, version, grid length, goal exponent, start exponent, slots, positions
+_HEADER = struct.Struct("<8sBBBB4xQQ")
+# Set on every stored key, so a zero key marks an empty slot
+_OCCUPIED = 1 << 63
+_FIBONACCI = 0x9E3779B97F4A7C15
+_U64 = (1 << 64) - 1
+
+# How each symmetry (mirror columns, mirror rows, then transpose) maps a move
+_MIRROR_COLUMNS = {Direction.LEFT: Direction.RIGHT, Direction.RIGHT: Direction.LEFT}
+_MIRROR_ROWS = {Direction.UP: Direction.DOWN, Direction.DOWN: Direction.UP}
+_TRANSPOSE = {
+    Direction.UP: Direction.LEFT, Direction.LEFT: Direction.UP,
+    Direction.DOWN: Direction.RIGHT, Direction.RIGHT: Direction.DOWN,
+}
+
+Solution = Dict[int, Tuple[int, float]]
+"""Canonical board -> (move code, win probability)."""
+
+
+class TablebaseException(Exception):
+    """Raised when a tablebase cannot be built or read."""
+
+
+class SmallBoards:
+    """
+    Moves and symmetries of packed boards of up to 3x3 cells.
+
+    Like `src.game.bitboard.RowTables`, every possible row is precomputed, so
+    moving or transforming a board is a handful of table lookups.
+    """
+
+    def __init__(self, grid_length: int):
+        if not 2 <= grid_length <= MAX_GRID_LENGTH:
+            raise TablebaseException(f"Only grids of 2 to {MAX_GRID_LENGTH} cells can be solved")
+        self.grid_length = grid_length
+        self.cells = grid_length * grid_length
+        self.row_bits = CELL_BITS * grid_length
+        self.row_mask = (1 << self.row_bits) - 1
+
+        rows = self.row_mask + 1
+        self.__left = [0] * rows
+        self.__right = [0] * rows
+        self.__reversed = [0] * rows
+        # __columns[r][row]: the row placed as column r, for transposing
+        self.__columns = [[0] * rows for _ in range(grid_length)]
+        for row in range(rows):
+            cells = [(row >> (CELL_BITS * i)) & MAX_EXPONENT for i in range(grid_length)]
+            self.__left[row] = _join(_slide(cells)[0])
+            self.__right[row] = _join(_slide(cells[::-1])[0][::-1])
+            self.__reversed[row] = _join(cells[::-1])
+            for r in range(grid_length):
+                self.__columns[r][row] = sum(
+                    cell << (CELL_BITS * (i * grid_length + r)) for i, cell in enumerate(cells)
+                )
+
+    def move(self, board: int, direction: Direction) -> int:
+        """Board after a move, before the spawn; unchanged when the move is not legal."""
+        if direction in (Direction.UP, Direction.DOWN):
+            table = self.__left if direction == Direction.UP else self.__right
+            return self.transpose(self.__map_rows(self.transpose(board), table))
+        return self.__map_rows(board, self.__left if direction == Direction.LEFT else self.__right)
+
+    def transpose(self, board: int) -> int:
+        result = 0
+        for r in range(self.grid_length):
+            result |= self.__columns[r][(board >> (self.row_bits * r)) & self.row_mask]
+        return result
+
+    def mirror_columns(self, board: int) -> int:
+        return self.__map_rows(board, self.__reversed)
+
+    def mirror_rows(self, board: int) -> int:
+        result = 0
+        last = self.grid_length - 1
+        for r in range(self.grid_length):
+            result |= ((board >> (self.row_bits * r)) & self.row_mask) << (self.row_bits * (last - r))
+        return result
+
+    def images(self, board: int) -> List[int]:
+        """The board under each of the eight symmetries, indexed as `map_direction` expects."""
+        columns = self.mirror_columns(board)
+        rows = self.mirror_rows(board)
+        both = self.mirror_rows(columns)
+        plain = [board, columns, rows, both]
+        return plain + [self.transpose(image) for image in plain]
+
+    def canonical(self, board: int) -> Tuple[int, int]:
+        """The smallest image of a board and the index of the symmetry producing it."""
+        images = self.images(board)
+        canonical = min(images)
+        return canonical, images.index(canonical)
+
+    @staticmethod
+    def map_direction(direction: Direction, symmetry: int, inverse: bool = False) -> Direction:
+        """
+        Map a move through a symmetry: moving `direction` on a board is moving
+        the mapped direction on its image (or, with `inverse`, the reverse).
+        """
+        steps = [
+            _MIRROR_COLUMNS if symmetry & 1 else None,
+            _MIRROR_ROWS if symmetry & 2 else None,
+            _TRANSPOSE if symmetry & 4 else None,
+        ]
+        for step in reversed(steps) if inverse else steps:
+            if step is not None:
+                direction = step.get(direction, direction)
+        return direction
+
+    def empty_cells(self, board: int) -> List[int]:
+        return [i for i in range(self.cells) if not (board >> (CELL_BITS * i)) & MAX_EXPONENT]
+
+    def max_exponent(self, board: int) -> int:
+        return max((board >> (CELL_BITS * i)) & MAX_EXPONENT for i in range(self.cells))
+
+    def __map_rows(self, board: int, table: List[int]) -> int:
+        result = 0
+        for r in range(self.grid_length):
+            shift = self.row_bits * r
+            result |= table[(board >> shift) & self.row_mask] << shift
+        return result
+
+
+def solve(
+    grid_length: int,
+    goal_number: int,
+    start_number: int,
+    min_start_count: int,
+    max_start_count: int,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Solution:
+    """
+    Solve every reachable position of a small grid exactly.
+
+    Spawns follow `GameBoard`: a tile of `start_number` or twice that, each
+    equally likely, on an empty cell chosen uniformly. A move and its spawn
+    add exactly the spawned tile to the sum of the tiles, so positions are
+    enumerated layer by layer of increasing tile sum and valued in reverse,
+    every successor being valued before its predecessors. The best move
+    maximizes the probability of reaching the goal tile, then the expected
+    number of moves played, which orders moves when the goal is out of reach.
+
+    Args:
+        grid_length: Width and height of the grid (2 or 3).
+        goal_number: Tile that wins the game.
+        start_number: Tile placed at the start, and the smaller spawned tile.
+        min_start_count: Fewest starting tiles.
+        max_start_count: Most starting tiles.
+        progress: Called with the tile sum and the positions found so far, once per layer.
+
+    Returns:
+        Solution: Move code and win probability of every canonical position.
+    """
+    boards = SmallBoards(grid_length)
+    goal_exponent = goal_number.bit_length() - 1
+    start_exponent = start_number.bit_length() - 1
+    spawns = (start_exponent, start_exponent + 1)
+
+    layers: Dict[int, Set[int]] = {}
+    for count in range(min_start_count, min(max_start_count, boards.cells) + 1):
+        for cells in combinations(range(boards.cells), count):
+            board = sum(start_exponent << (CELL_BITS * cell) for cell in cells)
+            layers.setdefault(count * start_number, set()).add(boards.canonical(board)[0])
+
+    def successors(board: int) -> List[Tuple[Direction, List[int]]]:
+        result = []
+        for direction in DIRECTIONS:
+            moved = boards.move(board, direction)
+            if moved == board:
+                continue
+            empty = boards.empty_cells(moved)
+            result.append((direction, [
+                boards.canonical(moved | exponent << (CELL_BITS * cell))[0]
+                for cell in empty for exponent in spawns
+            ]))
+        return result
+
+    # Forward: discover positions in order of their tile sum
+    order: List[List[int]] = []
+    found = 0
+    while layers:
+        total = min(layers)
+        layer = list(layers.pop(total))
+        order.append(layer)
+        found += len(layer)
+        if progress is not None:
+            progress(total, found)
+        for board in layer:
+            if boards.max_exponent(board) >= goal_exponent:
+                continue
+            for _, spawned in successors(board):
+                for index, successor in enumerate(spawned):
+                    layers.setdefault(total + (1 << spawns[index % 2]), set()).add(successor)
+
+    # Backward: (win probability, expected moves) of each position
+    values: Dict[int, Tuple[float, float]] = {}
+    solution: Solution = {}
+    for layer in reversed(order):
+        for board in layer:
+            if boards.max_exponent(board) >= goal_exponent:
+                values[board] = (1.0, 0.0)
+                solution[board] = (NO_MOVE, 1.0)
+                continue
+            best_value = (0.0, 0.0)
+            best_move = NO_MOVE
+            for direction, spawned in successors(board):
+                wins = moves = 0.0
+                for successor in spawned:
+                    win, played = values[successor]
+                    wins += win
+                    moves += played
+                value = (wins / len(spawned), 1.0 + moves / len(spawned))
+                if best_move == NO_MOVE or value > best_value:
+                    best_value, best_move = value, MOVE_CODES[direction]
+            values[board] = best_value
+            solution[board] = (best_move, best_value[0])
+    return solution
+
+
+def encode_tablebase(solution: Solution, grid_length: int, goal_number: int, start_number: int) -> bytes:
+    """
+    Lay a solution out as an open-addressing hash table.
+
+    The file is a 32-byte header followed by three columns of one entry per
+    slot: the keys (8 bytes), the win probabilities (4-byte floats) and the
+    move codes (1 byte). There are at least twice as many slots as positions,
+    so a lookup probes about one slot and never touches more than a few pages.
+    """
+    if sys.byteorder != "little":
+        raise TablebaseException("Tablebases can only be built on little-endian hosts")
+    slots = 8
+    while slots < 2 * len(solution):
+        slots *= 2
+    bits = slots.bit_length() - 1
+    keys = _typed_array("Q", slots)
+    wins = _typed_array("f", slots)
+    moves = bytearray(slots)
+    for board, (move, win) in solution.items():
+        slot = _slot(board, bits)
+        while keys[slot]:
+            slot = (slot + 1) & (slots - 1)
+        keys[slot] = board | _OCCUPIED
+        wins[slot] = win
+        moves[slot] = move
+
+    header = _HEADER.pack(
+        TABLEBASE_MAGIC, TABLEBASE_VERSION, grid_length,
+        goal_number.bit_length() - 1, start_number.bit_length() - 1, slots, len(solution),
+    )
+    return header + keys.tobytes() + wins.tobytes() + bytes(moves)
+
+
+def tablebase_name(grid_length: int, goal_number: int) -> str:
+    """File name of the tablebase of a grid size and goal, e.g. "3x3-64.tb"."""
+    return f"{grid_length}x{grid_length}-{goal_number}.tb"
+
+
+class Tablebase:
+    """
+    Read-only view of an encoded tablebase, usually memory-mapped from disk.
+
+    A lookup canonicalizes the board (eight symmetric images), probes the
+    hash table and maps the stored move back onto the board: O(1), with
+    only the pages actually probed read from disk.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        """
+        Raises:
+            TablebaseException: If the buffer does not hold a tablebase this version can read.
+        """
+        if len(buffer) < _HEADER.size:
+            raise TablebaseException("Truncated tablebase")
+        magic, version, grid_length, goal_exponent, start_exponent, slots, count = _HEADER.unpack_from(buffer)
+        if magic != TABLEBASE_MAGIC or version != TABLEBASE_VERSION or slots & (slots - 1):
+            raise TablebaseException("Unsupported tablebase")
+        if len(buffer) != _HEADER.size + 13 * slots or sys.byteorder != "little":
+            raise TablebaseException("Truncated tablebase")
+
+        self.grid_length = grid_length
+        self.goal_number = 1 << goal_exponent
+        self.start_number = 1 << start_exponent
+        self.count = count
+        self.__boards = SmallBoards(grid_length)
+        self.__bits = slots.bit_length() - 1
+        self.__mask = slots - 1
+        view = memoryview(buffer)
+        offset = _HEADER.size
+        self.__keys = view[offset:offset + 8 * slots].cast("Q")
+        offset += 8 * slots
+        self.__wins = view[offset:offset + 4 * slots].cast("f")
+        self.__moves = view[offset + 4 * slots:]
+
+    @staticmethod
+    def open(path: str) -> "Tablebase":
+        """Memory-map a tablebase file."""
+        with open(path, "rb") as file:
+            return Tablebase(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def lookup(self, board: int) -> Optional[Tuple[Optional[Direction], float]]:
+        """
+        Best move and win probability of a packed board.
+
+        Returns:
+            The move (None when the game is over) and the probability of
+            reaching the goal playing perfectly, or None if the position
+            cannot be reached in the solved game.
+        """
+        canonical, symmetry = self.__boards.canonical(board)
+        key = canonical | _OCCUPIED
+        slot = _slot(canonical, self.__bits)
+        while True:
+            stored = self.__keys[slot]
+            if stored == key:
+                break
+            if not stored:
+                return None
+            slot = (slot + 1) & self.__mask
+
+        code = self.__moves[slot]
+        if code == NO_MOVE:
+            return None, self.__wins[slot]
+        return SmallBoards.map_direction(CODE_MOVES[code], symmetry, inverse=True), self.__wins[slot]
+
+
+def _slot(board: int, bits: int) -> int:
+    """Fibonacci hash of a board onto a table of 2^bits slots."""
+    return ((board * _FIBONACCI) & _U64) >> (64 - bits)
+
+
+def _typed_array(typecode: str, length: int) -> array:
+    return array(typecode, bytes(struct.calcsize(typecode) * length))
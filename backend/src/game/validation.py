@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import random
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional, Union
+
+from src.config.settings import SETTINGS
+from src.game.bitboard import CELL_BITS, can_move, empty_cells, max_exponent, move, row_tables
+from src.game.board import GameBoard, GameBoardException
+from src.game.codec import MAX_EXPONENT, pack_board
+from src.game.direction import Direction
+from src.game.status import GameStatus
+
+MOVE_NAMES: Dict[str, Direction] = {
+    **{direction.value: direction for direction in Direction},
+    **{direction.value[0]: direction for direction in Direction},
+}
+"""Accepted spellings of a move: the direction name or its first letter, in any case."""
+
+
+class Violation(str, Enum):
+    """Reason a submitted game history was rejected."""
+    MALFORMED = "malformed"
+    """The record is missing its seed or moves, or they have the wrong type."""
+
+    UNKNOWN_MOVE = "unknown_move"
+    """A move is not one of the four directions."""
+
+    NO_CHANGE = "no_change"
+    """A move left the board unchanged, so it cannot be part of the history."""
+
+    GAME_OVER = "game_over"
+    """A move was made after the game was won or lost."""
+
+    CLAIM_MISMATCH = "claim_mismatch"
+    """The replayed game does not match the claimed turns, largest number or status."""
+
+
+class ValidationResult:
+    """
+    Outcome of replaying a submitted game history.
+
+    Attributes:
+        game_id: Identifier of the game in its source (record id or position).
+        turns: Moves replayed successfully.
+        largest_number: Largest tile after the last replayed move.
+        status: Status after the last replayed move.
+        violation: Why the history was rejected, or None if it is valid.
+        step: Index of the first illegal move, when a move was at fault.
+        detail: Human-readable description of the violation.
+    """
+    __slots__ = ("game_id", "turns", "largest_number", "status", "violation", "step", "detail")
+
+    def __init__(
+        self,
+        game_id: Any,
+        turns: int = 0,
+        largest_number: int = 0,
+        status: Optional[GameStatus] = None,
+        violation: Optional[Violation] = None,
+        step: Optional[int] = None,
+        detail: str = "",
+    ):
+        self.game_id = game_id
+        self.turns = turns
+        self.largest_number = largest_number
+        self.status = status
+        self.violation = violation
+        self.step = step
+        self.detail = detail
+
+    @property
+    def valid(self) -> bool:
+        return self.violation is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.game_id,
+            "valid": self.valid,
+            "turns": self.turns,
+            "largest_number": self.largest_number,
+            "status": str(self.status) if self.status is not None else None,
+            "violation": self.violation.value if self.violation is not None else None,
+            "step": self.step,
+            "detail": self.detail,
+        }
+
+
+def validate_game(
+    seed: int,
+    moves: Iterable[Union[Direction, str]],
+    grid_length: int = SETTINGS.game.grid_length,
+    game_id: Any = None,
+    claims: Optional[Dict[str, Any]] = None,
+) -> ValidationResult:
+    """
+    Replay a seeded game and check every transition against the game rules.
+
+    Tile spawns of seeded games depend only on the seed and the turn (see
+    `src.game.board.spawn_random`), so the history is replayed exactly as
+    the server played it. Every move must change the board and the game
+    must not be over before it. 4x4 games on the standard goal are replayed
+    on packed boards, other games through `GameBoard`.
+
+    Args:
+        seed: Seed the game was created with.
+        moves: Moves that changed the board, in order.
+        grid_length: Width and height of the grid.
+        game_id: Identifier reported back in the result.
+        claims: Optional claimed "turns", "largest_number" and "status" of the
+            final board, checked once the whole history is valid.
+
+    Returns:
+        ValidationResult: The replayed game, with the first violation if any.
+    """
+    if not isinstance(seed, int) or isinstance(seed, bool) or seed < 0:
+        return ValidationResult(game_id, violation=Violation.MALFORMED, detail="seed must be a non-negative integer")
+
+    game = GameBoard.create_new(grid_length=grid_length, seed=seed)
+    goal = SETTINGS.game.goal_number
+    goal_exponent = goal.bit_length() - 1
+    if grid_length == 4 and goal == 1 << goal_exponent and goal_exponent < MAX_EXPONENT:
+        result = _replay_packed(pack_board(game.get_board()), seed, goal_exponent, moves, game_id)
+    else:
+        result = _replay_game(game, moves, game_id)
+
+    if result.valid and claims:
+        _check_claims(result, claims)
+    return result
+
+
+def _replay_packed(
+    board: int,
+    seed: int,
+    goal_exponent: int,
+    moves: Iterable[Union[Direction, str]],
+    game_id: Any,
+) -> ValidationResult:
+    """Replay on a packed 4x4 board, spawning exactly like `GameBoard`."""
+    tables = row_tables()
+    start = SETTINGS.game.start_number.bit_length() - 1
+    spawn_exponents = [start, start + 1]
+    turns = 0
+    won = False
+
+    for step, name in enumerate(moves):
+        direction = _parse_move(name)
+        if direction is None:
+            return _packed_result(game_id, board, turns, won, Violation.UNKNOWN_MOVE, step, f"unknown move {name!r}")
+        if won:
+            return _packed_result(game_id, board, turns, won, Violation.GAME_OVER, step, "move after the game was won")
+
+        moved, gained = move(board, direction, tables)
+        if moved == board:
+            if not can_move(board, tables):
+                return _packed_result(game_id, board, turns, won, Violation.GAME_OVER, step, "move after the game was lost")
+            return _packed_result(game_id, board, turns, won, Violation.NO_CHANGE, step, f"{direction.value} does not change the board")
+
+        turns += 1
+        generator = random.Random((seed << 32) | turns)
+        exponent = generator.choice(spawn_exponents)
+        cell = generator.choice(empty_cells(moved))
+        board = moved | exponent << (CELL_BITS * cell)
+        # Only a merge creating the goal tile can win, and it alone gains at least the goal
+        if gained >> goal_exponent:
+            won = max_exponent(board) == goal_exponent
+
+    return _packed_result(game_id, board, turns, won)
+
+
+def _packed_result(
+    game_id: Any,
+    board: int,
+    turns: int,
+    won: bool,
+    violation: Optional[Violation] = None,
+    step: Optional[int] = None,
+    detail: str = "",
+) -> ValidationResult:
+    if won:
+        status = GameStatus.WIN
+    else:
+        status = GameStatus.ONGOING if can_move(board) else GameStatus.LOSE
+    return ValidationResult(game_id, turns, 1 << max_exponent(board), status, violation, step, detail)
+
+
+def _replay_game(game: GameBoard, moves: Iterable[Union[Direction, str]], game_id: Any) -> ValidationResult:
+    """Replay through `GameBoard`, for grids and goals the packed replay does not cover."""
+    def result(violation: Optional[Violation] = None, step: Optional[int] = None, detail: str = ""):
+        return ValidationResult(game_id, game.turns, game.largest_number(), game.status(), violation, step, detail)
+
+    for step, name in enumerate(moves):
+        direction = _parse_move(name)
+        if direction is None:
+            return result(Violation.UNKNOWN_MOVE, step, f"unknown move {name!r}")
+        turns = game.turns
+        try:
+            direction.apply_to_board(game)
+        except GameBoardException as e:
+            return result(Violation.GAME_OVER, step, str(e))
+        if game.turns == turns:
+            return result(Violation.NO_CHANGE, step, f"{direction.value} does not change the board")
+    return result()
+
+
+def _parse_move(name: Union[Direction, str]) -> Optional[Direction]:
+    if not isinstance(name, str):
+        return None
+    return MOVE_NAMES.get(name.lower())
+
+
+def _check_claims(result: ValidationResult, claims: Dict[str, Any]) -> None:
+    actual = {
+        "turns": result.turns,
+        "largest_number": result.largest_number,
+        "status": str(result.status),
+    }
+    for key, value in actual.items():
+        claimed = claims.get(key)
+        if claimed is None:
+            continue
+        if isinstance(claimed, str):
+            claimed = claimed.upper()
+        if claimed != value:
+            result.violation = Violation.CLAIM_MISMATCH
+            result.detail = f"claimed {key} {claims[key]!r}, replayed {value!r}"
+            return
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.config.settings import SETTINGS
+from src.game.board import GameBoard
+from src.game.status import GameStatus
+
+ALL_TIME = "all"
+TODAY = "today"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS top_games (
+    board TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    largest_number INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    recommender TEXT NOT NULL,
+    source TEXT NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS top_games_rank ON top_games (board, score DESC, finished_at);
+CREATE TABLE IF NOT EXISTS bucket_stats (
+    bucket INTEGER NOT NULL,
+    recommender TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (bucket, recommender, metric, value)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS recorded_games (
+    seed INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recorded_games_age ON recorded_games (finished_at);
+"""
+
+_UPSERT_STAT = """
+INSERT INTO bucket_stats (bucket, recommender, metric, value, count) VALUES (?, ?, ?, ?, 1)
+ON CONFLICT (bucket, recommender, metric, value) DO UPDATE SET count = count + 1
+"""
+
+
+class GameOutcome:
+    """
+    A finished game as recorded on the leaderboard.
+
+    The score is the sum of the tiles on the final board, which grows with
+    every spawn and rewards both long games and large tiles. The seed
+    identifies the game, so it is only recorded once.
+    """
+    __slots__ = ("score", "largest_number", "turns", "status", "recommender", "source", "finished_at", "seed")
+
+    def __init__(
+        self,
+        score: int,
+        largest_number: int,
+        turns: int,
+        status: str,
+        recommender: str,
+        source: str,
+        finished_at: float,
+        seed: Optional[int] = None,
+    ):
+        self.score = score
+        self.largest_number = largest_number
+        self.turns = turns
+        self.status = status
+        self.recommender = recommender
+        self.source = source
+        self.finished_at = finished_at
+        self.seed = seed
+
+    @staticmethod
+    def from_game(game: GameBoard, source: str, recommender: str, finished_at: float) -> GameOutcome:
+        return GameOutcome(
+            score=sum(cell or 0 for row in game.get_board() for cell in row),
+            largest_number=game.largest_number(),
+            turns=game.turns,
+            status=game.status().name,
+            recommender=recommender,
+            source=source,
+            finished_at=finished_at,
+            seed=game.seed,
+        )
+
+
+class RecommenderStats:
+    """Aggregated outcomes of the games played with one recommender ("" for none)."""
+
+    def __init__(self, recommender: str):
+        self.recommender = recommender
+        self.games = 0
+        self.wins = 0
+        self.max_tiles: Dict[int, int] = {}
+        self.turns: Dict[int, int] = {}
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+
+class Leaderboard:
+    """
+    Top games and rolling outcome statistics, persisted to SQLite.
+
+    The best `top_k` games are kept for all time and for each UTC day. Each
+    board is mirrored by an in-memory min-heap of its entries, so a game that
+    does not make a board is rejected in O(1) and one that does replaces the
+    weakest entry in O(log K); reads are a single index range scan of K rows.
+    Game counts, wins, the largest tile distribution and a power-of-two turns
+    histogram are kept per recommender and time bucket, each an O(1) upsert.
+
+    Several worker processes may share the database: each only deletes
+    entries its own heap proves are outside the top K, so reads stay exact.
+    The connection is opened on first use in each process, so workers forked
+    after the app was preloaded never share a SQLite handle.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        top_k: int,
+        bucket_seconds: int,
+        retention_days: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a private in-memory database).
+            top_k: Number of games kept per board.
+            bucket_seconds: Width of a statistics bucket.
+            retention_days: Days of daily boards and statistics buckets kept.
+            clock: Wall clock returning seconds since the epoch, injectable for tests.
+        """
+        self.top_k = top_k
+        self.bucket_seconds = bucket_seconds
+        self.retention_days = retention_days
+        self.path = path
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__connection: Optional[sqlite3.Connection] = None
+        self.__pid = 0
+        # Handles opened by a parent process, kept referenced so they are never closed here
+        self.__inherited: List[sqlite3.Connection] = []
+        # board -> min-heap of (score, -finished_at, rowid), weakest entry first
+        self.__heaps: Dict[str, List[Tuple[int, float, int]]] = {}
+        self.__current_day = ""
+
+    def record(self, outcome: GameOutcome) -> bool:
+        """
+        Add a finished game to the boards and statistics.
+
+        A seeded game is only recorded the first time it ends, so replaying
+        an earlier state token (or undoing and replaying the last move of a
+        session) cannot add it again within the retention period. This writes to SQLite and commits, so
+        call it off the event loop.
+
+        Returns:
+            False if the game was already recorded.
+        """
+        with self.__lock, self.__connect() as connection:
+            if outcome.seed is not None and not connection.execute(
+                "INSERT OR IGNORE INTO recorded_games (seed, finished_at) VALUES (?, ?)",
+                (outcome.seed, outcome.finished_at),
+            ).rowcount:
+                return False
+            if _day(outcome.finished_at) != self.__current_day:
+                self.__prune(outcome.finished_at)
+            for board in (ALL_TIME, _day_board(outcome.finished_at)):
+                self.__admit(board, outcome)
+
+            bucket = int(outcome.finished_at // self.bucket_seconds) * self.bucket_seconds
+            stats = [
+                (bucket, outcome.recommender, "games", 0),
+                (bucket, outcome.recommender, "max_tile", outcome.largest_number),
+                (bucket, outcome.recommender, "turns", _turns_bin(outcome.turns)),
+            ]
+            if outcome.status == GameStatus.WIN.name:
+                stats.append((bucket, outcome.recommender, "wins", 0))
+            self.__connection.executemany(_UPSERT_STAT, stats)
+        return True
+
+    def top(self, board: str = ALL_TIME, limit: Optional[int] = None) -> List[GameOutcome]:
+        """
+        Best games of a board, best first.
+
+        Args:
+            board: "all", "today" or a UTC day as "YYYY-MM-DD".
+            limit: Number of games, at most `top_k`.
+        """
+        if board == TODAY:
+            board = _day_board(self.__clock())
+        elif board != ALL_TIME:
+            board = f"day:{board}"
+        limit = min(limit or self.top_k, self.top_k)
+        with self.__lock:
+            rows = self.__connect().execute(
+                "SELECT score, largest_number, turns, status, recommender, source, finished_at"
+                " FROM top_games WHERE board = ? ORDER BY score DESC, finished_at LIMIT ?",
+                (board, limit),
+            ).fetchall()
+        return [GameOutcome(*row) for row in rows]
+
+    def stats(self, since_seconds: float) -> List[RecommenderStats]:
+        """Aggregated outcomes per recommender over the buckets of the last `since_seconds`."""
+        since = int((self.__clock() - since_seconds) // self.bucket_seconds) * self.bucket_seconds
+        with self.__lock:
+            rows = self.__connect().execute(
+                "SELECT recommender, metric, value, SUM(count) FROM bucket_stats"
+                " WHERE bucket >= ? GROUP BY recommender, metric, value",
+                (since,),
+            ).fetchall()
+
+        by_recommender: Dict[str, RecommenderStats] = {}
+        for recommender, metric, value, count in rows:
+            stats = by_recommender.get(recommender)
+            if stats is None:
+                stats = by_recommender[recommender] = RecommenderStats(recommender)
+            if metric == "games":
+                stats.games = count
+            elif metric == "wins":
+                stats.wins = count
+            elif metric == "max_tile":
+                stats.max_tiles[value] = count
+            else:
+                stats.turns[value] = count
+        return sorted(by_recommender.values(), key=lambda stats: stats.recommender)
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__connection is not None and self.__pid == os.getpid():
+                self.__connection.close()
+            self.__connection = None
+
+    def __connect(self) -> sqlite3.Connection:
+        """The connection of this process, opened (and the schema created) on first use."""
+        if self.__connection is not None and self.__pid == os.getpid():
+            return self.__connection
+        if self.__connection is not None:
+            self.__inherited.append(self.__connection)
+        connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        self.__connection, self.__pid = connection, os.getpid()
+        self.__heaps.clear()
+        with connection:
+            self.__prune(self.__clock())
+        return connection
+
+    def __admit(self, board: str, outcome: GameOutcome) -> None:
+        heap = self.__heaps.get(board)
+        if heap is None:
+            heap = self.__heaps[board] = self.__load(board)
+        key = (outcome.score, -outcome.finished_at)
+        if len(heap) >= self.top_k and key <= heap[0][:2]:
+            return
+
+        cursor = self.__connection.execute(
+            "INSERT INTO top_games (board, score, largest_number, turns, status, recommender, source, finished_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (board, outcome.score, outcome.largest_number, outcome.turns, outcome.status,
+             outcome.recommender, outcome.source, outcome.finished_at),
+        )
+        entry = (*key, cursor.lastrowid)
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, entry)
+            return
+        _, _, evicted = heapq.heapreplace(heap, entry)
+        self.__connection.execute("DELETE FROM top_games WHERE rowid = ?", (evicted,))
+
+    def __load(self, board: str) -> List[Tuple[int, float, int]]:
+        rows = self.__connection.execute(
+            "SELECT score, -finished_at, rowid FROM top_games WHERE board = ?"
+            " ORDER BY score DESC, finished_at LIMIT ?",
+            (board, self.top_k),
+        ).fetchall()
+        heap = [tuple(row) for row in rows]
+        heapq.heapify(heap)
+        return heap
+
+    def __prune(self, now: float) -> None:
+        """Drop daily boards, statistics buckets and recorded seeds older than the retention period."""
+        self.__current_day = _day(now)
+        cutoff = now - self.retention_days * 86400
+        oldest_board = _day_board(cutoff)
+        self.__connection.execute(
+            "DELETE FROM top_games WHERE board LIKE 'day:%' AND board < ?", (oldest_board,)
+        )
+        self.__connection.execute("DELETE FROM bucket_stats WHERE bucket < ?", (cutoff,))
+        self.__connection.execute("DELETE FROM recorded_games WHERE finished_at < ?", (cutoff,))
+        for board in [board for board in self.__heaps if board.startswith("day:") and board < oldest_board]:
+            del self.__heaps[board]
+
+
+def _day(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _day_board(timestamp: float) -> str:
+    return f"day:{_day(timestamp)}"
+
+
+def _turns_bin(turns: int) -> int:
+    """Lower bound of the power-of-two bin holding a turn count (0, 1, 2, 4, 8, ...)."""
+    return 1 << (turns.bit_length() - 1) if turns else 0
+
+
+def record_outcome(game: GameBoard, source: str, recommender: str = "") -> None:
+    """Record a finished game on the configured leaderboard, if enabled."""
+    if leaderboard is not None and game.status().is_terminal:
+        leaderboard.record(GameOutcome.from_game(game, source, recommender, time.time()))
+
+
+leaderboard: Optional[Leaderboard] = (
+    Leaderboard(
+        path=SETTINGS.leaderboard.path,
+        top_k=SETTINGS.leaderboard.top_k,
+        bucket_seconds=SETTINGS.leaderboard.bucket_seconds,
+        retention_days=SETTINGS.leaderboard.retention_days,
+    )
+    if SETTINGS.leaderboard.enabled else None
+)
@@ -1,4 +1,5 @@
 import uvicorn
+from src.app.server import serve
 from src.config.settings import SETTINGS
 
 def main() -> None:
@@ -8,6 +9,10 @@ def main() -> None:
     print(f"Starting 2048 game server at http://{app_settings.host}:{app_settings.port}")
     print("Press Ctrl+C to stop the server.")
 
+    if app_settings.server_mode == "production":
+        serve(app_settings)
+        return
+
     uvicorn.run(
         "src.app.app:app",
         host=app_settings.host,
@@ -0,0 +1,334 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+"""Latency histogram bucket upper bounds in seconds."""
+
+
+class _ThreadShards:
+    """
+    Per-thread value dictionaries.
+
+    Each thread only ever writes to its own dictionary, so recording a value
+    takes no lock. The lock is only taken the first time a thread records
+    anything and when rendering. When a thread exits (threadpool workers come
+    and go), its values are folded into a shared base dictionary, so the
+    number of shards follows the number of live threads.
+    """
+
+    def __init__(self, merge: Callable[[Any, Any], Any]):
+        """
+        Args:
+            merge: Combines the values of one key from two shards.
+        """
+        self.__local = threading.local()
+        self.__merge = merge
+        self.__base: dict = {}
+        self.__shards: Dict[int, dict] = {}
+        # Reentrant, as a retiring thread's finalizer may run wherever its sentinel is collected
+        self.__lock = threading.RLock()
+
+    def local(self) -> dict:
+        try:
+            return self.__local.values
+        except AttributeError:
+            values: dict = {}
+            sentinel = _ThreadSentinel()
+            with self.__lock:
+                self.__shards[id(values)] = values
+            # The thread-local sentinel is dropped when the thread exits
+            weakref.finalize(sentinel, self.__retire, values)
+            self.__local.sentinel = sentinel
+            self.__local.values = values
+            return values
+
+    def snapshot(self) -> List[dict]:
+        with self.__lock:
+            return [self.__base.copy()] + [shard.copy() for shard in list(self.__shards.values())]
+
+    def __len__(self) -> int:
+        """Number of shards of live threads."""
+        return len(self.__shards)
+
+    def __retire(self, values: dict) -> None:
+        with self.__lock:
+            self.__shards.pop(id(values), None)
+            for key, value in values.items():
+                self.__base[key] = self.__merge(self.__base[key], value) if key in self.__base else value
+
+
+class _ThreadSentinel:
+    """Weak-referenceable marker whose collection signals that its thread has exited."""
+    __slots__ = ("__weakref__",)
+
+
+class Metric:
+    """Base class of a named metric family with a fixed set of label names."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Current samples as (sample name, labels, value)."""
+        raise NotImplementedError
+
+    def _label_dict(self, values: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labels, values))
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self.__shards = _ThreadShards(lambda total, value: total + value)
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        values = self.__shards.local()
+        values[label_values] = values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return sum(shard.get(label_values, 0.0) for shard in self.__shards.snapshot())
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        totals: Dict[LabelValues, float] = {}
+        for shard in self.__shards.snapshot():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return [(self.name, self._label_dict(key), value) for key, value in sorted(totals.items())]
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self.__shards = _ThreadShards(lambda total, state: [a + b for a, b in zip(total, state)])
+
+    def observe(self, value: float, *label_values: str) -> None:
+        values = self.__shards.local()
+        state = values.get(label_values)
+        if state is None:
+            # Per-bucket counts (last one is +Inf), then sum
+            state = values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def count(self, *label_values: str) -> int:
+        return sum(sum(shard[label_values][:-1]) for shard in self.__shards.snapshot()
+                   if label_values in shard)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        totals: Dict[LabelValues, List[float]] = {}
+        for shard in self.__shards.snapshot():
+            for key, state in shard.items():
+                total = totals.setdefault(key, [0] * len(state))
+                for index, value in enumerate(list(state)):
+                    total[index] += value
+
+        samples = []
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for key, total in sorted(totals.items()):
+            labels = self._label_dict(key)
+            cumulative = 0
+            for bound, count in zip(bounds, total[:-1]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": bound}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total[-1]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class CallbackMetric(Metric):
+    """Metric whose values are read from a callback when rendered."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labels: Sequence[str] = (),
+        type_name: str = "gauge",
+    ):
+        super().__init__(name, documentation, labels)
+        self.type_name = type_name
+        self.__callback = callback
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [
+            (self.name, self._label_dict(key), value)
+            for key, value in sorted(self.__callback().items())
+        ]
+
+
+class MetricsRegistry:
+    """
+    Collection of metric families rendered in the Prometheus text format.
+
+    Values are kept per process; with several server workers each worker
+    reports its own. With ``worker_label`` every sample carries the pid of
+    the reporting process as a ``worker`` label, so counters of different
+    workers form separate series instead of jumping back and forth.
+    """
+
+    def __init__(self, worker_label: bool = False):
+        """
+        Args:
+            worker_label: Add a ``worker`` label with the process id to every sample.
+        """
+        self.__metrics: Dict[str, Metric] = {}
+        self.__worker_label = worker_label
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self.__metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.__metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labels: Sequence[str] = (),
+        type_name: str = "gauge",
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, callback, labels, type_name))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format (0.0.4)."""
+        # Read at render time, as workers are forked after the registry is created
+        worker = {"worker": str(os.getpid())} if self.__worker_label else {}
+        lines = []
+        for metric in self.__metrics.values():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels({**labels, **worker})} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up a task that sleeps at a fixed interval.
+
+    Anything blocking the loop (CPU-bound work, synchronous I/O) shows up as lag.
+    """
+
+    def __init__(self, histogram: Histogram, interval: float):
+        self.histogram = histogram
+        self.interval = interval
+        self.last_lag = 0.0
+        self.__task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.__task is None and self.interval > 0:
+            self.__task = asyncio.get_running_loop().create_task(self.__run())
+
+    async def stop(self) -> None:
+        task, self.__task = self.__task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def __run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, time.perf_counter() - expected)
+            self.histogram.observe(self.last_lag)
+
+
+metrics = MetricsRegistry(worker_label=True)
+
+http_requests = metrics.counter(
+    "http_requests_total", "HTTP requests handled, by route, method and status.",
+    ("route", "method", "status"),
+)
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency, by route.", ("route",),
+)
+recommendation_duration = metrics.histogram(
+    "recommendation_duration_seconds", "Time spent by recommenders, by provider and model.",
+    ("provider", "model"),
+)
+recommendation_fallbacks = metrics.counter(
+    "recommendation_fallbacks_total",
+    "Recommendations answered by the heuristic fallback, by provider, model and reason.",
+    ("provider", "model", "reason"),
+)
+rate_limit_rejections = metrics.counter(
+    "rate_limit_rejections_total", "Requests rejected by rate limits, by route.", ("route",),
+)
+cache_lookups = metrics.counter(
+    "cache_lookups_total", "Cache lookups, by cache and result (hit or miss).", ("cache", "result"),
+)
+speculations = metrics.counter(
+    "speculative_recommendations_total",
+    "Speculative recommendations, by outcome (started, cached, cancelled, skipped_busy, skipped_budget).",
+    ("outcome",),
+)
+event_loop_lag = metrics.histogram(
+    "event_loop_lag_seconds", "Delay of the event loop waking up a periodic task.",
+)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,42 @@
+import time
+from typing import Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.metrics.metrics import http_request_duration, http_requests
+
+TRACKED_ROUTES = ("/api/new", "/api/move", "/api/undo", "/api/redo", "/api/recommend", "/api/models")
+"""Routes whose requests are counted and timed (a fixed set keeps label cardinality bounded)."""
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the count and latency of requests to tracked routes.
+
+    Added last so it wraps every other middleware, including rate limiting.
+    """
+
+    def __init__(self, app: ASGIApp, routes: Iterable[str] = TRACKED_ROUTES):
+        self.app = app
+        self.routes = frozenset(routes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.routes:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            path = scope["path"]
+            http_request_duration.observe(time.perf_counter() - start, path)
+            http_requests.inc(path, scope["method"], str(status))
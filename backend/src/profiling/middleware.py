@@ -0,0 +1,93 @@
+import hmac
+import random
+import threading
+import time
+from typing import Iterable, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.profiling.profiler import ProfileStore, StackSampler
+
+PROFILE_TOKEN_HEADER = "x-profile-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling selected requests with a stack sampler.
+
+    A request is profiled when it carries the admin token header, or at
+    random with probability `sample_rate`. Only one request is profiled at a
+    time; others pass through untouched. The profile id is returned in the
+    `X-Profile-Id` response header and the profile is written to the store
+    once the response has been sent.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        admin_token: str,
+        sample_rate: float,
+        routes: Iterable[str],
+        interval: float,
+    ):
+        self.app = app
+        self.store = store
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.routes = frozenset(routes)
+        self.interval = interval
+        self.__busy = threading.Lock()
+        # Private generator, so sampling never disturbs the game's random sequence
+        self.__random = random.Random()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        trigger = self.__trigger(scope)
+        if trigger is None or not self.__busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        name = self.store.new_name(scope["path"])
+        status = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (PROFILE_ID_HEADER, name.encode())]
+            await send(message)
+
+        sampler = StackSampler(self.interval)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            elapsed = time.perf_counter() - start
+            self.__busy.release()
+            header = (
+                f"# route {scope['method']} {scope['path']}\n"
+                f"# status {status}\n"
+                f"# trigger {trigger}\n"
+                f"# duration_seconds {elapsed:.6f}\n"
+                f"# interval_seconds {self.interval}\n"
+                f"# samples {sampler.samples}\n"
+            )
+            await run_in_threadpool(self.store.save, name, header + sampler.folded())
+
+    def __trigger(self, scope: Scope) -> Optional[str]:
+        """Why this request should be profiled, or None."""
+        if scope["type"] != "http" or scope["path"] not in self.routes:
+            return None
+        if self.admin_token:
+            for key, value in scope["headers"]:
+                if key == PROFILE_TOKEN_HEADER.encode():
+                    if hmac.compare_digest(value, self.admin_token.encode()):
+                        return "header"
+                    break
+        if self.sample_rate > 0 and self.__random.random() < self.sample_rate:
+            return "sample"
+        return None
@@ -0,0 +1,169 @@
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from types import CodeType, FrameType
+from typing import List, Optional, Tuple
+
+from src.config.settings import SETTINGS
+
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Project frames that are on the stack whether or not a request is being handled
+_ENTRYPOINTS = tuple(
+    os.path.join(_SOURCE_ROOT, path)
+    for path in ("main.py", os.path.join("app", "server.py"), "profiling")
+)
+_PROFILE_NAME = re.compile(r"^[0-9]{13}-[a-z0-9-]+-[0-9a-f]{8}\.folded$")
+PROFILE_SUFFIX = ".folded"
+
+
+class StackSampler:
+    """
+    Samples the stacks of every thread at a fixed interval on a background thread.
+
+    Sampling covers the event loop thread and the threadpool threads running
+    `GameBoard` and recommender calls alike, and costs nothing once stopped.
+    Only stacks passing through this project's code are kept, which drops
+    idle threads. Work running concurrently for other requests is included,
+    and work in the recommendation process pool is not visible.
+    """
+
+    def __init__(self, interval: float):
+        """
+        Args:
+            interval: Seconds between two samples.
+        """
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.__thread = threading.Thread(target=self.__run, name="stack-sampler", daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def folded(self) -> str:
+        """Collapsed stacks, one "frame;frame;... count" line each, root first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def __run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self.__stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():  # pylint: disable=protected-access
+                if thread_id == own_id:
+                    continue
+                stack = _collapse(frame)
+                if stack is None:
+                    continue
+                if thread_id not in names:
+                    names[thread_id] = _thread_name(thread_id)
+                self.stacks[f"{names[thread_id]};{stack}"] += 1
+
+
+class ProfileStore:
+    """
+    Bounded ring of profile files on disk.
+
+    File names start with the creation time in milliseconds, so sorting by
+    name sorts by age and the oldest files are deleted first.
+    """
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "khair-2048-profiles")
+        self.max_files = max_files
+
+    @staticmethod
+    def new_name(route: str) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "-", route.lower()).strip("-") or "root"
+        return f"{int(time.time() * 1000):013d}-{slug}-{os.urandom(4).hex()}{PROFILE_SUFFIX}"
+
+    def save(self, name: str, content: str) -> None:
+        """Write a profile and delete the oldest ones beyond `max_files`."""
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = os.path.join(self.directory, f".{name}.tmp")
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(temporary, os.path.join(self.directory, name))
+
+        names = self.names()
+        for stale in names[:max(0, len(names) - self.max_files)]:
+            try:
+                os.remove(os.path.join(self.directory, stale))
+            except FileNotFoundError:
+                pass
+
+    def names(self) -> List[str]:
+        """Names of the stored profiles, oldest first."""
+        try:
+            entries = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in entries if _PROFILE_NAME.match(name))
+
+    def list(self) -> List[Tuple[str, int]]:
+        """(name, size in bytes) of the stored profiles, newest first."""
+        profiles = []
+        for name in reversed(self.names()):
+            try:
+                profiles.append((name, os.path.getsize(os.path.join(self.directory, name))))
+            except FileNotFoundError:
+                continue
+        return profiles
+
+    def path(self, name: str) -> Optional[str]:
+        """Path of a stored profile, or None for unknown or malformed names."""
+        if not _PROFILE_NAME.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+
+def _collapse(frame: Optional[FrameType]) -> Optional[str]:
+    frames = []
+    in_project = False
+    while frame is not None:
+        label, project = _frame_label(frame.f_code)
+        in_project = in_project or project
+        frames.append(label)
+        frame = frame.f_back
+    if not in_project:
+        return None
+    return ";".join(reversed(frames))
+
+
+@lru_cache(maxsize=4096)
+def _frame_label(code: CodeType) -> Tuple[str, bool]:
+    """Label of a code object and whether it is request-handling project code."""
+    filename = code.co_filename
+    project = filename.startswith(_SOURCE_ROOT)
+    if project:
+        filename = os.path.relpath(filename, os.path.dirname(_SOURCE_ROOT))
+    else:
+        filename = os.path.basename(filename)
+    label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+    return label, project and not code.co_filename.startswith(_ENTRYPOINTS)
+
+
+def _thread_name(thread_id: int) -> str:
+    for thread in threading.enumerate():
+        if thread.ident == thread_id:
+            return thread.name
+    return f"thread-{thread_id}"
+
+
+profile_store = ProfileStore(
+    directory=SETTINGS.profiling.directory,
+    max_files=SETTINGS.profiling.max_files,
+)
@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from src.config.settings import SETTINGS, CircuitBreakerSettings
+
+
+class CircuitOpenException(Exception):
+    """Raised when a call is rejected because its circuit is open."""
+
+
+class CircuitState(str, Enum):
+    """
+    Represents the state of a circuit breaker.
+    Inherits from str to allow direct JSON serialization.
+    """
+
+    CLOSED = "closed"
+    """Calls flow normally while outcomes are tracked."""
+
+    OPEN = "open"
+    """Calls are rejected immediately until the open period elapses."""
+
+    HALF_OPEN = "half_open"
+    """A limited number of probe calls decide whether to close or re-open."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker tracking the error rate and latency of a single provider/model.
+
+    The outcome of the most recent calls is kept in a fixed-size window. Calls
+    slower than ``slow_call_seconds`` count as failures. Once the failure rate
+    reaches the threshold the circuit opens and rejects calls; after
+    ``open_seconds`` it lets probe calls through and closes again on success.
+    """
+
+    def __init__(
+        self,
+        settings: CircuitBreakerSettings,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Create a closed circuit breaker.
+
+        Args:
+            settings: Thresholds and timings of the breaker.
+            clock: Monotonic clock returning seconds, injectable for tests.
+        """
+        self.__settings = settings
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__state = CircuitState.CLOSED
+        self.__outcomes: Deque[bool] = deque(maxlen=settings.window_size)
+        self.__latencies: Deque[float] = deque(maxlen=settings.window_size)
+        self.__opened_at = 0.0
+        self.__probes = 0
+        self.__transitions = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from OPEN to HALF_OPEN once the open period elapsed."""
+        with self.__lock:
+            self.__check_open_period()
+            return self.__state
+
+    @property
+    def transitions(self) -> int:
+        """Number of state changes so far, including a due OPEN to HALF_OPEN change."""
+        with self.__lock:
+            self.__check_open_period()
+            return self.__transitions
+
+    @property
+    def failure_rate(self) -> float:
+        """Failure rate (0-1) over the current window."""
+        with self.__lock:
+            if not self.__outcomes:
+                return 0.0
+            return self.__outcomes.count(False) / len(self.__outcomes)
+
+    @property
+    def mean_latency(self) -> float:
+        """Mean call latency in seconds over the current window."""
+        with self.__lock:
+            if not self.__latencies:
+                return 0.0
+            return sum(self.__latencies) / len(self.__latencies)
+
+    def allow_request(self) -> bool:
+        """
+        Decide whether a call may go through, reserving a probe slot when half-open.
+
+        Returns:
+            True if the call may proceed and its outcome must be recorded.
+        """
+        with self.__lock:
+            self.__check_open_period()
+            if self.__state == CircuitState.CLOSED:
+                return True
+            if self.__state == CircuitState.HALF_OPEN \
+                    and self.__probes < self.__settings.half_open_probes:
+                self.__probes += 1
+                return True
+            return False
+
+    def record_success(self, latency: float) -> None:
+        """Record a completed call, treating it as a failure if it was too slow."""
+        if latency > self.__settings.slow_call_seconds:
+            self.record_failure(latency)
+            return
+        with self.__lock:
+            self.__latencies.append(latency)
+            if self.__state == CircuitState.HALF_OPEN:
+                self.__transition(CircuitState.CLOSED)
+                return
+            self.__outcomes.append(True)
+
+    def record_failure(self, latency: float) -> None:
+        """Record a failed call."""
+        with self.__lock:
+            self.__latencies.append(latency)
+            if self.__state == CircuitState.HALF_OPEN:
+                self.__transition(CircuitState.OPEN)
+                return
+            self.__outcomes.append(False)
+            failures = self.__outcomes.count(False)
+            if self.__state == CircuitState.CLOSED \
+                    and len(self.__outcomes) >= self.__settings.min_calls \
+                    and failures / len(self.__outcomes) >= self.__settings.failure_rate_threshold:
+                self.__transition(CircuitState.OPEN)
+
+    def __check_open_period(self) -> None:
+        if self.__state == CircuitState.OPEN \
+                and self.__clock() - self.__opened_at >= self.__settings.open_seconds:
+            self.__transition(CircuitState.HALF_OPEN)
+
+    def __transition(self, state: CircuitState) -> None:
+        self.__state = state
+        self.__probes = 0
+        self.__transitions += 1
+        if state == CircuitState.OPEN:
+            self.__opened_at = self.__clock()
+        elif state == CircuitState.CLOSED:
+            self.__outcomes.clear()
+
+
+class CircuitBreakers:
+    """
+    Collection of circuit breakers, one per provider/model pair, created on first use.
+    """
+
+    def __init__(self, settings: Optional[CircuitBreakerSettings] = None):
+        self.__settings = settings or SETTINGS.recommendation.circuit_breaker
+        self.__breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self.__lock = threading.Lock()
+
+    def get(self, provider: str, model: str) -> CircuitBreaker:
+        """Get the breaker of a provider/model, creating a closed one if needed."""
+        key = (provider, model)
+        breaker = self.__breakers.get(key)
+        if breaker is None:
+            with self.__lock:
+                breaker = self.__breakers.setdefault(key, CircuitBreaker(self.__settings))
+        return breaker
+
+    def state(self, provider: str, model: str) -> CircuitState:
+        """Get the state of a provider/model without creating a breaker for it."""
+        breaker = self.__breakers.get((provider, model))
+        return breaker.state if breaker else CircuitState.CLOSED
+
+    @property
+    def revision(self) -> int:
+        """Counter that changes whenever any breaker changes state."""
+        return sum(breaker.transitions for breaker in list(self.__breakers.values()))
+
+    def reset(self) -> None:
+        """Forget every breaker."""
+        with self.__lock:
+            self.__breakers = {}
+
+
+breakers = CircuitBreakers()
@@ -0,0 +1,164 @@
+from typing import Dict, List, Optional, Tuple
+
+from src.config.settings import SETTINGS
+from src.game.bitboard import CELL_BITS, CELL_MASK, DIRECTIONS, ROW_BITS, ROW_MASK
+from src.game.bitboard import empty_cells, move, row_tables, transpose
+from src.game.board import Board
+from src.game.codec import pack_board
+from src.game.direction import Direction
+from src.recommendation.base import BaseRecommender
+
+LOST_PENALTY = 200_000.0
+
+_row_scores: Optional[List[float]] = None
+
+
+def _score_row(cells: List[int]) -> float:
+    """Static evaluation of a single row: open cells, merges, monotonicity and tile sum."""
+    empty = cells.count(0)
+    merges = 0
+    previous = 0
+    counter = 0
+    for cell in cells:
+        if not cell:
+            continue
+        if cell == previous:
+            counter += 1
+        elif counter > 0:
+            merges += 1 + counter
+            counter = 0
+        previous = cell
+    if counter > 0:
+        merges += 1 + counter
+
+    monotonic_left = monotonic_right = 0.0
+    for i in range(3):
+        if cells[i] > cells[i + 1]:
+            monotonic_left += cells[i] ** 4 - cells[i + 1] ** 4
+        else:
+            monotonic_right += cells[i + 1] ** 4 - cells[i] ** 4
+
+    tile_sum = sum(cell ** 3.5 for cell in cells)
+    return (
+        LOST_PENALTY / 4
+        + 270.0 * empty
+        + 700.0 * merges
+        - 47.0 * min(monotonic_left, monotonic_right)
+        - 11.0 * tile_sum
+    )
+
+
+def row_scores() -> List[float]:
+    """Return the per-row evaluation table, building it on first use."""
+    global _row_scores  # pylint: disable=global-statement
+    if _row_scores is None:
+        _row_scores = [
+            _score_row([(row >> (CELL_BITS * i)) & CELL_MASK for i in range(4)])
+            for row in range(ROW_MASK + 1)
+        ]
+    return _row_scores
+
+
+class ExpectimaxRecommender(BaseRecommender):
+    """
+    Expectimax search over packed boards.
+    Provider: heuristic
+    Model: expectimax
+
+    Alternates player moves with the expected value over every possible tile
+    spawn, scoring leaves with a table-driven row heuristic. It is CPU-bound
+    (tens of milliseconds per move), so it is normally run in the
+    recommendation process pool rather than on the event loop's threads.
+    """
+
+    def __init__(self, depth: int = 3):
+        """
+        Args:
+            depth: Number of player moves to look ahead.
+        """
+        self.depth = depth
+
+    @staticmethod
+    def preload() -> None:
+        """Build the lookup tables this recommender relies on."""
+        row_tables()
+        row_scores()
+
+    def suggest_move(self, grid: Board, model: str) -> Tuple[str, str]:
+        if len(grid) != 4 or any(len(row) != 4 for row in grid):
+            raise ValueError("Expectimax search only supports 4x4 boards")
+
+        best_move, _ = self.search(pack_board(grid))
+        if best_move is None:
+            return "left", "No moves seem to change the board state."
+        return best_move.value, (
+            f"Looking {self.depth} moves ahead over every possible tile spawn, "
+            f"moving {best_move.value} leads to the strongest expected position."
+        )
+
+    def search(self, board: int) -> Tuple[Optional[Direction], float]:
+        """
+        Best move on a packed 4x4 board and its expected value.
+
+        Returns:
+            Tuple[Optional[Direction], float]: The move, or None when no move
+                changes the board, and the expected value of playing it.
+        """
+        cache: Dict[Tuple[int, int], float] = {}
+        best_move = None
+        best_value = float("-inf")
+        for direction in DIRECTIONS:
+            moved, _ = move(board, direction)
+            if moved == board:
+                continue
+            value = self.__expect(moved, self.depth - 1, cache)
+            if value > best_value:
+                best_move, best_value = direction, value
+        return best_move, best_value if best_move is not None else 0.0
+
+    def __expect(self, board: int, depth: int, cache: Dict[Tuple[int, int], float]) -> float:
+        """Expected value of a board over the tile that spawns next."""
+        key = (board, depth)
+        if key in cache:
+            return cache[key]
+
+        cells = empty_cells(board)
+        if not cells:
+            value = self.__best(board, depth, cache)
+        else:
+            spawns = _spawn_exponents()
+            total = 0.0
+            for index in cells:
+                shift = CELL_BITS * index
+                for exponent in spawns:
+                    total += self.__best(board | (exponent << shift), depth, cache)
+            value = total / (len(cells) * len(spawns))
+        cache[key] = value
+        return value
+
+    def __best(self, board: int, depth: int, cache: Dict[Tuple[int, int], float]) -> float:
+        """Value of the best player move, or the static evaluation at the horizon."""
+        if depth <= 0:
+            return _evaluate(board)
+        best = None
+        for direction in DIRECTIONS:
+            moved, _ = move(board, direction)
+            if moved != board:
+                value = self.__expect(moved, depth - 1, cache)
+                best = value if best is None else max(best, value)
+        return 0.0 if best is None else best
+
+
+def _evaluate(board: int) -> float:
+    scores = row_scores()
+    columns = transpose(board)
+    return sum(
+        scores[(board >> (ROW_BITS * r)) & ROW_MASK] + scores[(columns >> (ROW_BITS * r)) & ROW_MASK]
+        for r in range(4)
+    )
+
+
+def _spawn_exponents() -> Tuple[int, ...]:
+    """Exponents of the tiles the game spawns, each equally likely (see GameBoard.create_new)."""
+    start = SETTINGS.game.start_number
+    return (start.bit_length() - 1, start.bit_length())
@@ -0,0 +1,92 @@
+import os
+import threading
+from typing import Dict, Tuple
+
+from src.config.settings import SETTINGS
+from src.game.board import Board
+from src.game.codec import pack_board
+from src.game.tablebase import MAX_GRID_LENGTH, Tablebase, encode_tablebase, solve, tablebase_name
+from src.recommendation.base import BaseRecommender
+
+
+class PerfectRecommender(BaseRecommender):
+    """
+    Optimal play on small grids, looked up in a solved tablebase.
+    Provider: heuristic
+    Model: perfect
+
+    Each move maximizes the exact probability of reaching the goal (see
+    `src.game.tablebase.solve`). 2x2 games have about a hundred distinct
+    positions and are solved in memory on first use; 3x3 games need a
+    tablebase built with `python -m src.tools.solve`, which is memory-mapped
+    so a lookup only reads the pages it probes.
+    """
+
+    def __init__(self, directory: str = SETTINGS.recommendation.tablebase_directory):
+        """
+        Args:
+            directory: Directory holding the tablebase files.
+        """
+        self.directory = directory
+        self.__tablebases: Dict[int, Tablebase] = {}
+        self.__lock = threading.Lock()
+
+    def is_available(self, grid_length: int) -> bool:
+        """Whether a tablebase can be loaded or solved for games of this grid size."""
+        if grid_length > MAX_GRID_LENGTH:
+            return False
+        path = os.path.join(self.directory, tablebase_name(grid_length, SETTINGS.game.goal_number))
+        return grid_length == 2 or os.path.exists(path)
+
+    def suggest_move(self, grid: Board, model: str) -> Tuple[str, str]:
+        if any(len(row) != len(grid) for row in grid):
+            raise ValueError("Perfect play needs a square board")
+        tablebase = self.tablebase(len(grid))
+        result = tablebase.lookup(pack_board(grid))
+        if result is None:
+            raise ValueError("Board is not a reachable position of the solved game")
+
+        direction, win_probability = result
+        if direction is None:
+            return "left", "No moves seem to change the board state."
+        if win_probability > 0:
+            return direction.value, (
+                f"Playing perfectly from here, moving {direction.value} reaches "
+                f"{tablebase.goal_number} with probability {win_probability:.1%}."
+            )
+        return direction.value, (
+            f"{tablebase.goal_number} cannot be reached from here; moving {direction.value} "
+            "keeps the game going for the most moves on average."
+        )
+
+    def tablebase(self, grid_length: int) -> Tablebase:
+        """
+        Return the tablebase of a grid size, loading or solving it on first use.
+
+        Raises:
+            ValueError: If the grid is too large or its tablebase has not been built.
+        """
+        with self.__lock:
+            tablebase = self.__tablebases.get(grid_length)
+            if tablebase is not None:
+                return tablebase
+            if grid_length > MAX_GRID_LENGTH:
+                raise ValueError(f"Perfect play is only known on grids up to {MAX_GRID_LENGTH}x{MAX_GRID_LENGTH}")
+
+            game = SETTINGS.game
+            path = os.path.join(self.directory, tablebase_name(grid_length, game.goal_number))
+            if os.path.exists(path):
+                tablebase = Tablebase.open(path)
+                solved_for = (tablebase.grid_length, tablebase.goal_number, tablebase.start_number)
+                if solved_for != (grid_length, game.goal_number, game.start_number):
+                    raise ValueError(f"{path} was solved for another game")
+            elif grid_length == 2:
+                solution = solve(2, game.goal_number, game.start_number, game.min_start_count, game.max_start_count)
+                tablebase = Tablebase(encode_tablebase(solution, 2, game.goal_number, game.start_number))
+            else:
+                raise ValueError(
+                    f"No tablebase for {grid_length}x{grid_length} games to {game.goal_number}, "
+                    f"build it with: python -m src.tools.solve --grid-length {grid_length}"
+                )
+            self.__tablebases[grid_length] = tablebase
+            return tablebase
@@ -0,0 +1,47 @@
+from typing import Dict, List, Tuple
+
+from src.config.settings import SETTINGS
+from src.game.board import Board
+from src.recommendation.base import BaseRecommender
+from src.recommendation.heuristic.expectimax import ExpectimaxRecommender
+from src.recommendation.heuristic.perfect import PerfectRecommender
+from src.recommendation.heuristic.simple import SimpleHeuristicRecommender
+
+
+class HeuristicProvider(BaseRecommender):
+    """
+    Local recommenders that need no external service.
+    Provider: heuristic
+
+    Dispatches each request to the recommender registered under the model name.
+    """
+
+    def __init__(self, recommenders: Dict[str, BaseRecommender]):
+        self.__recommenders = recommenders
+
+    @staticmethod
+    def create() -> "HeuristicProvider":
+        """
+        Create the provider with the built-in heuristic models.
+
+        `perfect` is only registered when a tablebase exists for the configured
+        grid size (2x2 is solved in memory, 3x3 needs a built tablebase).
+        """
+        recommenders: Dict[str, BaseRecommender] = {
+            "simple": SimpleHeuristicRecommender(),
+            "expectimax": ExpectimaxRecommender(),
+        }
+        perfect = PerfectRecommender()
+        if perfect.is_available(SETTINGS.game.grid_length):
+            recommenders["perfect"] = perfect
+        return HeuristicProvider(recommenders)
+
+    @property
+    def models(self) -> List[str]:
+        return list(self.__recommenders)
+
+    def suggest_move(self, grid: Board, model: str) -> Tuple[str, str]:
+        recommender = self.__recommenders.get(model)
+        if recommender is None:
+            raise ValueError(f"Model heuristic/{model} not available")
+        return recommender.suggest_move(grid, model)
@@ -0,0 +1,190 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from typing import List, Optional, Set, Tuple
+
+from src.config.settings import SETTINGS
+from src.game.board import Board
+from src.recommendation.heuristic.expectimax import ExpectimaxRecommender
+from src.recommendation.heuristic.provider import HeuristicProvider
+
+OFFLOADABLE_PROVIDERS = ("heuristic",)
+"""Providers whose recommenders are self-contained and can run in another process."""
+
+
+class OffloadQueueFullException(Exception):
+    """Raised when the process pool already has the maximum number of pending requests."""
+
+
+# State of a pool worker process, set up once by `_initialize_worker`
+_worker_provider: Optional[HeuristicProvider] = None
+
+
+def _initialize_worker() -> None:
+    global _worker_provider  # pylint: disable=global-statement
+    ExpectimaxRecommender.preload()
+    _worker_provider = HeuristicProvider.create()
+
+
+def _warm_up() -> None:
+    """No-op task used to start every worker before the first real request."""
+
+
+def _suggest_move(model: str, grid: Board) -> Tuple[str, str]:
+    return _worker_provider.suggest_move(grid, model)
+
+
+def _suggest_move_timed(model: str, grid: Board) -> Tuple[str, str, float]:
+    """Recommend and report the CPU seconds the worker spent on it."""
+    start = time.process_time()
+    direction, rationale = _worker_provider.suggest_move(grid, model)
+    return direction, rationale, time.process_time() - start
+
+
+class RecommendationPool:
+    """
+    Warm process pool running CPU-bound recommenders off the event loop.
+
+    Workers are spawned (not forked, so they never inherit server threads or
+    sockets) and build the lookup tables once at startup. The number of
+    requests queued or running is bounded; a request over the bound is
+    rejected immediately instead of queueing behind minutes of work.
+    Cancelling the awaiting coroutine (e.g. the client disconnected) drops
+    the request if it has not started yet.
+
+    Speculative requests (see `src.recommendation.speculation`) only start
+    on an idle worker and do not count as pending; a request arriving while
+    every worker is busy cancels those that have not started yet.
+    """
+
+    def __init__(self, workers: int, max_pending: int, models: List[str]):
+        """
+        Args:
+            workers: Number of worker processes; 0 disables the pool.
+            max_pending: Maximum number of requests queued or running.
+            models: "provider/model" names to run in the pool.
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self.__models = {
+            tuple(name.split("/", 1)) for name in models
+            if name.split("/", 1)[0] in OFFLOADABLE_PROVIDERS
+        }
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        self.__lock = threading.Lock()
+        self.__pending = 0
+        self.__speculative: Set[Future] = set()
+
+    @property
+    def pending(self) -> int:
+        """Number of requests currently queued or running in the pool."""
+        return self.__pending
+
+    @property
+    def speculating(self) -> int:
+        """Number of speculative requests currently queued or running in the pool."""
+        return len(self.__speculative)
+
+    def handles(self, provider: str, model: str) -> bool:
+        """Whether requests for this recommender are sent to the pool."""
+        return self.workers > 0 and (provider, model) in self.__models
+
+    def start(self) -> None:
+        """Spawn the worker processes and let them build their tables."""
+        with self.__lock:
+            if self.__executor is not None or self.workers <= 0 or not self.__models:
+                return
+            self.__executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_worker,
+            )
+            for _ in range(self.workers):
+                self.__executor.submit(_warm_up)
+
+    def shutdown(self) -> None:
+        """Stop the workers, dropping queued requests."""
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def suggest_move(self, provider: str, model: str, grid: Board) -> Tuple[str, str]:
+        """
+        Run a recommender in the pool.
+
+        Raises:
+            OffloadQueueFullException: If `max_pending` requests are already in the pool.
+        """
+        if not self.handles(provider, model):
+            raise ValueError(f"Model {provider}/{model} is not offloaded")
+        self.start()
+        future = self.__submit(model, grid)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def speculate(self, provider: str, model: str, grid: Board) -> Optional[Future]:
+        """
+        Run a recommender in the pool if a worker is idle.
+
+        Returns:
+            Optional[Future]: Resolves to the move, rationale and CPU seconds
+                spent, or None if the pool is not running or has no idle worker.
+        """
+        if not self.handles(provider, model):
+            return None
+        with self.__lock:
+            if self.__executor is None or self.__pending + len(self.__speculative) >= self.workers:
+                return None
+            try:
+                future = self.__executor.submit(_suggest_move_timed, model, grid)
+            except (BrokenExecutor, RuntimeError):
+                # Speculation never fails a request; real requests report the broken pool
+                return None
+            self.__speculative.add(future)
+        future.add_done_callback(self.__release_speculative)
+        return future
+
+    def __submit(self, model: str, grid: Board) -> Future:
+        self.__yield_speculation()
+        with self.__lock:
+            if self.__pending >= self.max_pending:
+                raise OffloadQueueFullException(
+                    f"Recommendation pool is full ({self.max_pending} pending)"
+                )
+            if self.__executor is None:
+                raise RuntimeError("Recommendation pool is shut down")
+            future = self.__executor.submit(_suggest_move, model, grid)
+            self.__pending += 1
+        future.add_done_callback(self.__release)
+        return future
+
+    def __yield_speculation(self) -> None:
+        """Cancel the speculative requests that have not started, if every worker is busy."""
+        with self.__lock:
+            if self.__pending + len(self.__speculative) < self.workers:
+                return
+            speculative = list(self.__speculative)
+        # Outside the lock: cancelling runs the done callbacks
+        for future in speculative:
+            future.cancel()
+
+    def __release(self, _: Future) -> None:
+        with self.__lock:
+            self.__pending -= 1
+
+    def __release_speculative(self, future: Future) -> None:
+        with self.__lock:
+            self.__speculative.discard(future)
+
+
+offload_pool = RecommendationPool(
+    workers=SETTINGS.recommendation.offload.workers,
+    max_pending=SETTINGS.recommendation.offload.max_pending,
+    models=SETTINGS.recommendation.offload.models,
+)
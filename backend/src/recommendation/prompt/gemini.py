@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Optional
 
 from google import genai
+from google.genai import types
 
-from src.recommendation.prompt.prompt import PromptBasedRecommender
+from src.recommendation.prompt.prompt import PromptBasedRecommender, QueryResult
 
 
 class GeminiRecommenderException(Exception):
@@ -15,18 +16,26 @@ class GeminiRecommender(PromptBasedRecommender):
     Reuses a single client instance for all models.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, timeout: Optional[float] = None):
         """
         Initialize the Gemini recommender with a reusable client.
 
         Args:
             api_key: Google Gemini API key.
+            timeout: Optional request timeout in seconds for every client call.
         """
         if not api_key:
             raise ValueError("Gemini API key must be provided")
-        self.__client = genai.Client(api_key=api_key)
+        super().__init__()
+        if timeout is None:
+            self.__client = genai.Client(api_key=api_key)
+        else:
+            self.__client = genai.Client(
+                api_key=api_key,
+                http_options=types.HttpOptions(timeout=int(timeout * 1000)),
+            )
 
-    def query_model(self, prompt: str, model: str) -> str:
+    def query_model(self, prompt: str, model: str) -> QueryResult:
         """Query the specified model."""
         try:
             response = self.__client.models.generate_content(
@@ -36,14 +45,16 @@ class GeminiRecommender(PromptBasedRecommender):
         except Exception as e:
             raise GeminiRecommenderException(f"Query error: {e}")
 
-        return response.text.strip()
+        usage = response.usage_metadata
+        return QueryResult(
+            text=response.text.strip(),
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            response_tokens=getattr(usage, "candidates_token_count", None),
+        )
 
     def list_available_models_from_client(self) -> List[str]:
-        """List models using the existing client instance."""
-        try:
-            return [m.name.removeprefix("models/") for m in self.__client.models.list()]
-        except Exception:
-            return []
+        """List models using the existing client instance; raises if the provider cannot be reached."""
+        return [m.name.removeprefix("models/") for m in self.__client.models.list()]
 
     @staticmethod
     def list_available_models(api_key: str) -> List[str]:
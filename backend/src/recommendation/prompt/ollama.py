@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Optional
 
 import ollama
 
-from src.recommendation.prompt.prompt import PromptBasedRecommender
+from src.recommendation.prompt.prompt import PromptBasedRecommender, QueryResult
+from src.recommendation.prompt.scheduler import BatchScheduler
 
 
 class OllamaRecommenderException(Exception):
@@ -12,20 +13,50 @@ class OllamaRecommenderException(Exception):
 class OllamaRecommender(PromptBasedRecommender):
     """
     AI-powered recommender using Ollama.
-    Reuses a single client instance for all models.
+    Reuses a single client instance for all models, and funnels concurrent
+    queries through a micro-batching scheduler.
     """
 
-    def __init__(self, host: str):
+    def __init__(
+        self,
+        host: str,
+        timeout: Optional[float] = None,
+        num_parallel: int = 1,
+        batch_window: float = 0.0,
+    ):
         """
         Initialize the Ollama recommender with a reusable client.
 
         Args:
             host: Ollama host URL (e.g., http://localhost:11434).
+            timeout: Optional request timeout in seconds for every client call.
+            num_parallel: Maximum concurrent chat calls, matching the server's
+                ``OLLAMA_NUM_PARALLEL``.
+            batch_window: Seconds to gather concurrent queries for the same
+                model before sending them.
         """
-        self.__client = ollama.Client(host=host)
+        super().__init__()
+        if timeout is None:
+            self.__client = ollama.Client(host=host)
+        else:
+            self.__client = ollama.Client(host=host, timeout=timeout)
+        self.__scheduler: BatchScheduler[QueryResult] = BatchScheduler(
+            self.__chat,
+            max_parallel=num_parallel,
+            window=batch_window,
+        )
 
-    def query_model(self, prompt: str, model: str) -> str:
-        """Query the specified model."""
+    @property
+    def scheduler(self) -> BatchScheduler[QueryResult]:
+        """Scheduler batching the queries of this recommender."""
+        return self.__scheduler
+
+    def query_model(self, prompt: str, model: str) -> QueryResult:
+        """Query the specified model through the batching scheduler."""
+        return self.__scheduler.query(model, prompt)
+
+    def __chat(self, model: str, prompt: str) -> QueryResult:
+        """Send a single chat call to the server."""
         try:
             response = self.__client.chat(
                 model=model,
@@ -41,10 +72,20 @@ class OllamaRecommender(PromptBasedRecommender):
             raise OllamaRecommenderException(f"Query error: {e}")
 
         try:
-            return response['message']['content'].strip()
+            text = response['message']['content'].strip()
         except KeyError as e:
             raise OllamaRecommenderException(f"Response error: {e}")
 
+        return QueryResult(
+            text=text,
+            prompt_tokens=response.get('prompt_eval_count'),
+            response_tokens=response.get('eval_count'),
+        )
+
+    def list_available_models_from_client(self) -> List[str]:
+        """List models using the existing client instance; raises if the provider cannot be reached."""
+        return [model.model for model in self.__client.list().get('models', [])]
+
     @staticmethod
     def list_available_models(host: str) -> List[str]:
         """List available Ollama models."""
@@ -1,15 +1,40 @@
 import json
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from copy import deepcopy
+from typing import Dict, List, Optional, Tuple
 
+from src.config.settings import SETTINGS
+from src.game.board import GameBoard
+from src.game.direction import Direction
 from src.recommendation.base import Board, BaseRecommender
+from src.recommendation.prompt.usage import UsageTracker
+
+
+class QueryResult:
+    """Text returned by a model along with the token counts reported for the query."""
+    def __init__(
+        self,
+        text: str,
+        prompt_tokens: Optional[int] = None,
+        response_tokens: Optional[int] = None,
+    ):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.response_tokens = response_tokens
 
 
 class PromptBasedRecommender(BaseRecommender, ABC):
     """
     Prompt based recommender abstract class.
+
+    Legal moves are computed locally and sent along with their resulting
+    boards, so the model only has to rank valid options.
     """
 
+    def __init__(self):
+        self.usage = UsageTracker()
+
     def suggest_move(self, grid: Board, model: str) -> Tuple[str, str]:
         """
         Suggest the best move using its implementation's model.
@@ -21,25 +46,92 @@ class PromptBasedRecommender(BaseRecommender, ABC):
         Returns:
             Tuple of (move, rationale) where move is one of: up, down, left, right
         """
-        prompt = f"""
-        Analyze this 2048 grid: {grid}
-        Suggest the best next move (up, down, left, right).
-        Provide a one-sentence rationale for the move.
-        Output ONLY a JSON object with keys "move" and "rationale".
-        Example: {{"move": "left", "rationale": "Consolidates tiles on the left edge."}}
-        """
+        candidates = self._legal_moves(grid)
+        if not candidates:
+            return "left", "No moves seem to change the board state."
+        if len(candidates) == 1:
+            move = next(iter(candidates))
+            return move, f"Moving {move} is the only move that changes the board."
 
-        response = self.query_model(prompt, model)
-        data = self._parse_response_text(response)
+        prompt = self._build_prompt(grid, candidates)
 
-        move = data.get("move", "up").lower()
+        start = time.perf_counter()
+        try:
+            result = self.query_model(prompt, model)
+        except Exception:
+            self.usage.record_error(model)
+            raise
+        self.usage.record(
+            model,
+            time.perf_counter() - start,
+            prompt_tokens=result.prompt_tokens,
+            response_tokens=result.response_tokens,
+        )
+
+        data = self._parse_response_text(result.text)
+        move = str(data.get("move", "")).lower()
         rationale = data.get("rationale", "")
-        if move not in ["up", "down", "left", "right"]:
-            move = "up"
+        if move not in candidates:
+            move = next(iter(candidates))
         return move, rationale
 
+    @staticmethod
+    def _legal_moves(grid: Board) -> Dict[str, Board]:
+        """
+        Compute every move that changes the board.
+
+        Returns:
+            Mapping of move name to the resulting board before a tile spawns,
+            in a stable up/down/left/right order.
+        """
+        game = GameBoard(board=grid, goal=SETTINGS.game.goal_number, prop_numbers=[])
+        if game.status().is_terminal:
+            return {}
+
+        candidates: Dict[str, Board] = {}
+        for direction in Direction:
+            simulation = deepcopy(game)
+            direction.apply_to_board(simulation)
+            result = simulation.get_board()
+            if result != grid:
+                candidates[direction.value] = result
+        return candidates
+
+    @staticmethod
+    def _encode_grid(grid: Board) -> str:
+        """Encode a grid as one line per row with '.' for empty cells."""
+        return "\n".join(
+            " ".join(str(cell) if cell else "." for cell in row)
+            for row in grid
+        )
+
+    def _build_prompt(self, grid: Board, candidates: Dict[str, Board]) -> str:
+        """
+        Build a compact prompt listing the board and its legal successors.
+
+        Args:
+            grid: Current game board state.
+            candidates: Legal moves mapped to their resulting boards.
+
+        Returns:
+            Prompt text.
+        """
+        options = "\n".join(
+            f"{move}:\n{self._encode_grid(result)}"
+            for move, result in candidates.items()
+        )
+        choices = "|".join(candidates)
+        return (
+            "2048 board, '.' is empty:\n"
+            f"{self._encode_grid(grid)}\n"
+            "Legal moves and their boards before the new tile spawns:\n"
+            f"{options}\n"
+            "Pick the best legal move. Reply with JSON only: "
+            f'{{"move":"{choices}","rationale":"<one sentence>"}}'
+        )
+
     @abstractmethod
-    def query_model(self, prompt: str, model: str) -> str:
+    def query_model(self, prompt: str, model: str) -> QueryResult:
         """
         Query implementation model for response.
 
@@ -48,7 +140,7 @@ class PromptBasedRecommender(BaseRecommender, ABC):
             model: Model name to use.
 
         Returns:
-            Stringed response.
+            Response text and reported token counts.
         """
 
 
@@ -74,8 +166,16 @@ class PromptBasedRecommender(BaseRecommender, ABC):
         except (json.JSONDecodeError, KeyError, AttributeError):
             return {}
 
+    @abstractmethod
+    def list_available_models_from_client(self) -> List[str]:
+        """
+        List available models for prompting using the instance's own client.
+
+        Raises:
+            Exception: Whatever the provider's client raises when listing fails.
+        """
+
     @staticmethod
     @abstractmethod
     def list_available_models(host: str) -> List[str]:
         """List available models for prompting."""
-
@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import copy
+from typing import Callable, Deque, Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PendingQuery(Generic[T]):
+    """A query waiting in the scheduler together with the future of its caller."""
+    def __init__(self, model: str, prompt: str):
+        self.model = model
+        self.prompt = prompt
+        self.future: Future[T] = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class QueueStats:
+    """Queue depth and wait time of a single model's queue."""
+    def __init__(self):
+        self.queue_depth = 0
+        self.batches = 0
+        self.dispatched = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        """Mean time in seconds a dispatched query spent queued."""
+        return self.total_wait / self.dispatched if self.dispatched else 0.0
+
+
+class BatchScheduler(Generic[T]):
+    """
+    Micro-batching scheduler for queries against a model server.
+
+    Concurrent queries for the same model are gathered for a short window
+    and then sent together with at most ``max_parallel`` in flight, which
+    should match the server's own parallelism (``OLLAMA_NUM_PARALLEL``).
+    Only one model is served per batch, and free slots go to the model
+    already in flight while it has queued queries, so the server is not
+    forced to swap models between interleaved requests. So that a busy model
+    cannot starve the others, it gets at most ``max_consecutive_batches`` in
+    a row while an older query of another model waits. Slots are refilled
+    as soon as any query finishes, so a slow query only holds its own slot.
+    Each response is routed back to the future of the caller that submitted it.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, str], T],
+        max_parallel: int = 1,
+        window: float = 0.0,
+        max_consecutive_batches: int = 4,
+    ):
+        """
+        Create a scheduler.
+
+        Args:
+            send: Callable performing a single query given (model, prompt).
+            max_parallel: Maximum number of queries in flight at once.
+            window: Seconds to wait after the oldest pending query for more
+                queries of the same model to join its batch.
+            max_consecutive_batches: Batches in a row the model in flight may
+                take while another model's query has waited longer.
+        """
+        self.__send = send
+        self.__max_parallel = max(1, max_parallel)
+        self.__window = max(0.0, window)
+        self.__queues: Dict[str, Deque[PendingQuery[T]]] = {}
+        self.__stats: Dict[str, QueueStats] = {}
+        self.__in_flight: Dict[str, int] = {}
+        self.__max_consecutive_batches = max(0, max_consecutive_batches)
+        self.__passed_over = 0
+        self.__condition = threading.Condition()
+        self.__executor = ThreadPoolExecutor(
+            max_workers=self.__max_parallel,
+            thread_name_prefix="batch-scheduler",
+        )
+        self.__dispatcher: Optional[threading.Thread] = None
+
+    def submit(self, model: str, prompt: str) -> Future:
+        """
+        Queue a query and return the future that will hold its response.
+
+        Args:
+            model: Model to query.
+            prompt: Prompt to send.
+
+        Returns:
+            Future resolved with the response of ``send``.
+        """
+        query: PendingQuery[T] = PendingQuery(model, prompt)
+        with self.__condition:
+            self.__ensure_dispatcher()
+            self.__queues.setdefault(model, deque()).append(query)
+            self.__stats.setdefault(model, QueueStats()).queue_depth += 1
+            self.__condition.notify()
+        return query.future
+
+    def query(self, model: str, prompt: str, timeout: Optional[float] = None) -> T:
+        """Queue a query and block until its response is available."""
+        return self.submit(model, prompt).result(timeout)
+
+    def stats(self) -> Dict[str, QueueStats]:
+        """Return a copy of the queue statistics of every model seen so far."""
+        with self.__condition:
+            return {model: copy(stats) for model, stats in self.__stats.items()}
+
+    def __ensure_dispatcher(self) -> None:
+        if self.__dispatcher is None:
+            self.__dispatcher = threading.Thread(
+                target=self.__run,
+                name="batch-scheduler-dispatcher",
+                daemon=True,
+            )
+            self.__dispatcher.start()
+
+    def __run(self) -> None:
+        while True:
+            for query in self.__next_batch():
+                self.__executor.submit(self.__execute, query)
+
+    def __free_slots(self) -> int:
+        return self.__max_parallel - sum(self.__in_flight.values())
+
+    def __next_batch(self) -> List[PendingQuery[T]]:
+        """Block until a batch is ready and a slot is free, then pop it from its model's queue."""
+        with self.__condition:
+            while not any(self.__queues.values()) or self.__free_slots() <= 0:
+                self.__condition.wait()
+
+            # Keep serving a model already in flight for a bounded number of batches,
+            # else the one whose head query has waited the longest
+            waiting = [model for model, queue in self.__queues.items() if queue]
+            running = [model for model in waiting if self.__in_flight.get(model)]
+            oldest = min(waiting, key=lambda m: self.__queues[m][0].enqueued_at)
+            if running and running[0] != oldest and self.__passed_over < self.__max_consecutive_batches:
+                model = running[0]
+                self.__passed_over += 1
+            else:
+                model = oldest
+                self.__passed_over = 0
+            queue = self.__queues[model]
+            deadline = queue[0].enqueued_at + self.__window
+            while len(queue) < self.__free_slots():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.__condition.wait(remaining)
+
+            now = time.monotonic()
+            stats = self.__stats[model]
+            batch = [queue.popleft() for _ in range(min(len(queue), self.__free_slots()))]
+            self.__in_flight[model] = self.__in_flight.get(model, 0) + len(batch)
+            stats.queue_depth -= len(batch)
+            stats.batches += 1
+            for query in batch:
+                waited = now - query.enqueued_at
+                stats.dispatched += 1
+                stats.total_wait += waited
+                stats.max_wait = max(stats.max_wait, waited)
+            return batch
+
+    def __execute(self, query: PendingQuery[T]) -> None:
+        try:
+            if not query.future.set_running_or_notify_cancel():
+                return
+            try:
+                query.future.set_result(self.__send(query.model, query.prompt))
+            except Exception as e:
+                query.future.set_exception(e)
+        finally:
+            with self.__condition:
+                self.__in_flight[query.model] -= 1
+                self.__condition.notify()
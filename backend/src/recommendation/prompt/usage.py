@@ -0,0 +1,63 @@
+import threading
+from copy import copy
+from typing import Dict, Optional
+
+
+class ModelUsage:
+    """Accumulated prompt usage and latency of a single model."""
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """Mean latency in seconds over all successful calls."""
+        return self.total_latency / self.calls if self.calls else 0.0
+
+
+class UsageTracker:
+    """
+    Thread-safe per-model record of token counts and query latency.
+    """
+
+    def __init__(self):
+        self.__usage: Dict[str, ModelUsage] = {}
+        self.__lock = threading.Lock()
+
+    def record(
+        self,
+        model: str,
+        latency: float,
+        prompt_tokens: Optional[int] = None,
+        response_tokens: Optional[int] = None,
+    ) -> None:
+        """
+        Record a successful query.
+
+        Args:
+            model: Model name that served the query.
+            latency: Wall time of the query in seconds.
+            prompt_tokens: Prompt token count reported by the provider, if any.
+            response_tokens: Response token count reported by the provider, if any.
+        """
+        with self.__lock:
+            usage = self.__usage.setdefault(model, ModelUsage())
+            usage.calls += 1
+            usage.prompt_tokens += prompt_tokens or 0
+            usage.response_tokens += response_tokens or 0
+            usage.total_latency += latency
+            usage.last_latency = latency
+
+    def record_error(self, model: str) -> None:
+        """Record a failed query for the given model."""
+        with self.__lock:
+            self.__usage.setdefault(model, ModelUsage()).errors += 1
+
+    def snapshot(self) -> Dict[str, ModelUsage]:
+        """Return a copy of the usage of every model queried so far."""
+        with self.__lock:
+            return {model: copy(usage) for model, usage in self.__usage.items()}
@@ -1,12 +1,31 @@
-from typing import Dict, List, Tuple, Type, cast
+import importlib
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Type, cast
 
 from src.config.settings import SETTINGS
 from src.recommendation.base import BaseRecommender
-from src.recommendation.heuristic.simple import SimpleHeuristicRecommender
-from src.recommendation.prompt.gemini import GeminiRecommender
-from src.recommendation.prompt.ollama import OllamaRecommender
+from src.recommendation.heuristic.provider import HeuristicProvider
 from src.recommendation.prompt.prompt import PromptBasedRecommender
 
+REMOTE_PROVIDERS: Dict[str, Tuple[str, str]] = {
+    "gemini": ("src.recommendation.prompt.gemini", "GeminiRecommender"),
+    "ollama": ("src.recommendation.prompt.ollama", "OllamaRecommender"),
+}
+"""Module and class of each remote provider's recommender."""
+
+
+def load_provider_class(name: str) -> Type[PromptBasedRecommender]:
+    """
+    Import the recommender class of a remote provider.
+
+    Provider SDKs (`google.genai`, `ollama`) take most of the backend's import
+    time, so they are only imported once their provider is configured and
+    discovered for the first time, on the discovery thread.
+    """
+    module, attribute = REMOTE_PROVIDERS[name]
+    return getattr(importlib.import_module(module), attribute)
+
 
 class ModelInfo:
     """Information about a single model."""
@@ -20,6 +39,11 @@ class ModelRegistry:
     """
     Singleton registry that discovers and caches available recommendation models.
     Stores one recommender instance per provider to enable client reuse.
+
+    Heuristic models are available as soon as the registry is created. Remote
+    provider models are discovered on a background thread and re-discovered
+    once the last discovery is older than the configured TTL, so a slow or
+    unreachable provider never blocks startup or requests.
     """
     _instance = None
     _initialized = False
@@ -33,74 +57,162 @@ class ModelRegistry:
         if not ModelRegistry._initialized:
             self._models: Dict[Tuple[str, str], str] = {}
             self._providers: Dict[str, BaseRecommender] = {}
-            self._discover_models()
+            self._revision = 0
+            self._refreshed_at: Optional[float] = None
+            self._discovery_seconds: Optional[float] = None
+            self._refresh_lock = threading.Lock()
+            self._refresh_thread: Optional[threading.Thread] = None
+            self._register_heuristic()
             ModelRegistry._initialized = True
 
-    def _discover_models(self) -> None:
-        """Discover all available models and cache their provider instances."""
-        self._register_heuristic()
-        self._register_provider('gemini', GeminiRecommender,
+    @property
+    def revision(self) -> int:
+        """Counter that is bumped every time the set of available models changes."""
+        return self._revision
+
+    @property
+    def discovery_seconds(self) -> Optional[float]:
+        """Duration of the last completed discovery (imports included), None before the first."""
+        return self._discovery_seconds
+
+    def refresh(self) -> None:
+        """Synchronously re-discover the models of every remote provider."""
+        start = time.perf_counter()
+        self._register_provider('gemini',
                                SETTINGS.recommendation.gemini.api_key,
-                               SETTINGS.recommendation.gemini.allowed_models)
-        self._register_provider('ollama', OllamaRecommender,
+                               SETTINGS.recommendation.gemini.allowed_models,
+                               SETTINGS.recommendation.gemini.timeout_seconds)
+        self._register_provider('ollama',
                                SETTINGS.recommendation.ollama.host,
-                               SETTINGS.recommendation.ollama.allowed_models)
+                               SETTINGS.recommendation.ollama.allowed_models,
+                               SETTINGS.recommendation.ollama.timeout_seconds)
+        self._refreshed_at = time.monotonic()
+        self._discovery_seconds = time.perf_counter() - start
+
+    def refresh_in_background(self) -> bool:
+        """
+        Start a discovery on a daemon thread unless one is already running.
+
+        Returns:
+            True if a new discovery was started, False otherwise.
+        """
+        with self._refresh_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return False
+            self._refresh_thread = threading.Thread(
+                target=self.refresh,
+                name="model-discovery",
+                daemon=True,
+            )
+            self._refresh_thread.start()
+            return True
+
+    def wait_for_discovery(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the running background discovery (if any) finishes.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            True if no discovery is running anymore, False on timeout.
+        """
+        thread = self._refresh_thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def ensure_fresh(self) -> None:
+        """Trigger a background discovery if the provider model lists are stale."""
+        refreshed_at = self._refreshed_at
+        ttl = SETTINGS.recommendation.discovery_ttl_seconds
+        if refreshed_at is None or time.monotonic() - refreshed_at >= ttl:
+            self.refresh_in_background()
 
     def _register_heuristic(self) -> None:
-        """Register heuristic recommender."""
-        self._providers['heuristic'] = SimpleHeuristicRecommender()
-        self._models[('heuristic', 'simple')] = 'heuristic'
+        """Register the local heuristic recommenders."""
+        provider = HeuristicProvider.create()
+        self._providers['heuristic'] = provider
+        for model in provider.models:
+            self._models[('heuristic', model)] = 'heuristic'
 
     def _register_provider(
         self,
         name: str,
-        recommender_class: Type[PromptBasedRecommender],
         config_value: str,
         allowed_models: List[str],
+        timeout: float,
     ) -> None:
         """
         Generic provider registration.
         
         Args:
             name: Provider name ('gemini' or 'ollama')
-            recommender_class: Recommender class to instantiate
             config_value: API key or host URL
             allowed_models: List of allowed model names
+            timeout: Request timeout in seconds for the provider client
         """
         # Skip if no config or no allowed models
         if not config_value or not allowed_models:
+            self._set_provider_models(name, [])
             return
 
-        # Get available models
-        available = recommender_class.list_available_models(config_value)
-        if not available:
+        # Create the provider instance once and reuse its client on every refresh
+        provider = self._providers.get(name)
+        if provider is None:
+            recommender_class = load_provider_class(name)
+            if name == 'gemini':
+                provider = recommender_class(api_key=config_value, timeout=timeout)
+            elif name == 'ollama':
+                provider = recommender_class(
+                    host=config_value,
+                    timeout=timeout,
+                    num_parallel=SETTINGS.recommendation.ollama.num_parallel,
+                    batch_window=SETTINGS.recommendation.ollama.batch_window_seconds,
+                )
+            self._providers[name] = provider
+
+        # Get available models, filtered by allowlist. A failed listing keeps the
+        # last known models, so a transient provider error does not hide them
+        try:
+            available = cast(PromptBasedRecommender, provider).list_available_models_from_client()
+        except Exception:  # pylint: disable=broad-exception-caught
             return
-
-        # Filter by allowlist
         models_to_register = [m for m in available if m in allowed_models]
-        if not models_to_register:
+        self._set_provider_models(name, models_to_register)
+
+    def _set_provider_models(self, name: str, models: List[str]) -> None:
+        """
+        Replace the registered models of a provider.
+
+        The model mapping is swapped as a whole so readers iterating over the
+        previous mapping are never affected by a concurrent refresh.
+        """
+        current = [key for key in self._models if key[0] == name]
+        updated = [(name, model) for model in models]
+        if current == updated:
             return
 
-        # Create provider instance
-        if name == 'gemini':
-            recommender_class = cast(Type[GeminiRecommender], recommender_class)
-            self._providers[name] = recommender_class(api_key=config_value)
-        elif name == 'ollama':
-            recommender_class = cast(Type[OllamaRecommender], recommender_class)
-            self._providers[name] = recommender_class(host=config_value)
+        registered = {key: value for key, value in self._models.items() if key[0] != name}
+        registered.update((key, name) for key in updated)
+        self._models = registered
+        self._revision += 1
 
-        # Register models
-        for model in models_to_register:
-            self._models[(name, model)] = name
+    def has_model(self, provider: str, model: str) -> bool:
+        """Whether the model is currently registered, without triggering a refresh."""
+        return (provider, model) in self._models
 
     def get_recommender(self, provider: str, model: str) -> BaseRecommender:
         """Get the recommender instance for the specified provider."""
+        self.ensure_fresh()
         if (provider, model) not in self._models:
             raise ValueError(f"Model {provider}/{model} not available")
         return self._providers[provider]
 
     def list_models(self) -> List[ModelInfo]:
         """List all available models."""
+        self.ensure_fresh()
         return [
             ModelInfo(
                 provider=provider,
@@ -1,10 +1,18 @@
+import time
 from copy import deepcopy
+from typing import Tuple
+
+from starlette.concurrency import run_in_threadpool
 
 from src.config.settings import SETTINGS
 from src.game.board import GameBoard, Board
 from src.game.direction import Direction
+from src.metrics.metrics import cache_lookups, recommendation_duration, recommendation_fallbacks
+from src.recommendation.breaker import CircuitOpenException, breakers
 from src.recommendation.heuristic.simple import SimpleHeuristicRecommender
+from src.recommendation.offload import offload_pool
 from src.recommendation.registry import registry
+from src.recommendation.speculation import cache_key, recommendation_cache
 
 
 class RecommendationResponse:
@@ -22,24 +30,91 @@ class RecommendationService:
     def get_recommendation(grid: Board, provider: str, model: str) -> RecommendationResponse:
         """
         Get a move recommendation and simulate the result.
-        Falls back to heuristic if the selected model fails.
+        Falls back to heuristic if the selected model fails, or straight away
+        if its circuit breaker is open.
         """
         try:
             recommender = registry.get_recommender(provider, model)
-            direction_str, rationale = recommender.suggest_move(grid, model)
+            breaker = breakers.get(provider, model)
+            if not breaker.allow_request():
+                raise CircuitOpenException("circuit open")
+
+            start = time.perf_counter()
+            try:
+                direction_str, rationale = recommender.suggest_move(grid, model)
+            except Exception:
+                breaker.record_failure(time.perf_counter() - start)
+                raise
+            finally:
+                recommendation_duration.observe(time.perf_counter() - start, provider, model)
+            breaker.record_success(time.perf_counter() - start)
         except Exception as e:
-            # Fallback to heuristic
-            recommender = SimpleHeuristicRecommender()
-            direction_str, rationale = recommender.suggest_move(grid, "simple")
-
-            # Prepend error info
-            error_msg = str(e)[:100]
-            rationale = (
-                f"[Fallback to Heuristic - {provider}/{model} failed: {error_msg}...] "
-                f"{rationale}"
+            direction_str, rationale = RecommendationService._fallback(grid, provider, model, e)
+
+        return RecommendationService._respond(grid, direction_str, rationale)
+
+    @staticmethod
+    async def get_recommendation_async(grid: Board, provider: str, model: str) -> RecommendationResponse:
+        """
+        Get a move recommendation without blocking the event loop.
+
+        CPU-bound recommenders configured for offloading run in the process
+        pool, answered from the recommendation cache when speculation is
+        enabled; everything else runs `get_recommendation` in the threadpool.
+        Cancelling the call drops a pool request that has not started yet.
+        """
+        if not offload_pool.handles(provider, model):
+            return await run_in_threadpool(
+                RecommendationService.get_recommendation,
+                grid=grid,
+                provider=provider,
+                model=model,
             )
 
-        # Simulate the move
+        key = cache_key(provider, model, grid)
+        if recommendation_cache is not None:
+            cached = recommendation_cache.get(key)
+            cache_lookups.inc("recommendation", "miss" if cached is None else "hit")
+            if cached is not None:
+                return RecommendationService._respond(grid, *cached)
+
+        try:
+            registry.get_recommender(provider, model)
+            start = time.perf_counter()
+            try:
+                direction_str, rationale = await offload_pool.suggest_move(provider, model, grid)
+            finally:
+                recommendation_duration.observe(time.perf_counter() - start, provider, model)
+            if recommendation_cache is not None:
+                recommendation_cache.put(key, (direction_str, rationale))
+        except Exception as e:
+            direction_str, rationale = RecommendationService._fallback(grid, provider, model, e)
+
+        return RecommendationService._respond(grid, direction_str, rationale)
+
+    @staticmethod
+    def _fallback(grid: Board, provider: str, model: str, error: Exception) -> Tuple[str, str]:
+        """Recommend with the simple heuristic, prefixing why the selected model was skipped."""
+        if registry.has_model(provider, model):
+            recommendation_fallbacks.inc(provider, model, type(error).__name__)
+        else:
+            # Keep label values bounded when clients ask for arbitrary models
+            recommendation_fallbacks.inc("unknown", "unknown", type(error).__name__)
+
+        recommender = SimpleHeuristicRecommender()
+        direction_str, rationale = recommender.suggest_move(grid, "simple")
+
+        # Prepend error info
+        error_msg = str(error)[:100]
+        rationale = (
+            f"[Fallback to Heuristic - {provider}/{model} failed: {error_msg}...] "
+            f"{rationale}"
+        )
+        return direction_str, rationale
+
+    @staticmethod
+    def _respond(grid: Board, direction_str: str, rationale: str) -> RecommendationResponse:
+        """Simulate the recommended move and build the response."""
         direction = Direction(direction_str.lower())
         predicted_grid = RecommendationService._simulate_move(grid, direction)
 
@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Optional, Tuple
+
+from src.config.settings import SETTINGS
+from src.game.board import Board
+from src.metrics.metrics import speculations
+from src.recommendation.offload import RecommendationPool, offload_pool
+
+CacheKey = Tuple[str, str, Tuple[Tuple[Optional[int], ...], ...]]
+
+
+def cache_key(provider: str, model: str, grid: Board) -> CacheKey:
+    return provider, model, tuple(tuple(row) for row in grid)
+
+
+class RecommendationCache:
+    """
+    Least recently used recommendations of the offloaded recommenders.
+
+    Offloaded recommenders are deterministic heuristics, so a cached move and
+    rationale stay valid for as long as they are kept.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.__entries: "OrderedDict[CacheKey, Tuple[str, str]]" = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self.__entries
+
+    def get(self, key: CacheKey) -> Optional[Tuple[str, str]]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+            return entry
+
+    def put(self, key: CacheKey, suggestion: Tuple[str, str]) -> None:
+        with self.__lock:
+            self.__entries[key] = suggestion
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+
+class Speculator:
+    """
+    Recommends ahead of time for the board a player will ask about next.
+
+    Speculation only runs on idle pool workers and gives way to real
+    requests (see `RecommendationPool.speculate`). Its CPU use is bounded by
+    a token bucket refilled at `cpu_budget` worker-seconds per second for
+    each worker: every finished speculation spends the CPU time it took, and
+    none starts while the bucket is empty.
+    """
+
+    def __init__(
+        self,
+        pool: RecommendationPool,
+        cache: RecommendationCache,
+        cpu_budget: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            pool: Pool the speculative recommendations run in.
+            cache: Cache the results are stored in.
+            cpu_budget: Share of the pool's worker CPU time speculation may use.
+            clock: Monotonic clock in seconds, injectable for tests.
+        """
+        self.pool = pool
+        self.cache = cache
+        self.cpu_budget = cpu_budget
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__tokens = self.capacity
+        self.__refilled = clock()
+
+    def speculate(self, provider: str, model: str, grid: Board) -> Optional[Future]:
+        """
+        Start recommending for a board, unless it is cached, the pool is busy
+        or the CPU budget is spent.
+
+        Returns:
+            Optional[Future]: The speculative request, or None if none was started.
+        """
+        key = cache_key(provider, model, grid)
+        if not self.pool.handles(provider, model) or key in self.cache:
+            return None
+        if not self.__has_budget():
+            speculations.inc("skipped_budget")
+            return None
+        future = self.pool.speculate(provider, model, grid)
+        if future is None:
+            speculations.inc("skipped_busy")
+            return None
+        speculations.inc("started")
+        future.add_done_callback(lambda done: self.__complete(key, done))
+        return future
+
+    @property
+    def capacity(self) -> float:
+        """CPU seconds the bucket holds when full: one second of the budget."""
+        return self.cpu_budget * max(self.pool.workers, 1)
+
+    def __has_budget(self) -> bool:
+        with self.__lock:
+            now = self.__clock()
+            self.__tokens = min(self.capacity, self.__tokens + (now - self.__refilled) * self.capacity)
+            self.__refilled = now
+            return self.__tokens > 0
+
+    def __complete(self, key: CacheKey, future: Future) -> None:
+        if future.cancelled():
+            speculations.inc("cancelled")
+            return
+        if future.exception() is not None:
+            return
+        direction, rationale, cpu_seconds = future.result()
+        with self.__lock:
+            self.__tokens -= cpu_seconds
+        self.cache.put(key, (direction, rationale))
+        speculations.inc("cached")
+
+
+recommendation_cache: Optional[RecommendationCache] = (
+    RecommendationCache(SETTINGS.recommendation.speculation.cache_size)
+    if SETTINGS.recommendation.speculation.enabled else None
+)
+speculator: Optional[Speculator] = (
+    Speculator(offload_pool, recommendation_cache, SETTINGS.recommendation.speculation.cpu_budget)
+    if recommendation_cache is not None else None
+)
+
+
+def speculate(recommender: str, grid: Board) -> None:
+    """Precompute the recommendation a player following "provider/model" will likely ask for next, if enabled."""
+    if speculator is not None and "/" in recommender:
+        provider, model = recommender.split("/", 1)
+        speculator.speculate(provider, model, grid)
@@ -0,0 +1,293 @@
+"""
+Export training data for offline policy learning: seeded games played by a teacher recommender.
+
+Every position of every game becomes one record of the packed board, the teacher's move
+(``src.game.journal.MOVE_CODES``) and its expected value, appended to fixed-size ``.npy``
+shards through memory maps. ``manifest.json`` lists the completed games and the records of
+each shard; rerunning the same command after an interruption resumes from it.
+
+Requires the ``training`` extra (NumPy):
+    pip install -e ".[training]"
+
+Usage:
+    python -m src.tools.export_training data/ --games 1000 --seed 1 --workers 8
+    python -m src.tools.export_training data/ --games 2000 --seed 1  # extends the same export
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: installed with the "training" extra
+    np = None
+
+from src.game.board import GameBoard
+from src.game.codec import pack_board
+from src.game.journal import MOVE_CODES
+from src.recommendation.heuristic.expectimax import ExpectimaxRecommender
+
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+
+RECORD_FIELDS = [("board", "<u8"), ("move", "u1"), ("value", "<f4")]
+"""Fields of a record: packed 4x4 board, teacher move code and expected value."""
+
+GameRecords = Tuple[bytes, bytes, bytes]
+
+
+class ExportException(Exception):
+    """Raised when an export cannot be started or resumed."""
+
+
+class ShardWriter:
+    """
+    Appends records to fixed-size `.npy` shards through memory maps.
+
+    Each shard is allocated at its full size when opened and filled in
+    place, so only the records of the game being written are ever held in
+    memory. Records become part of the export once `commit` has flushed
+    them and rewritten the manifest; anything written after the last
+    commit is overwritten when the export is resumed.
+    """
+
+    def __init__(self, directory: str, shard_size: int, config: Dict[str, Any]):
+        """
+        Args:
+            directory: Directory of the shards and the manifest, created if needed.
+            shard_size: Records per shard.
+            config: Settings the records depend on; resuming with other settings fails.
+
+        Raises:
+            ExportException: If the directory holds an export with other settings.
+        """
+        if np is None:
+            raise ExportException('NumPy is required to export training data: pip install -e ".[training]"')
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shard_size = shard_size
+        self.config = {**config, "shard_size": shard_size, "fields": RECORD_FIELDS}
+        self.games = 0
+        self.shards: List[Dict[str, Any]] = []
+        self.__dtype = np.dtype(RECORD_FIELDS)
+        self.__shard: Optional[Any] = None
+
+        manifest = read_manifest(directory)
+        if manifest is not None:
+            recorded = {key: manifest.get(key) for key in self.config}
+            # JSON turns the field tuples into lists
+            if json.loads(json.dumps(self.config)) != recorded:
+                raise ExportException(f"{directory} holds an export with other settings: {recorded}")
+            self.games = manifest["games"]
+            self.shards = manifest["shards"]
+
+    @property
+    def records(self) -> int:
+        return sum(shard["records"] for shard in self.shards)
+
+    def append(self, boards: bytes, moves: bytes, values: bytes) -> None:
+        """Append the records of one game, given as packed little-endian columns."""
+        boards_array = np.frombuffer(boards, dtype="<u8")
+        moves_array = np.frombuffer(moves, dtype="u1")
+        values_array = np.frombuffer(values, dtype="<f4")
+        offset = 0
+        while offset < len(boards_array):
+            shard = self.__open_shard()
+            entry = self.shards[-1]
+            start = entry["records"]
+            count = min(self.shard_size - start, len(boards_array) - offset)
+            end = offset + count
+            shard["board"][start:start + count] = boards_array[offset:end]
+            shard["move"][start:start + count] = moves_array[offset:end]
+            shard["value"][start:start + count] = values_array[offset:end]
+            entry["records"] += count
+            offset = end
+
+    def commit(self, games: int) -> None:
+        """Flush the written records and record that the first `games` games are complete."""
+        if self.__shard is not None:
+            self.__shard.flush()
+        self.games = games
+        manifest = {"version": MANIFEST_VERSION, **self.config, "games": games, "shards": self.shards}
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path + ".tmp", path)
+
+    def close(self) -> None:
+        if self.__shard is not None:
+            self.__shard.flush()
+            self.__shard = None
+
+    def __open_shard(self) -> Any:
+        """Return the memory map of the shard being filled, opening or allocating it if needed."""
+        if self.shards and self.shards[-1]["records"] < self.shard_size:
+            if self.__shard is None:
+                path = os.path.join(self.directory, self.shards[-1]["file"])
+                self.__shard = np.load(path, mmap_mode="r+")
+            return self.__shard
+
+        self.close()
+        name = f"shard-{len(self.shards):05d}.npy"
+        self.__shard = np.lib.format.open_memmap(
+            os.path.join(self.directory, name), mode="w+", dtype=self.__dtype, shape=(self.shard_size,)
+        )
+        self.shards.append({"file": name, "records": 0})
+        return self.__shard
+
+
+def read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    """Return the manifest of an export, or None if the directory holds none."""
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def load_shards(directory: str) -> Iterator[Any]:
+    """Yield each shard of an export as a read-only memory map of its committed records."""
+    if np is None:
+        raise ExportException('NumPy is required to read training data: pip install -e ".[training]"')
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise ExportException(f"{directory} holds no export")
+    for shard in manifest["shards"]:
+        yield np.load(os.path.join(directory, shard["file"]), mmap_mode="r")[:shard["records"]]
+
+
+def play_game(seed: int, depth: int, max_moves: int) -> GameRecords:
+    """
+    Play a seeded 4x4 game with the expectimax teacher.
+
+    Returns:
+        GameRecords: The packed boards, move codes and expected values of
+            every position the teacher moved from, as little-endian columns.
+    """
+    teacher = ExpectimaxRecommender(depth=depth)
+    game = GameBoard.create_new(grid_length=4, seed=seed)
+    boards = array("Q")
+    moves = bytearray()
+    values = array("f")
+    while not game.status().is_terminal and (not max_moves or len(moves) < max_moves):
+        board = pack_board(game.get_board())
+        direction, value = teacher.search(board)
+        if direction is None:
+            break
+        boards.append(board)
+        moves.append(MOVE_CODES[direction])
+        values.append(value)
+        direction.apply_to_board(game)
+    if sys.byteorder != "little":
+        boards.byteswap()
+        values.byteswap()
+    return boards.tobytes(), bytes(moves), values.tobytes()
+
+
+def run_export(
+    directory: str,
+    games: int,
+    seed: int = 0,
+    depth: int = 3,
+    max_moves: int = 0,
+    shard_size: int = 1 << 20,
+    workers: int = os.cpu_count() or 1,
+) -> ShardWriter:
+    """
+    Play games `seed`, `seed + 1`, ... `seed + games - 1` and export their positions.
+
+    Games are played in a process pool with at most two games per worker in
+    flight and written in order, committing the manifest after each game,
+    so an interrupted export resumes at the first game it had not written.
+
+    Args:
+        directory: Directory of the export.
+        games: Total number of games the export should hold.
+        seed: Seed of the first game.
+        depth: Look-ahead of the expectimax teacher.
+        max_moves: Moves after which a game is cut short; 0 plays it out.
+        shard_size: Records per shard.
+        workers: Worker processes; 0 plays in this process.
+
+    Returns:
+        ShardWriter: The closed writer, with the number of games and shards exported.
+
+    Raises:
+        ExportException: If NumPy is missing or the directory holds an export with other settings.
+    """
+    writer = ShardWriter(directory, shard_size, {"seed": seed, "depth": depth, "max_moves": max_moves})
+    first = writer.games
+    try:
+        if workers <= 0:
+            ExpectimaxRecommender.preload()
+            for index in range(first, games):
+                writer.append(*play_game(seed + index, depth, max_moves))
+                writer.commit(index + 1)
+        else:
+            context = multiprocessing.get_context("spawn")
+            in_flight: Deque[Future] = deque()
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=context, initializer=ExpectimaxRecommender.preload
+            ) as executor:
+                try:
+                    for index in range(first, games):
+                        if len(in_flight) >= 2 * workers:
+                            writer.append(*in_flight.popleft().result())
+                            writer.commit(index - len(in_flight))
+                        in_flight.append(executor.submit(play_game, seed + index, depth, max_moves))
+                    while in_flight:
+                        writer.append(*in_flight.popleft().result())
+                        writer.commit(games - len(in_flight))
+                except BaseException:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+    finally:
+        writer.close()
+    return writer
+
+
+def main() -> None:
+    """Run the exporter from the command line."""
+    parser = argparse.ArgumentParser(description="Export teacher-played positions as NumPy shards.")
+    parser.add_argument("directory", help="Directory of the shards and manifest.")
+    parser.add_argument("--games", type=int, required=True, help="Total games the export should hold.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game.")
+    parser.add_argument("--depth", type=int, default=3, help="Look-ahead of the expectimax teacher.")
+    parser.add_argument("--max-moves", type=int, default=0, help="Cut games short after this many moves (0 plays out).")
+    parser.add_argument("--shard-size", type=int, default=1 << 20, help="Records per shard.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (0 plays in this process).")
+    args = parser.parse_args()
+
+    manifest = read_manifest(args.directory)
+    previous = sum(shard["records"] for shard in manifest["shards"]) if manifest else 0
+    start = time.perf_counter()
+    try:
+        writer = run_export(
+            args.directory, args.games, args.seed, args.depth, args.max_moves, args.shard_size, args.workers
+        )
+    except ExportException as e:
+        parser.error(str(e))
+    except KeyboardInterrupt:
+        manifest = read_manifest(args.directory) or {"games": 0}
+        print(f"Interrupted after {manifest['games']} games; rerun the same command to resume.")
+        sys.exit(130)
+
+    elapsed = time.perf_counter() - start
+    records = writer.records
+    rate = (records - previous) / elapsed if elapsed else 0.0
+    print(f"games:    {writer.games} in {len(writer.shards)} shards")
+    print(f"records:  {records} ({rate:,.0f} records/s this run)")
+
+
+if __name__ == "__main__":
+    main()
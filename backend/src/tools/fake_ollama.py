@@ -0,0 +1,260 @@
+"""
+Local stand-in for an Ollama server, for load-testing the prompt recommenders offline.
+
+Usage:
+    python -m src.tools.fake_ollama --port 11434 --latency lognormal:0.3,0.5 \\
+        --error-rate 0.05 --malformed-rate 0.05
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+MOVES = ["up", "down", "left", "right"]
+_CANDIDATE_PATTERN = re.compile(r"^(up|down|left|right):$", re.MULTILINE)
+
+
+class LatencyDistribution:
+    """
+    Distribution of simulated response latencies, in seconds.
+
+    Supported kinds:
+        - ``fixed:<seconds>``
+        - ``uniform:<low>,<high>``
+        - ``lognormal:<median>,<sigma>``
+    """
+
+    def __init__(self, kind: str, params: List[float]):
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid latency distribution: {kind}:{params}")
+        self.kind = kind
+        self.params = params
+
+    @staticmethod
+    def parse(spec: str) -> "LatencyDistribution":
+        """Parse a distribution from its ``kind:p1,p2`` form."""
+        kind, _, raw = spec.partition(":")
+        try:
+            params = [float(p) for p in raw.split(",")] if raw else []
+        except ValueError as e:
+            raise ValueError(f"Invalid latency distribution: {spec}") from e
+        return LatencyDistribution(kind, params)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a latency in seconds."""
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return rng.uniform(self.params[0], self.params[1])
+        median, sigma = self.params
+        return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+
+
+class FakeOllamaConfig:
+    """Behaviour of the fake server."""
+    def __init__(
+        self,
+        models: Optional[List[str]] = None,
+        latency: Optional[LatencyDistribution] = None,
+        error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.models = models or ["llama3.1:8b", "deepseek-r1:8b"]
+        self.latency = latency or LatencyDistribution("fixed", [0.0])
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.seed = seed
+
+
+class FakeOllamaServer:
+    """
+    Threaded HTTP server speaking the subset of the Ollama API used by the backend:
+    ``GET /api/tags``, ``GET /api/version`` and non-streaming ``POST /api/chat``.
+
+    Chat replies pick one of the legal moves listed in the prompt when present.
+    Configured fractions of the replies fail with HTTP 500 or carry content that
+    is not JSON.
+    """
+
+    def __init__(self, config: FakeOllamaConfig, host: str = "127.0.0.1", port: int = 0):
+        self.config = config
+        self.requests = 0
+        self.__rng = random.Random(config.seed)
+        self.__lock = threading.Lock()
+        self.__server = ThreadingHTTPServer((host, port), self.__handler_class())
+        self.__server.daemon_threads = True
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server, usable as an Ollama host."""
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllamaServer":
+        """Serve requests on a background thread."""
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="fake-ollama",
+            daemon=True,
+        )
+        self.__thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+        self.__server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        self.__server.shutdown()
+        self.__server.server_close()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def _draw(self) -> Dict[str, Any]:
+        """Draw the latency and failure mode of a single chat reply."""
+        with self.__lock:
+            self.requests += 1
+            return {
+                "latency": self.config.latency.sample(self.__rng),
+                "error": self.__rng.random() < self.config.error_rate,
+                "malformed": self.__rng.random() < self.config.malformed_rate,
+                "choice": self.__rng.random(),
+            }
+
+    def chat(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build a chat reply, or None to signal a simulated server error."""
+        draw = self._draw()
+        time.sleep(draw["latency"])
+        if draw["error"]:
+            return None
+
+        prompt = "".join(str(m.get("content", "")) for m in payload.get("messages", []))
+        candidates = _CANDIDATE_PATTERN.findall(prompt) or MOVES
+        move = candidates[int(draw["choice"] * len(candidates))]
+        if draw["malformed"]:
+            content = f"I would go {move}, it keeps the corner."
+        else:
+            content = json.dumps({"move": move, "rationale": f"Moving {move} keeps tiles merged."})
+
+        return {
+            "model": payload.get("model", ""),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": {"role": "assistant", "content": content},
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int(draw["latency"] * 1e9),
+            "prompt_eval_count": max(1, len(prompt) // 4),
+            "eval_count": max(1, len(content) // 4),
+        }
+
+    def tags(self) -> Dict[str, Any]:
+        """Build the model list reply."""
+        return {
+            "models": [
+                {
+                    "name": model,
+                    "model": model,
+                    "modified_at": "2024-01-01T00:00:00Z",
+                    "size": 0,
+                    "digest": "",
+                    "details": {},
+                }
+                for model in self.config.models
+            ]
+        }
+
+    def __handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Request handler delegating to the owning fake server."""
+
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                if self.path == "/api/tags":
+                    self._reply(200, server.tags())
+                elif self.path == "/api/version":
+                    self._reply(200, {"version": "0.0.0-fake"})
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self) -> None:  # pylint: disable=invalid-name
+                if self.path != "/api/chat":
+                    self._reply(404, {"error": "not found"})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._reply(400, {"error": "invalid JSON body"})
+                    return
+                if payload.get("model") not in server.config.models:
+                    self._reply(404, {"error": f"model '{payload.get('model')}' not found"})
+                    return
+                reply = server.chat(payload)
+                if reply is None:
+                    self._reply(500, {"error": "simulated server error"})
+                else:
+                    self._reply(200, reply)
+
+            def _reply(self, status: int, body: Dict[str, Any]) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    """Run the fake Ollama server from the command line."""
+    parser = argparse.ArgumentParser(description="Fake Ollama server for offline load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--models", nargs="+", default=None, help="Model names to serve.")
+    parser.add_argument("--latency", default="fixed:0.0",
+                        help="fixed:<s> | uniform:<low>,<high> | lognormal:<median>,<sigma>")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = FakeOllamaConfig(
+        models=args.models,
+        latency=LatencyDistribution.parse(args.latency),
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+    server = FakeOllamaServer(config, host=args.host, port=args.port)
+    print(f"Fake Ollama server at {server.url} serving {', '.join(config.models)}")
+    print("Press Ctrl+C to stop the server.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Open-loop load test of ``/api/recommend`` reporting throughput and latency percentiles.
+
+Usage:
+    python -m src.tools.loadtest --base-url http://127.0.0.1:8000 --rate 50 --duration 30 \\
+        --provider ollama --model llama3.1:8b
+
+    # Fully offline: in-process app backed by the fake Ollama server
+    python -m src.tools.loadtest --in-process --fake-ollama --provider ollama \\
+        --model llama3.1:8b --fake-latency lognormal:0.3,0.5 --fake-error-rate 0.1
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+from src.config.settings import SETTINGS
+from src.game.board import Board, GameBoard
+from src.game.direction import Direction
+from src.tools.fake_ollama import FakeOllamaConfig, FakeOllamaServer, LatencyDistribution
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Samples, in any order.
+        q: Percentile between 0 and 100.
+
+    Returns:
+        The smallest sample with at least ``q`` percent of samples at or below it,
+        or 0.0 when there are no samples.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+class EndpointStats:
+    """Latency samples and status codes recorded for a single endpoint."""
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.transport_errors = 0
+
+    def record(self, latency: float, status: int) -> None:
+        """Record a completed request."""
+        self.latencies.append(latency)
+        self.statuses[status] += 1
+
+    @property
+    def completed(self) -> int:
+        """Number of requests that got an HTTP response."""
+        return len(self.latencies)
+
+    def summary(self, elapsed: float) -> Dict[str, float]:
+        """Summarize throughput and latency percentiles in milliseconds."""
+        return {
+            "completed": self.completed,
+            "throughput": self.completed / elapsed if elapsed > 0 else 0.0,
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p90_ms": percentile(self.latencies, 90) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000,
+            "max_ms": max(self.latencies, default=0.0) * 1000,
+            "rate_limited": self.statuses[429] / self.completed if self.completed else 0.0,
+        }
+
+
+class LoadReport:
+    """Outcome of a load test run."""
+    def __init__(self, target_rate: float, duration: float):
+        self.target_rate = target_rate
+        self.duration = duration
+        self.elapsed = 0.0
+        self.sent = 0
+        self.dropped = 0
+        self.fallbacks = 0
+        self.stats = EndpointStats()
+
+    def format(self) -> str:
+        """Render the report as human-readable text."""
+        summary = self.stats.summary(self.elapsed)
+        ok = self.stats.statuses[200]
+        lines = [
+            f"target rate      {self.target_rate:.1f} req/s for {self.duration:.1f}s",
+            f"sent             {self.sent} (dropped at client: {self.dropped})",
+            f"completed        {summary['completed']} in {self.elapsed:.2f}s "
+            f"({summary['throughput']:.1f} req/s)",
+            f"transport errors {self.stats.transport_errors}",
+            "statuses         " + ", ".join(
+                f"{status}: {count}" for status, count in sorted(self.stats.statuses.items())
+            ),
+            f"fallbacks        {self.fallbacks} ({self.fallbacks / ok:.1%} of 200s)" if ok
+            else "fallbacks        0",
+            f"latency ms       p50 {summary['p50_ms']:.1f}  p90 {summary['p90_ms']:.1f}  "
+            f"p99 {summary['p99_ms']:.1f}  max {summary['max_ms']:.1f}",
+        ]
+        return "\n".join(lines)
+
+
+def sample_grids(count: int, seed: Optional[int] = None, max_moves: int = 60) -> List[Board]:
+    """
+    Generate mid-game grids by playing random moves from fresh boards.
+
+    Args:
+        count: Number of grids to generate.
+        seed: Seed for reproducible grids.
+        max_moves: Upper bound on the random moves played per grid.
+
+    Returns:
+        List of non-terminal grids.
+    """
+    rng = random.Random(seed)
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        grids: List[Board] = []
+        while len(grids) < count:
+            game = GameBoard.create_new()
+            for _ in range(rng.randint(0, max_moves)):
+                if game.status().is_terminal:
+                    break
+                rng.choice(list(Direction)).apply_to_board(game)
+            if not game.status().is_terminal:
+                grids.append(game.get_board())
+        return grids
+    finally:
+        random.setstate(state)
+
+
+async def run_recommend_load(
+    client: httpx.AsyncClient,
+    rate: float,
+    duration: float,
+    provider: str,
+    model: str,
+    grids: Sequence[Board],
+    max_in_flight: int = 256,
+) -> LoadReport:
+    """
+    Send ``/api/recommend`` requests on a fixed schedule, regardless of response times.
+
+    Args:
+        client: Client bound to the server under test.
+        rate: Target requests per second.
+        duration: Seconds to keep sending.
+        provider: Provider to request recommendations from.
+        model: Model to request recommendations from.
+        grids: Grids cycled through as request payloads.
+        max_in_flight: Requests beyond this many outstanding are dropped and counted.
+
+    Returns:
+        The load report.
+    """
+    report = LoadReport(rate, duration)
+    in_flight: set = set()
+
+    async def send(grid: Board) -> None:
+        start = time.perf_counter()
+        try:
+            response = await client.post(
+                "/api/recommend",
+                json={"grid": grid, "provider": provider, "model": model},
+            )
+        except httpx.HTTPError:
+            report.stats.transport_errors += 1
+            return
+        report.stats.record(time.perf_counter() - start, response.status_code)
+        if response.status_code == 200 \
+                and response.json().get("rationale", "").startswith("[Fallback"):
+            report.fallbacks += 1
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for i in range(int(rate * duration)):
+        delay = start + i / rate - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= max_in_flight:
+            report.dropped += 1
+            continue
+        task = asyncio.create_task(send(grids[i % len(grids)]))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        report.sent += 1
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    report.elapsed = loop.time() - start
+    return report
+
+
+def in_process_client(disable_rate_limit: bool) -> httpx.AsyncClient:
+    """Build a client bound to the app in this process, after discovery finished."""
+    # Imported late so settings overrides (e.g. the fake Ollama host) apply
+    from src.app.app import app  # pylint: disable=import-outside-toplevel
+    from src.recommendation.registry import registry  # pylint: disable=import-outside-toplevel
+
+    registry.refresh()
+    if disable_rate_limit:
+        app.state.limiter.enabled = False
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def add_target_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options selecting the server to drive: a running one, or the app in this process."""
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Drive the app in this process instead of a running server.")
+    parser.add_argument("--keep-rate-limit", action="store_true",
+                        help="Keep slowapi limits enabled for in-process runs.")
+
+
+def add_fake_ollama_arguments(parser: argparse.ArgumentParser, help_text: str) -> None:
+    """Add the options of the fake Ollama server, read by `start_fake_ollama`."""
+    parser.add_argument("--fake-ollama", action="store_true", help=help_text)
+    parser.add_argument("--fake-latency", default="fixed:0.05")
+    parser.add_argument("--fake-error-rate", type=float, default=0.0)
+    parser.add_argument("--fake-malformed-rate", type=float, default=0.0)
+
+
+def start_fake_ollama(args: argparse.Namespace, models: Optional[List[str]]) -> FakeOllamaServer:
+    """
+    Start the fake Ollama server configured by the command line and point the app at it.
+
+    Args:
+        args: Parsed options added by `add_fake_ollama_arguments`, and ``seed``.
+        models: Models the server lists, or None for its defaults.
+
+    Returns:
+        The running server, to be stopped by the caller.
+    """
+    fake = FakeOllamaServer(FakeOllamaConfig(
+        models=models,
+        latency=LatencyDistribution.parse(args.fake_latency),
+        error_rate=args.fake_error_rate,
+        malformed_rate=args.fake_malformed_rate,
+        seed=args.seed,
+    )).start()
+    SETTINGS.recommendation.ollama.host = fake.url
+    return fake
+
+
+async def _main(args: argparse.Namespace) -> None:
+    fake = None
+    if args.fake_ollama:
+        fake = start_fake_ollama(args, [args.model] if args.provider == "ollama" else None)
+        if args.provider == "ollama" and args.model not in SETTINGS.recommendation.ollama.allowed_models:
+            SETTINGS.recommendation.ollama.allowed_models.append(args.model)
+
+    try:
+        if args.in_process or fake is not None:
+            client = in_process_client(disable_rate_limit=not args.keep_rate_limit)
+        else:
+            client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+        async with client:
+            report = await run_recommend_load(
+                client,
+                rate=args.rate,
+                duration=args.duration,
+                provider=args.provider,
+                model=args.model,
+                grids=sample_grids(64, seed=args.seed),
+                max_in_flight=args.max_in_flight,
+            )
+        print(report.format())
+    finally:
+        if fake is not None:
+            fake.stop()
+
+
+def main() -> None:
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description="Load test /api/recommend.")
+    add_target_arguments(parser)
+    parser.add_argument("--rate", type=float, default=10.0, help="Target requests per second.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to send for.")
+    parser.add_argument("--provider", default="heuristic")
+    parser.add_argument("--model", default="simple")
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=None)
+    add_fake_ollama_arguments(parser, "Start a fake Ollama server and point an in-process app at it.")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Closed-loop load test simulating concurrent players of whole games.
+
+Each player starts a game with ``/api/new``, thinks, optionally asks ``/api/recommend``
+for a move, plays it with ``/api/move`` and repeats until the game ends, then starts the
+next one. Throughput, latency percentiles and 429 (rate-limited) rates are reported per
+endpoint.
+
+Usage:
+    # In-process app, slowapi limits disabled unless --keep-rate-limit is given
+    python -m src.tools.players --in-process --players 50 --duration 30 --recommend-ratio 0.2
+
+    # Against a running server, sizing workers and limits before deploying
+    python -m src.tools.players --base-url http://127.0.0.1:8000 --players 200 \\
+        --think-time lognormal:0.5,0.6 --provider heuristic --model expectimax
+"""
+import argparse
+import asyncio
+import random
+from typing import Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from src.game.board import Board
+from src.game.direction import Direction
+from src.tools.fake_ollama import LatencyDistribution
+from src.tools.loadtest import EndpointStats, add_target_arguments, in_process_client
+
+ENDPOINTS = ("/api/new", "/api/move", "/api/recommend")
+
+
+class PlayerReport:
+    """Outcome of a player simulation: per-endpoint statistics and game counts."""
+
+    def __init__(self, players: int, duration: float):
+        self.players = players
+        self.duration = duration
+        self.elapsed = 0.0
+        self.games_started = 0
+        self.games_finished = 0
+        self.moves = 0
+        self.statuses: Dict[str, int] = {}
+        self.stats: Dict[str, EndpointStats] = {endpoint: EndpointStats() for endpoint in ENDPOINTS}
+
+    def format(self) -> str:
+        """Render the report as human-readable text."""
+        outcomes = ", ".join(f"{status}: {count}" for status, count in sorted(self.statuses.items()))
+        lines = [
+            f"players          {self.players} for {self.duration:.1f}s (ran {self.elapsed:.2f}s)",
+            f"games            {self.games_started} started, {self.games_finished} finished"
+            + (f" ({outcomes})" if outcomes else ""),
+            f"moves            {self.moves} ({self.moves / self.elapsed if self.elapsed else 0.0:.1f}/s)",
+        ]
+        for endpoint, stats in self.stats.items():
+            summary = stats.summary(self.elapsed)
+            lines.append(
+                f"{endpoint:<16} {summary['completed']:>6} req  {summary['throughput']:8.1f} req/s  "
+                f"p50 {summary['p50_ms']:.1f}  p90 {summary['p90_ms']:.1f}  p99 {summary['p99_ms']:.1f}  "
+                f"max {summary['max_ms']:.1f} ms  429 {summary['rate_limited']:.1%}  "
+                f"errors {stats.transport_errors}"
+            )
+        return "\n".join(lines)
+
+
+class _Player:
+    """One simulated player, playing games back to back until the deadline."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        report: PlayerReport,
+        rng: random.Random,
+        think_time: LatencyDistribution,
+        recommend_ratio: float,
+        provider: str,
+        model: str,
+        session: bool,
+        deadline: float,
+    ):
+        self.client = client
+        self.report = report
+        self.rng = rng
+        self.think_time = think_time
+        self.recommend_ratio = recommend_ratio
+        self.provider = provider
+        self.model = model
+        self.session = session
+        self.deadline = deadline
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        # Stagger the first games, as real players do not arrive together
+        await asyncio.sleep(self.rng.uniform(0, self.think_time.sample(self.rng)))
+        while loop.time() < self.deadline:
+            await self.__play_game(loop)
+
+    async def __play_game(self, loop: asyncio.AbstractEventLoop) -> None:
+        response = await self.__post("/api/new", None, params={"session": "true"} if self.session else None)
+        if response is None or response.status_code != 200:
+            await self.__think()
+            return
+        self.report.games_started += 1
+        grid: Board = response.json()
+        state = {"session_id": response.headers["X-Session-Id"]} if self.session \
+            else {"state_token": response.headers["X-State-Token"]}
+        turns = 0
+        # Directions that did not change the current board
+        stuck: Set[str] = set()
+
+        while loop.time() < self.deadline:
+            await self.__think()
+            direction, recommender = await self.__choose(grid, stuck)
+            response = await self.__post("/api/move", {"direction": direction, "recommender": recommender, **state})
+            if response is None or response.status_code not in (200, 429):
+                return
+            if response.status_code == 429:
+                continue
+
+            result = response.json()
+            if result["turns"] == turns:
+                stuck.add(direction)
+                continue
+            self.report.moves += 1
+            grid, turns = result["grid"], result["turns"]
+            stuck.clear()
+            if not self.session:
+                state = {"state_token": result["state_token"]}
+            if result["status"] != "ONGOING":
+                self.report.games_finished += 1
+                self.report.statuses[result["status"]] = self.report.statuses.get(result["status"], 0) + 1
+                return
+
+    async def __choose(self, grid: Board, stuck: Set[str]) -> Tuple[str, Optional[str]]:
+        """Pick the next move: the recommendation if one was asked for, else a random untried one."""
+        if not stuck and self.rng.random() < self.recommend_ratio:
+            response = await self.__post(
+                "/api/recommend", {"grid": grid, "provider": self.provider, "model": self.model}
+            )
+            if response is not None and response.status_code == 200:
+                return response.json()["suggested_move"], f"{self.provider}/{self.model}"
+        candidates = [direction.value for direction in Direction if direction.value not in stuck]
+        return self.rng.choice(candidates or [direction.value for direction in Direction]), None
+
+    async def __think(self) -> None:
+        await asyncio.sleep(self.think_time.sample(self.rng))
+
+    async def __post(self, endpoint: str, body: Optional[dict], params: Optional[dict] = None) -> Optional[httpx.Response]:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            response = await self.client.post(endpoint, json=body, params=params)
+        except httpx.HTTPError:
+            self.report.stats[endpoint].transport_errors += 1
+            return None
+        self.report.stats[endpoint].record(loop.time() - start, response.status_code)
+        return response
+
+
+async def run_players(
+    client: httpx.AsyncClient,
+    players: int,
+    duration: float,
+    think_time: LatencyDistribution,
+    recommend_ratio: float = 0.1,
+    provider: str = "heuristic",
+    model: str = "simple",
+    session: bool = False,
+    seed: Optional[int] = None,
+) -> PlayerReport:
+    """
+    Simulate concurrent players of whole games for a while.
+
+    Unlike `src.tools.loadtest.run_recommend_load` this is closed-loop: each
+    player waits for a response and thinks before its next request, so the
+    offered load follows the server's latency like real traffic does.
+    Players stop starting requests at the deadline and finish the ones in flight.
+
+    Args:
+        client: Client bound to the server under test.
+        players: Number of concurrent players.
+        duration: Seconds to play for.
+        think_time: Pause before each move.
+        recommend_ratio: Probability of asking for a recommendation before a move.
+        provider: Provider to request recommendations from.
+        model: Model to request recommendations from.
+        session: Play server-side session games instead of stateless token games.
+        seed: Seed for reproducible think times and moves.
+
+    Returns:
+        The player report.
+    """
+    report = PlayerReport(players, duration)
+    rng = random.Random(seed)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    simulated: List[_Player] = [
+        _Player(client, report, random.Random(rng.getrandbits(64)), think_time, recommend_ratio,
+                provider, model, session, start + duration)
+        for _ in range(players)
+    ]
+    await asyncio.gather(*(player.run() for player in simulated))
+    report.elapsed = loop.time() - start
+    return report
+
+
+async def _main(args: argparse.Namespace) -> None:
+    if args.in_process:
+        client = in_process_client(disable_rate_limit=not args.keep_rate_limit)
+    else:
+        client = httpx.AsyncClient(
+            base_url=args.base_url,
+            timeout=args.timeout,
+            limits=httpx.Limits(max_connections=args.players, max_keepalive_connections=args.players),
+        )
+    async with client:
+        report = await run_players(
+            client,
+            players=args.players,
+            duration=args.duration,
+            think_time=LatencyDistribution.parse(args.think_time),
+            recommend_ratio=args.recommend_ratio,
+            provider=args.provider,
+            model=args.model,
+            session=args.session,
+            seed=args.seed,
+        )
+    print(report.format())
+
+
+def main() -> None:
+    """Run the player simulation from the command line."""
+    parser = argparse.ArgumentParser(description="Simulate concurrent players of whole games.")
+    add_target_arguments(parser)
+    parser.add_argument("--players", type=int, default=20, help="Concurrent players.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to play for.")
+    parser.add_argument("--think-time", default="lognormal:0.3,0.5",
+                        help="Pause before each move (fixed:<s>, uniform:<lo>,<hi> or lognormal:<median>,<sigma>).")
+    parser.add_argument("--recommend-ratio", type=float, default=0.1,
+                        help="Probability of asking /api/recommend before a move.")
+    parser.add_argument("--provider", default="heuristic")
+    parser.add_argument("--model", default="simple")
+    parser.add_argument("--session", action="store_true", help="Play session games instead of token games.")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=None)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
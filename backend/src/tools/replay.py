@@ -0,0 +1,85 @@
+"""
+Inspect the game journal and rebuild any recorded board by replaying its moves.
+
+Usage:
+    python -m src.tools.replay stats
+    python -m src.tools.replay list --limit 20
+    python -m src.tools.replay show 42 --turn 100
+"""
+import argparse
+import os
+from typing import Iterator, List, Optional, Tuple
+
+from src.config.settings import SETTINGS
+from src.game.journal import JournalRecord, read_segment, segment_paths
+
+
+def iter_records(directory: str) -> Iterator[Tuple[int, JournalRecord]]:
+    """Yield (index, record) for every journaled game, oldest first."""
+    index = 0
+    for path in segment_paths(directory):
+        for record in read_segment(path):
+            yield index, record
+            index += 1
+
+
+def find_record(directory: str, index: int) -> Optional[JournalRecord]:
+    """Return the journaled game at an index, or None if there is no such game."""
+    for position, record in iter_records(directory):
+        if position == index:
+            return record
+    return None
+
+
+def format_stats(directory: str) -> str:
+    """Summarize the number of segments, games, moves and bytes in the journal."""
+    games = 0
+    moves = 0
+    for _, record in iter_records(directory):
+        games += 1
+        moves += record.turns
+    segments = segment_paths(directory)
+    size = sum(os.path.getsize(path) for path in segments)
+    lines: List[str] = [
+        f"segments: {len(segments)}",
+        f"games:    {games}",
+        f"moves:    {moves}",
+        f"bytes:    {size}",
+    ]
+    if games:
+        lines.append(f"bytes/game: {size / games:.1f}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Run the journal replay tool from the command line."""
+    parser = argparse.ArgumentParser(description="Inspect and replay the game journal.")
+    parser.add_argument("--journal", default=SETTINGS.journal.directory,
+                        help="Journal directory.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Summarize the journal.")
+    list_parser = commands.add_parser("list", help="List journaled games.")
+    list_parser.add_argument("--limit", type=int, default=50)
+    show_parser = commands.add_parser("show", help="Replay a game and print its board.")
+    show_parser.add_argument("index", type=int, help="Index of the game, as shown by 'list'.")
+    show_parser.add_argument("--turn", type=int, default=None,
+                             help="Stop after this many moves (default: the end of the game).")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        print(format_stats(args.journal))
+    elif args.command == "list":
+        for index, record in iter_records(args.journal):
+            if index >= args.limit:
+                break
+            print(f"{index:>8}  seed={record.seed:<20} turns={record.turns}")
+    else:
+        record = find_record(args.journal, args.index)
+        if record is None:
+            parser.error(f"No game with index {args.index}")
+        game = record.replay(args.turn)
+        print(repr(game))
+
+
+if __name__ == "__main__":
+    main()
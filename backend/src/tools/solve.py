@@ -0,0 +1,54 @@
+"""
+Solve a small grid exactly and write its tablebase for the ``heuristic/perfect`` recommender.
+
+The game rules (goal, start number and number of starting tiles) default to the configured
+``GAME__*`` settings, which the tablebase must match to be served. 2x2 grids are solved in a
+fraction of a second (and in memory when no tablebase exists); 3x3 grids take about 40
+seconds for a goal of 32 and a few minutes for 64, while 3x3 games to 2048 are out of reach.
+
+Usage:
+    python -m src.tools.solve --grid-length 3 --goal 64
+    python -m src.tools.solve --grid-length 2 --output tablebases/
+"""
+import argparse
+import os
+import sys
+import time
+
+from src.config.settings import SETTINGS
+from src.game.tablebase import encode_tablebase, solve, tablebase_name
+
+
+def main() -> None:
+    """Run the solver from the command line."""
+    parser = argparse.ArgumentParser(description="Solve a small grid and write its tablebase.")
+    parser.add_argument("--grid-length", type=int, default=3, choices=(2, 3))
+    parser.add_argument("--goal", type=int, default=SETTINGS.game.goal_number, help="Winning tile.")
+    parser.add_argument("--start-number", type=int, default=SETTINGS.game.start_number)
+    parser.add_argument("--min-start-count", type=int, default=SETTINGS.game.min_start_count)
+    parser.add_argument("--max-start-count", type=int, default=SETTINGS.game.max_start_count)
+    parser.add_argument("--output", default=SETTINGS.recommendation.tablebase_directory,
+                        help="Directory the tablebase is written to.")
+    args = parser.parse_args()
+
+    def progress(total: int, found: int) -> None:
+        print(f"\rtile sum {total:>6}: {found:,} positions", end="", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    solution = solve(
+        args.grid_length, args.goal, args.start_number, args.min_start_count, args.max_start_count, progress
+    )
+    print(file=sys.stderr)
+    data = encode_tablebase(solution, args.grid_length, args.goal, args.start_number)
+
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, tablebase_name(args.grid_length, args.goal))
+    with open(path + ".tmp", "wb") as file:
+        file.write(data)
+    os.replace(path + ".tmp", path)
+    print(f"{len(solution):,} positions solved in {time.perf_counter() - start:.1f}s, "
+          f"{len(data):,} bytes written to {path}")
+
+
+if __name__ == "__main__":
+    main()
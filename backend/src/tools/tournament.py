@@ -0,0 +1,454 @@
+"""
+Head-to-head tournament of recommenders playing the same seeded games.
+
+Every entrant plays games `seed`, `seed + 1`, ... with identical tile spawns for identical
+moves, so results can be compared game by game. Win rate, max tile, moves per second and
+per-move decision latency are reported per entrant with 95% confidence intervals, followed
+by the head-to-head record of every pair.
+
+Usage:
+    # Every registered recommender that can play a 4x4 board
+    python -m src.tools.tournament --games 100 --workers 8
+
+    # Search budgets against each other, on games cut short at 512
+    python -m src.tools.tournament heuristic/simple heuristic/expectimax@1 heuristic/expectimax@2 \\
+        --games 200 --goal 512
+
+    # An LLM through the fake Ollama server
+    python -m src.tools.tournament heuristic/expectimax ollama/llama3.1:8b --fake-ollama \\
+        --fake-latency lognormal:0.3,0.5 --fake-error-rate 0.05 --games 20
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.config.settings import SETTINGS
+from src.game.board import GameBoard
+from src.game.direction import Direction
+from src.game.status import GameStatus
+from src.recommendation.base import BaseRecommender
+from src.recommendation.heuristic.expectimax import ExpectimaxRecommender
+from src.recommendation.heuristic.simple import SimpleHeuristicRecommender
+from src.recommendation.registry import registry
+from src.tools.loadtest import add_fake_ollama_arguments, percentile, start_fake_ollama
+
+Z_95 = 1.96
+"""Standard normal quantile of the two-sided 95% confidence intervals."""
+
+
+class GameResult:
+    """Outcome of one entrant playing one seeded game."""
+
+    def __init__(
+        self,
+        entrant: str,
+        seed: int,
+        won: bool,
+        max_tile: int,
+        moves: int,
+        seconds: float,
+        latencies: List[float],
+        fallbacks: int = 0,
+        invalid: int = 0,
+    ):
+        self.entrant = entrant
+        self.seed = seed
+        self.won = won
+        self.max_tile = max_tile
+        self.moves = moves
+        self.seconds = seconds
+        self.latencies = latencies
+        self.fallbacks = fallbacks
+        self.invalid = invalid
+
+
+def wilson_interval(successes: int, trials: int, z: float = Z_95) -> Tuple[float, float]:
+    """
+    Wilson score interval of a binomial proportion.
+
+    Unlike the normal approximation it stays within [0, 1] and is usable for
+    win rates near 0 or 1 and for few games.
+    """
+    if not trials:
+        return 0.0, 1.0
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / denominator
+    spread = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - spread), min(1.0, center + spread)
+
+
+def mean_interval(values: Sequence[float], z: float = Z_95) -> Tuple[float, float]:
+    """
+    Mean of samples and the half-width of its normal-approximation confidence interval.
+
+    Returns:
+        (mean, half_width), with a half-width of 0.0 for fewer than two samples.
+    """
+    if not values:
+        return 0.0, 0.0
+    mean = sum(values) / len(values)
+    if len(values) < 2:
+        return mean, 0.0
+    variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+    return mean, z * math.sqrt(variance / len(values))
+
+
+class EntrantStats:
+    """Results of every game played by one entrant."""
+
+    def __init__(self, entrant: str):
+        self.entrant = entrant
+        self.results: Dict[int, GameResult] = {}
+
+    def add(self, result: GameResult) -> None:
+        self.results[result.seed] = result
+
+    def to_dict(self) -> Dict[str, Any]:
+        results = list(self.results.values())
+        games = len(results)
+        wins = sum(result.won for result in results)
+        moves = sum(result.moves for result in results)
+        seconds = sum(result.seconds for result in results)
+        latencies = [latency for result in results for latency in result.latencies]
+        max_tiles = [result.max_tile for result in results]
+        mean_tile, tile_spread = mean_interval(max_tiles)
+        # Per-game move rates, so one long game does not stand for the whole interval
+        mean_rate, rate_spread = mean_interval([result.moves / result.seconds for result in results if result.seconds])
+        mean_latency, latency_spread = mean_interval(latencies)
+        return {
+            "games": games,
+            "wins": wins,
+            "win_rate": wins / games if games else 0.0,
+            "win_rate_ci": wilson_interval(wins, games),
+            "max_tile_mean": mean_tile,
+            "max_tile_ci": (mean_tile - tile_spread, mean_tile + tile_spread),
+            "max_tile_p50": percentile(max_tiles, 50),
+            "max_tile_p90": percentile(max_tiles, 90),
+            "max_tile_best": max(max_tiles, default=0),
+            "moves": moves,
+            "moves_per_second": moves / seconds if seconds else 0.0,
+            "moves_per_second_ci": (mean_rate - rate_spread, mean_rate + rate_spread),
+            "latency_mean_ms": mean_latency * 1000,
+            "latency_ci_ms": ((mean_latency - latency_spread) * 1000, (mean_latency + latency_spread) * 1000),
+            "latency_p50_ms": percentile(latencies, 50) * 1000,
+            "latency_p90_ms": percentile(latencies, 90) * 1000,
+            "latency_p99_ms": percentile(latencies, 99) * 1000,
+            "fallbacks": sum(result.fallbacks for result in results),
+            "invalid_moves": sum(result.invalid for result in results),
+        }
+
+
+class TournamentReport:
+    """Per-entrant statistics and the head-to-head record of a tournament."""
+
+    def __init__(self, entrants: List[str], games: int, grid_length: int, goal_number: int):
+        self.games = games
+        self.grid_length = grid_length
+        self.goal_number = goal_number
+        self.elapsed = 0.0
+        self.stats: Dict[str, EntrantStats] = {entrant: EntrantStats(entrant) for entrant in entrants}
+
+    def add(self, result: GameResult) -> None:
+        self.stats[result.entrant].add(result)
+
+    def head_to_head(self, first: str, second: str) -> Tuple[int, int, int]:
+        """
+        Record of `first` against `second` over the seeds both played.
+
+        A game is won by the entrant that reached the larger tile, then the one
+        that reached the goal in fewer moves or, short of it, survived more moves.
+
+        Returns:
+            (wins, draws, losses) of `first`.
+        """
+        wins = draws = losses = 0
+        theirs = self.stats[second].results
+        for seed, mine in self.stats[first].results.items():
+            other = theirs.get(seed)
+            if other is None:
+                continue
+            if _rank(mine) == _rank(other):
+                draws += 1
+            elif _rank(mine) > _rank(other):
+                wins += 1
+            else:
+                losses += 1
+        return wins, draws, losses
+
+    def to_dict(self) -> Dict[str, Any]:
+        entrants = list(self.stats)
+        return {
+            "games": self.games,
+            "grid_length": self.grid_length,
+            "goal_number": self.goal_number,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "entrants": {entrant: stats.to_dict() for entrant, stats in self.stats.items()},
+            "head_to_head": {
+                f"{first} vs {second}": dict(zip(("wins", "draws", "losses"), self.head_to_head(first, second)))
+                for i, first in enumerate(entrants) for second in entrants[i + 1:]
+            },
+        }
+
+    def format(self) -> str:
+        """Render the report as human-readable text."""
+        lines = [
+            f"{self.games} games per entrant on {self.grid_length}x{self.grid_length} to {self.goal_number} "
+            f"in {self.elapsed:.1f}s (95% confidence intervals)",
+        ]
+        for entrant, stats in self.stats.items():
+            summary = stats.to_dict()
+            low, high = summary["win_rate_ci"]
+            tile_low, tile_high = summary["max_tile_ci"]
+            rate_low, rate_high = summary["moves_per_second_ci"]
+            lines += [
+                entrant,
+                f"  win rate   {summary['win_rate']:.1%} [{low:.1%}, {high:.1%}] ({summary['wins']}/{summary['games']})",
+                f"  max tile   mean {summary['max_tile_mean']:.0f} [{tile_low:.0f}, {tile_high:.0f}]  "
+                f"p50 {summary['max_tile_p50']:.0f}  p90 {summary['max_tile_p90']:.0f}  best {summary['max_tile_best']}",
+                f"  moves      {summary['moves']} ({summary['moves_per_second']:,.1f}/s, "
+                f"per game [{rate_low:,.1f}, {rate_high:,.1f}])",
+                f"  decision   mean {summary['latency_mean_ms']:.2f} ms "
+                f"[{summary['latency_ci_ms'][0]:.2f}, {summary['latency_ci_ms'][1]:.2f}]  "
+                f"p50 {summary['latency_p50_ms']:.2f}  p90 {summary['latency_p90_ms']:.2f}  "
+                f"p99 {summary['latency_p99_ms']:.2f} ms",
+                f"  fallbacks  {summary['fallbacks']}  invalid moves {summary['invalid_moves']}",
+            ]
+        entrants = list(self.stats)
+        if len(entrants) > 1:
+            lines.append("head to head (wins-draws-losses)")
+            for i, first in enumerate(entrants):
+                for second in entrants[i + 1:]:
+                    wins, draws, losses = self.head_to_head(first, second)
+                    lines.append(f"  {first} vs {second}: {wins}-{draws}-{losses}")
+        return "\n".join(lines)
+
+
+def _rank(result: GameResult) -> Tuple[int, int]:
+    return result.max_tile, -result.moves if result.won else result.moves
+
+
+def parse_entrant(entrant: str) -> Tuple[str, str, Optional[int]]:
+    """
+    Split an entrant into provider, model and search depth.
+
+    Entrants are registered ``provider/model`` recommenders; expectimax may be
+    given a look-ahead with ``heuristic/expectimax@<depth>``.
+
+    Raises:
+        ValueError: If the entrant is malformed.
+    """
+    name, _, depth = entrant.partition("@")
+    provider, _, model = name.partition("/")
+    if not provider or not model:
+        raise ValueError(f"Entrant {entrant} is not of the form provider/model")
+    if not depth:
+        return provider, model, None
+    if (provider, model) != ("heuristic", "expectimax") or not depth.isdigit() or int(depth) < 1:
+        raise ValueError(f"Only heuristic/expectimax takes a search depth, as @<depth> >= 1: {entrant}")
+    return provider, model, int(depth)
+
+
+def create_recommender(entrant: str) -> Tuple[BaseRecommender, str]:
+    """
+    Resolve an entrant to its recommender and model name.
+
+    Raises:
+        ValueError: If the entrant is malformed or not registered.
+    """
+    provider, model, depth = parse_entrant(entrant)
+    if depth is not None:
+        return ExpectimaxRecommender(depth=depth), model
+    return registry.get_recommender(provider, model), model
+
+
+def default_entrants(grid_length: int) -> List[str]:
+    """
+    Every registered recommender that can play a board of the grid size.
+
+    Recommenders are tried on an empty board; those raising `ValueError`
+    (e.g. expectimax off 4x4 boards, or perfect play off small ones) are left out.
+    """
+    grid = GameBoard.create_new(grid_length=grid_length, seed=0).get_board()
+    entrants = []
+    for info in registry.list_models():
+        entrant = f"{info.provider}/{info.model}"
+        try:
+            recommender, model = create_recommender(entrant)
+            recommender.suggest_move(grid, model)
+        except ValueError as e:
+            print(f"skipping {entrant}: {e}", file=sys.stderr)
+            continue
+        entrants.append(entrant)
+    return entrants
+
+
+def play_game(entrant: str, seed: int, grid_length: int, goal_number: int, max_moves: int) -> GameResult:
+    """
+    Play one seeded game with an entrant.
+
+    Moves the recommender fails on are played by the simple heuristic, as the
+    API does (counted as fallbacks); suggested moves that do not change the
+    board are replaced by the first one that does (counted as invalid).
+    """
+    recommender, model = create_recommender(entrant)
+    fallback = SimpleHeuristicRecommender()
+    game = GameBoard.create_new(grid_length=grid_length, goal_number=goal_number, seed=seed)
+    latencies: List[float] = []
+    fallbacks = invalid = 0
+    start = time.perf_counter()
+    while not game.status().is_terminal and (not max_moves or game.turns < max_moves):
+        grid = game.get_board()
+        decided = time.perf_counter()
+        try:
+            move, _ = recommender.suggest_move(grid, model)
+        except Exception:  # pylint: disable=broad-exception-caught
+            fallbacks += 1
+            move, _ = fallback.suggest_move(grid, "simple")
+        latencies.append(time.perf_counter() - decided)
+
+        turns = game.turns
+        applied: Optional[Direction] = None
+        for direction in _candidates(move):
+            direction.apply_to_board(game)
+            if game.turns != turns:
+                applied = direction
+                break
+        if applied is None or applied.value != move.lower():
+            invalid += 1
+    return GameResult(
+        entrant, seed, game.status() == GameStatus.WIN, game.largest_number(), game.turns,
+        time.perf_counter() - start, latencies, fallbacks, invalid,
+    )
+
+
+def _candidates(move: str) -> Iterator[Direction]:
+    """The suggested direction (if it is one) followed by every direction, in a fixed order."""
+    try:
+        yield Direction(move.lower())
+    except ValueError:
+        pass
+    yield from Direction
+
+
+def _prepare(ollama_host: Optional[str], ollama_models: Optional[List[str]]) -> None:
+    """Initialize a tournament process: settings overrides, lookup tables and remote model discovery."""
+    if ollama_host is not None:
+        SETTINGS.recommendation.ollama.host = ollama_host
+    if ollama_models is not None:
+        SETTINGS.recommendation.ollama.allowed_models = ollama_models
+    ExpectimaxRecommender.preload()
+    registry.refresh()
+
+
+def run_tournament(
+    entrants: List[str],
+    games: int,
+    seed: int = 0,
+    grid_length: int = SETTINGS.game.grid_length,
+    goal_number: int = SETTINGS.game.goal_number,
+    max_moves: int = 0,
+    workers: int = os.cpu_count() or 1,
+) -> TournamentReport:
+    """
+    Play games `seed` ... `seed + games - 1` with every entrant.
+
+    Each (entrant, game) pair is one task of a process pool with at most two
+    tasks per worker in flight. Workers discover remote models with the
+    settings of this process (including a fake Ollama server's host).
+
+    Args:
+        entrants: ``provider/model`` recommenders, optionally ``heuristic/expectimax@<depth>``.
+        games: Games played by each entrant.
+        seed: Seed of the first game.
+        grid_length: Width and height of the boards.
+        goal_number: Tile that wins a game.
+        max_moves: Cut games short after this many moves (0 plays out).
+        workers: Worker processes; 0 plays in this process.
+
+    Returns:
+        TournamentReport: The per-entrant statistics and head-to-head record.
+
+    Raises:
+        ValueError: If an entrant is malformed or not registered.
+    """
+    ollama = SETTINGS.recommendation.ollama
+    initargs = (ollama.host, list(ollama.allowed_models))
+    for entrant in entrants:
+        parse_entrant(entrant)
+    report = TournamentReport(entrants, games, grid_length, goal_number)
+    tasks = [(entrant, seed + index, grid_length, goal_number, max_moves)
+             for index in range(games) for entrant in entrants]
+    start = time.perf_counter()
+    if workers <= 0:
+        _prepare(*initargs)
+        for task in tasks:
+            report.add(play_game(*task))
+    else:
+        context = multiprocessing.get_context("spawn")
+        in_flight: Deque[Future] = deque()
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=_prepare, initargs=initargs
+        ) as executor:
+            try:
+                for task in tasks:
+                    if len(in_flight) >= 2 * workers:
+                        report.add(in_flight.popleft().result())
+                    in_flight.append(executor.submit(play_game, *task))
+                while in_flight:
+                    report.add(in_flight.popleft().result())
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main() -> None:
+    """Run the tournament from the command line."""
+    parser = argparse.ArgumentParser(description="Play recommenders against each other on the same seeded games.")
+    parser.add_argument("entrants", nargs="*",
+                        help="provider/model recommenders (heuristic/expectimax@<depth> for other budgets); "
+                             "defaults to every registered one that can play the grid.")
+    parser.add_argument("--games", type=int, default=50, help="Games per entrant.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game.")
+    parser.add_argument("--grid-length", type=int, default=SETTINGS.game.grid_length)
+    parser.add_argument("--goal", type=int, default=SETTINGS.game.goal_number, help="Tile that wins a game.")
+    parser.add_argument("--max-moves", type=int, default=0, help="Cut games short after this many moves (0 plays out).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (0 plays in this process).")
+    parser.add_argument("--summary", default=None, help="Write the report to this JSON file.")
+    add_fake_ollama_arguments(parser, "Start a fake Ollama server for the ollama/... entrants.")
+    args = parser.parse_args()
+
+    fake = None
+    if args.fake_ollama:
+        models = [entrant.partition("/")[2] for entrant in args.entrants if entrant.startswith("ollama/")]
+        fake = start_fake_ollama(args, models or None)
+        SETTINGS.recommendation.ollama.allowed_models = models or fake.config.models
+
+    try:
+        registry.refresh()
+        entrants = args.entrants or default_entrants(args.grid_length)
+        report = run_tournament(
+            entrants, args.games, args.seed, args.grid_length, args.goal, args.max_moves, args.workers
+        )
+    finally:
+        if fake is not None:
+            fake.stop()
+
+    print(report.format())
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as file:
+            json.dump(report.to_dict(), file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Validate submitted game histories in parallel, streaming NDJSON files or journal segments.
+
+Each NDJSON line is one game: ``{"id": ..., "seed": 123, "moves": "lurd..."}`` where
+``moves`` is a string of direction initials or a list of direction names, with optional
+``grid_length`` and claimed ``turns``, ``largest_number`` and ``status``. Journal
+segments (``.bin`` files or a journal directory) are read as written by the server.
+
+Usage:
+    python -m src.tools.validate games.ndjson --failures failures.ndjson --summary summary.json
+    python -m src.tools.validate journal/ --workers 8
+"""
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from src.config.settings import SETTINGS
+from src.game.bitboard import row_tables
+from src.game.journal import MoveLog, read_segment, segment_paths
+from src.game.validation import ValidationResult, Violation, validate_game
+
+NDJSON = "ndjson"
+JOURNAL = "journal"
+
+Chunk = Tuple[str, List[tuple]]
+
+
+class ValidationSummary:
+    """Totals of a validation run; summaries of chunks are merged into one."""
+
+    def __init__(self):
+        self.games = 0
+        self.valid = 0
+        self.moves = 0
+        self.violations: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.largest_numbers: Counter = Counter()
+        self.elapsed = 0.0
+
+    def add(self, result: ValidationResult) -> None:
+        self.games += 1
+        self.moves += result.turns
+        if result.valid:
+            self.valid += 1
+            self.statuses[str(result.status)] += 1
+            self.largest_numbers[result.largest_number] += 1
+        else:
+            self.violations[result.violation.value] += 1
+
+    def merge(self, other: "ValidationSummary") -> None:
+        self.games += other.games
+        self.valid += other.valid
+        self.moves += other.moves
+        self.violations.update(other.violations)
+        self.statuses.update(other.statuses)
+        self.largest_numbers.update(other.largest_numbers)
+
+    @property
+    def invalid(self) -> int:
+        return self.games - self.valid
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "games": self.games,
+            "valid": self.valid,
+            "invalid": self.invalid,
+            "moves": self.moves,
+            "violations": dict(self.violations),
+            "statuses": dict(self.statuses),
+            "largest_numbers": {str(k): v for k, v in sorted(self.largest_numbers.items())},
+            "elapsed_seconds": round(self.elapsed, 3),
+        }
+
+    def format(self) -> str:
+        rate = self.moves / self.elapsed if self.elapsed else 0.0
+        lines = [
+            f"games:    {self.games} ({self.valid} valid, {self.invalid} invalid)",
+            f"moves:    {self.moves} in {self.elapsed:.1f}s ({rate:,.0f} moves/s)",
+        ]
+        for violation, count in self.violations.most_common():
+            lines.append(f"  {violation:<16} {count}")
+        return "\n".join(lines)
+
+
+def iter_chunks(paths: Iterable[str], chunk_size: int) -> Iterator[Chunk]:
+    """
+    Stream the games of the input files in chunks of at most `chunk_size`.
+
+    NDJSON lines are passed on undecoded and journal records packed, so the
+    reading process does little more than I/O and the workers do the parsing.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for segment in segment_paths(path):
+                yield from _journal_chunks(segment, chunk_size)
+        elif path.endswith(".bin"):
+            yield from _journal_chunks(path, chunk_size)
+        else:
+            yield from _ndjson_chunks(path, chunk_size)
+
+
+def _ndjson_chunks(path: str, chunk_size: int) -> Iterator[Chunk]:
+    opener = gzip.open if path.endswith(".gz") else open
+    items: List[tuple] = []
+    with opener(path, "rb") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            items.append((f"{path}:{line_number}", line))
+            if len(items) == chunk_size:
+                yield NDJSON, items
+                items = []
+    if items:
+        yield NDJSON, items
+
+
+def _journal_chunks(path: str, chunk_size: int) -> Iterator[Chunk]:
+    items: List[tuple] = []
+    for index, record in enumerate(read_segment(path)):
+        moves = record.moves
+        items.append((f"{path}:{index}", record.seed, record.grid_length, moves.count, bytes(moves.data)))
+        if len(items) == chunk_size:
+            yield JOURNAL, items
+            items = []
+    if items:
+        yield JOURNAL, items
+
+
+def validate_chunk(chunk: Chunk) -> Tuple[ValidationSummary, List[Dict[str, Any]]]:
+    """Validate a chunk of games, returning its summary and the rejected games."""
+    kind, items = chunk
+    summary = ValidationSummary()
+    failures: List[Dict[str, Any]] = []
+    for item in items:
+        if kind == JOURNAL:
+            game_id, seed, grid_length, count, data = item
+            result = validate_game(seed, MoveLog(data, count), grid_length, game_id)
+        else:
+            result = _validate_line(*item)
+        summary.add(result)
+        if not result.valid:
+            failures.append(result.to_dict())
+    return summary, failures
+
+
+def _validate_line(default_id: str, line: bytes) -> ValidationResult:
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        return ValidationResult(default_id, violation=Violation.MALFORMED, detail=f"invalid JSON: {e}")
+    if not isinstance(record, dict) or "seed" not in record or not isinstance(record.get("moves"), (str, list)):
+        return ValidationResult(default_id, violation=Violation.MALFORMED, detail="expected an object with seed and moves")
+    grid_length = record.get("grid_length", SETTINGS.game.grid_length)
+    if not isinstance(grid_length, int) or not 2 <= grid_length <= 16:
+        return ValidationResult(default_id, violation=Violation.MALFORMED, detail="invalid grid_length")
+    return validate_game(
+        record["seed"],
+        record["moves"],
+        grid_length,
+        game_id=record.get("id", default_id),
+        claims=record,
+    )
+
+
+def run_validation(
+    paths: Iterable[str],
+    workers: int = os.cpu_count() or 1,
+    chunk_size: int = 512,
+    failures: Optional[TextIO] = None,
+) -> ValidationSummary:
+    """
+    Validate every game of the input files.
+
+    Chunks are validated in a process pool with at most two chunks per
+    worker in flight, so memory stays constant however large the input is.
+    Rejected games are written to `failures` as NDJSON, in input order.
+
+    Args:
+        paths: NDJSON files (optionally gzipped), journal segments or journal directories.
+        workers: Worker processes; 0 validates in this process.
+        chunk_size: Games sent to a worker at a time.
+        failures: Where to write the rejected games, if anywhere.
+
+    Returns:
+        ValidationSummary: Totals of the run.
+    """
+    start = time.perf_counter()
+    summary = ValidationSummary()
+
+    def collect(result: Tuple[ValidationSummary, List[Dict[str, Any]]]) -> None:
+        chunk_summary, chunk_failures = result
+        summary.merge(chunk_summary)
+        if failures is not None:
+            for failure in chunk_failures:
+                failures.write(json.dumps(failure) + "\n")
+
+    if workers <= 0:
+        for chunk in iter_chunks(paths, chunk_size):
+            collect(validate_chunk(chunk))
+    else:
+        context = multiprocessing.get_context("spawn")
+        in_flight: Deque[Future] = deque()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=row_tables) as executor:
+            for chunk in iter_chunks(paths, chunk_size):
+                if len(in_flight) >= 2 * workers:
+                    collect(in_flight.popleft().result())
+                in_flight.append(executor.submit(validate_chunk, chunk))
+            while in_flight:
+                collect(in_flight.popleft().result())
+
+    summary.elapsed = time.perf_counter() - start
+    return summary
+
+
+def main() -> None:
+    """Run the validator from the command line."""
+    parser = argparse.ArgumentParser(description="Validate game histories against the game rules.")
+    parser.add_argument("paths", nargs="+", help="NDJSON files, journal segments or journal directories.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (0 validates in this process).")
+    parser.add_argument("--chunk-size", type=int, default=512, help="Games per worker task.")
+    parser.add_argument("--failures", default=None, help="Write rejected games to this NDJSON file.")
+    parser.add_argument("--summary", default=None, help="Write the summary to this JSON file.")
+    args = parser.parse_args()
+
+    failures = open(args.failures, "w", encoding="utf-8") if args.failures else None  # pylint: disable=consider-using-with
+    try:
+        summary = run_validation(args.paths, args.workers, args.chunk_size, failures)
+    finally:
+        if failures is not None:
+            failures.close()
+
+    print(summary.format())
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as file:
+            json.dump(summary.to_dict(), file, indent=2)
+    sys.exit(1 if summary.invalid else 0)
+
+
+if __name__ == "__main__":
+    main()
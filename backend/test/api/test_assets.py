@@ -0,0 +1,104 @@
+import os
+import tempfile
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.api.assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    StaticBundle,
+    etag_matches,
+)
+from src.app.app import app
+
+INDEX = b"<!doctype html><html><body>" + b"<div>2048</div>" * 40 + b"</body></html>"
+SCRIPT = b"console.log('2048');\n" * 50
+
+
+@pytest.fixture
+def bundle():
+    """Install a small in-memory bundle on the app for the duration of a test."""
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, "assets"))
+        with open(os.path.join(directory, "index.html"), "wb") as file:
+            file.write(INDEX)
+        with open(os.path.join(directory, "assets", "index-BfX3k9aZ.js"), "wb") as file:
+            file.write(SCRIPT)
+        loaded = StaticBundle.load(directory)
+
+    previous = app.state.static_bundle
+    app.state.static_bundle = loaded
+    yield loaded
+    app.state.static_bundle = previous
+
+
+def test_bundle_marks_hashed_assets_immutable(bundle):
+    assert bundle.get("assets/index-BfX3k9aZ.js").cache_control == IMMUTABLE_CACHE_CONTROL
+    assert bundle.get("index.html").cache_control == REVALIDATE_CACHE_CONTROL
+    assert "gzip" in bundle.get("index.html").encodings
+
+
+def test_precompressed_variants_are_used():
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "app.js"), "wb") as file:
+            file.write(SCRIPT)
+        with open(os.path.join(directory, "app.js.gz"), "wb") as file:
+            file.write(b"built-gzip")
+        loaded = StaticBundle.load(directory)
+
+    assert len(loaded) == 1
+    assert loaded.get("app.js").select("gzip")[:2] == ("gzip", b"built-gzip")
+
+
+def test_select_prefers_accepted_encoding(bundle):
+    asset = bundle.get("index.html")
+    assert asset.select("gzip, deflate")[0] == "gzip"
+    assert asset.select("gzip;q=0")[0] == "identity"
+    assert asset.select(None)[0] == "identity"
+
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+@pytest.mark.asyncio
+async def test_index_served_from_memory(bundle):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/", headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.content == INDEX
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_asset_gzip_and_not_modified(bundle):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/assets/index-BfX3k9aZ.js", headers={"Accept-Encoding": "gzip"})
+        etag = response.headers["etag"]
+        cached = await ac.get(
+            "/assets/index-BfX3k9aZ.js",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.content == SCRIPT  # decoded by httpx
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+@pytest.mark.asyncio
+async def test_missing_asset_is_not_found(bundle):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/assets/missing.js")
+
+    assert response.status_code == 404
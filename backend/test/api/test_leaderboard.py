@@ -0,0 +1,108 @@
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.app.app import app
+from src.game.board import GameBoard
+from src.game.session import sessions
+from src.game.state_token import state_tokens
+from src.leaderboard.leaderboard import Leaderboard
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_disabled():
+    """Test that the leaderboard endpoints do not exist while it is disabled."""
+    with patch("src.leaderboard.leaderboard.leaderboard", None):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/leaderboard")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_winning_move_is_recorded():
+    """Test that a move ending the game lands on the leaderboard and in the statistics."""
+    board = Leaderboard(":memory:", top_k=10, bucket_seconds=3600, retention_days=1)
+    grid = [
+        [1024, 1024, None, None],
+        [None, None, None, None],
+        [None, None, None, None],
+        [None, None, None, None],
+    ]
+    token = state_tokens.issue(GameBoard(grid, goal=2048, prop_numbers=[2, 4], turns=500, seed=7))
+    with patch("src.leaderboard.leaderboard.leaderboard", board):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            moved = await ac.post("/api/move", json={
+                "state_token": token, "direction": "left", "recommender": "heuristic/simple",
+            })
+            top = await ac.get("/api/leaderboard", params={"board": "today"})
+            stats = await ac.get("/api/leaderboard/stats", params={"hours": 1})
+    board.close()
+
+    assert moved.json()["status"] == "WIN"
+    (entry,) = top.json()["entries"]
+    assert entry["largest_number"] == 2048
+    assert entry["turns"] == 501
+    assert entry["recommender"] == "heuristic/simple"
+    assert entry["source"] == "token"
+    (recommender,) = stats.json()["recommenders"]
+    assert recommender["wins"] == 1
+    assert recommender["max_tiles"] == {"2048": 1}
+
+
+@pytest.mark.asyncio
+async def test_client_supplied_grid_is_not_recorded():
+    """Test that a game rebuilt from a bare grid never reaches the leaderboard."""
+    board = Leaderboard(":memory:", top_k=10, bucket_seconds=3600, retention_days=1)
+    grid = [[1024, 1024, None, None]] + [[None] * 4 for _ in range(3)]
+    with patch("src.leaderboard.leaderboard.leaderboard", board):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            moved = await ac.post("/api/move", json={"grid": grid, "direction": "left", "turns": 5})
+            top = await ac.get("/api/leaderboard")
+            stats = await ac.get("/api/leaderboard/stats", params={"hours": 1})
+    board.close()
+
+    assert moved.json()["status"] == "WIN"
+    assert top.json()["entries"] == []
+    assert stats.json()["recommenders"] == []
+
+
+@pytest.mark.asyncio
+async def test_replayed_token_is_recorded_once():
+    """Test that replaying the token before the final move does not record the game again."""
+    board = Leaderboard(":memory:", top_k=10, bucket_seconds=3600, retention_days=1)
+    grid = [[1024, 1024, None, None]] + [[None] * 4 for _ in range(3)]
+    token = state_tokens.issue(GameBoard(grid, goal=2048, prop_numbers=[2, 4], turns=500, seed=8))
+    with patch("src.leaderboard.leaderboard.leaderboard", board):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            for _ in range(3):
+                moved = await ac.post("/api/move", json={"state_token": token, "direction": "left"})
+                assert moved.json()["status"] == "WIN"
+            top = await ac.get("/api/leaderboard")
+    board.close()
+
+    assert len(top.json()["entries"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_session_game_is_recorded_once_and_not_after_undo():
+    """Test that a finished session cannot be undone, and undo-assisted sessions are not recorded."""
+    board = Leaderboard(":memory:", top_k=10, bucket_seconds=3600, retention_days=1)
+    grid = [[1024, 1024, None, None], [2, None, None, None]] + [[None] * 4 for _ in range(2)]
+    finished = sessions.create(GameBoard(grid, goal=2048, prop_numbers=[2, 4], seed=9))
+    assisted = sessions.create(GameBoard(grid, goal=2048, prop_numbers=[2, 4], seed=10))
+    app.state.limiter._storage.reset()
+    with patch("src.leaderboard.leaderboard.leaderboard", board):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            won = await ac.post("/api/move", json={"session_id": finished, "direction": "left"})
+            assert won.json()["status"] == "WIN"
+            assert (await ac.post("/api/undo", json={"session_id": finished})).status_code == 409
+
+            await ac.post("/api/move", json={"session_id": assisted, "direction": "down"})
+            assert (await ac.post("/api/undo", json={"session_id": assisted})).status_code == 200
+            won = await ac.post("/api/move", json={"session_id": assisted, "direction": "left"})
+            assert won.json()["status"] == "WIN"
+            top = await ac.get("/api/leaderboard")
+    board.close()
+
+    assert [entry["source"] for entry in top.json()["entries"]] == ["session"]
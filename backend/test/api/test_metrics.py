@@ -0,0 +1,27 @@
+import os
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.app.app import app
+from src.metrics.metrics import http_requests
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_requests():
+    """Test that tracked routes are counted and exposed in Prometheus format."""
+    before = http_requests.value("/api/new", "POST", "200")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.post("/api/new")
+        await ac.get("/api/models")
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert http_requests.value("/api/new", "POST", "200") == before + 1
+    body = response.text
+    worker = f'worker="{os.getpid()}"'
+    assert f'http_request_duration_seconds_bucket{{route="/api/new",le="+Inf",{worker}}}' in body
+    assert 'cache_lookups_total{cache="models_render",result=' in body
+    assert "# TYPE event_loop_lag_seconds histogram" in body
+    assert f"game_sessions{{{worker}}} " in body
@@ -1,7 +1,13 @@
+from unittest.mock import MagicMock, patch
+
 import pytest
 from httpx import AsyncClient, ASGITransport
 
 from src.app.app import app
+from src.config.settings import SETTINGS
+from src.game.board import GameBoard
+from src.game.state_token import state_tokens
+from src.recommendation.speculation import RecommendationCache, cache_key
 
 
 @pytest.mark.asyncio
@@ -58,6 +64,22 @@ async def test_move_invalid_direction():
     assert "Invalid direction" in response.json()["detail"]
 
 
+@pytest.mark.asyncio
+async def test_move_beyond_largest_tile_is_rejected():
+    """Test that merging two 32768 tiles is refused instead of failing to encode the result."""
+    app.state.limiter._storage.reset()
+    grid = [[32768, 32768, None, None]] + [[None] * 4 for _ in range(3)]
+    token = state_tokens.issue(GameBoard(grid, goal=2048, prop_numbers=[2, 4], turns=900, seed=5))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        merged = await ac.post("/api/move", json={"state_token": token, "direction": "left"})
+        moved = await ac.post("/api/move", json={"state_token": token, "direction": "down", "grid_format": "hex"})
+
+    assert merged.status_code == 409
+    assert "32768" in merged.json()["detail"]
+    assert moved.status_code == 200
+    assert moved.json()["turns"] == 901
+
+
 @pytest.mark.asyncio
 async def test_recommend():
     """Test the /recommend endpoint."""
@@ -73,3 +95,218 @@ async def test_recommend():
     assert "suggested_move" in data
     assert "rationale" in data
     assert "predicted_grid" in data
+
+
+@pytest.mark.asyncio
+async def test_models_etag():
+    """Test the /models endpoint serves a cached body that can be revalidated."""
+    app.state.limiter._storage.reset()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/api/models")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert any(m["provider"] == "heuristic" for m in response.json()["models"])
+
+        cached = await ac.get("/api/models", headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+
+@pytest.mark.asyncio
+async def test_session_moves():
+    """Test that a session game only needs the direction for each move."""
+    app.state.limiter._storage.reset()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        new = await ac.post("/api/new", params={"session": "true"})
+        session_id = new.headers["x-session-id"]
+
+        turns = 0
+        for direction in ["left", "up", "right", "down"]:
+            response = await ac.post(
+                "/api/move", json={"session_id": session_id, "direction": direction}
+            )
+            assert response.status_code == 200
+            turns = response.json()["turns"]
+
+    assert turns > 0
+
+
+@pytest.mark.asyncio
+async def test_sessions_can_be_disabled():
+    """Test that session games are refused when sessions are disabled."""
+    app.state.limiter._storage.reset()
+    with patch.object(SETTINGS.session, "enabled", False):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            refused = await ac.post("/api/new", params={"session": "true"})
+            stateless = await ac.post("/api/new")
+
+    assert refused.status_code == 400
+    assert "x-state-token" in stateless.headers
+
+
+@pytest.mark.asyncio
+async def test_state_token_moves():
+    """Test that stateless games chain signed state tokens and reject forged ones."""
+    app.state.limiter._storage.reset()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        new = await ac.post("/api/new")
+        token = new.headers["x-state-token"]
+
+        for direction in ["left", "up", "right", "down"]:
+            response = await ac.post("/api/move", json={"state_token": token, "direction": direction})
+            assert response.status_code == 200
+            token = response.json()["state_token"]
+        assert response.json()["turns"] > 0
+
+        forged_token = token[:10] + ("B" if token[10] == "A" else "A") + token[11:]
+        forged = await ac.post("/api/move", json={"state_token": forged_token, "direction": "up"})
+        assert forged.status_code == 400
+
+        with patch("src.api.routes.SETTINGS.state_token.required", True):
+            unsigned = await ac.post("/api/move", json={
+                "grid": response.json()["grid"], "turns": 0, "direction": "up",
+            })
+        assert unsigned.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_session_undo_redo():
+    """Test that session moves can be undone and redone with the same spawn."""
+    app.state.limiter._storage.reset()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        new = await ac.post("/api/new", params={"session": "true"})
+        session_id = new.headers["x-session-id"]
+        assert (await ac.post("/api/undo", json={"session_id": session_id})).status_code == 409
+
+        played = None
+        for direction in ["left", "up", "right", "down"]:
+            response = await ac.post("/api/move", json={"session_id": session_id, "direction": direction})
+            if response.json()["turns"] > 0:
+                played = response.json()
+                break
+        assert played is not None
+
+        undone = await ac.post("/api/undo", json={"session_id": session_id})
+        assert undone.json()["grid"] == new.json()
+        redone = await ac.post("/api/redo", json={"session_id": session_id})
+        assert redone.json() == played
+        assert (await ac.post("/api/redo", json={"session_id": session_id})).status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_move_unknown_session():
+    """Test that an unknown session id is rejected."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/move", json={"session_id": "missing", "direction": "up"})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_move_requires_grid_or_session():
+    """Test that a stateless move without a grid is rejected."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/move", json={"direction": "up"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_move_compact_grid_formats():
+    """Test that compact grids are accepted and echoed in the same format."""
+    app.state.limiter._storage.reset()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        hex_response = await ac.post(
+            "/api/move",
+            json={"grid": "1000000000000000", "grid_format": "hex",
+                  "direction": "right", "turns": 0}
+        )
+        exponents_response = await ac.post(
+            "/api/move",
+            json={"grid": [1] + [0] * 15, "grid_format": "exponents",
+                  "direction": "right", "turns": 0}
+        )
+        huge_response = await ac.post(
+            "/api/move",
+            json={"grid": [200_000_000] + [0] * 15, "grid_format": "exponents",
+                  "direction": "right", "turns": 0}
+        )
+        base64_response = await ac.post(
+            "/api/recommend",
+            json={"grid": "EQ", "grid_format": "base64",
+                  "provider": "heuristic", "model": "simple"}
+        )
+
+    assert hex_response.status_code == 200
+    assert isinstance(hex_response.json()["grid"], str)
+    assert hex_response.json()["grid"][3] == "1"
+
+    assert exponents_response.status_code == 200
+    assert len(exponents_response.json()["grid"]) == 16
+    assert huge_response.status_code == 422
+
+    # "EQ" is a truncated 4x4 board
+    assert base64_response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_recommend_base64_grid():
+    """Test a recommendation for a base64 packed grid."""
+    app.state.limiter._storage.reset()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/recommend",
+            json={"grid": "EQAAAAAAAAA", "grid_format": "base64",
+                  "provider": "heuristic", "model": "simple"}
+        )
+
+    assert response.status_code == 200
+    assert isinstance(response.json()["predicted_grid"], str)
+
+
+@pytest.mark.asyncio
+async def test_frontend_move_speculates_followed_recommender():
+    """Test that a bare-grid move naming the followed recommender, as the frontend sends it, speculates."""
+    app.state.limiter._storage.reset()
+    speculator = MagicMock()
+    grid = [[2, None, None, None], [None] * 4, [None] * 4, [None] * 4]
+    with patch("src.recommendation.speculation.speculator", speculator):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            following = await ac.post("/api/move", json={
+                "grid": grid, "direction": "right", "turns": 0, "recommender": "heuristic/simple",
+            })
+            await ac.post("/api/move", json={"grid": grid, "direction": "right", "turns": 0})
+
+    assert following.status_code == 200
+    speculator.speculate.assert_called_once_with("heuristic", "simple", following.json()["grid"])
+
+
+@pytest.mark.asyncio
+async def test_move_speculates_next_recommendation():
+    """Test that a move by a recommender's follower precomputes its next recommendation."""
+    app.state.limiter._storage.reset()
+    cache = RecommendationCache(max_entries=16)
+    speculator = MagicMock()
+    with patch("src.recommendation.speculation.speculator", speculator), \
+            patch("src.recommendation.service.recommendation_cache", cache), \
+            patch("src.recommendation.service.offload_pool.handles", return_value=True):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            token = (await ac.post("/api/new")).headers["x-state-token"]
+            for direction in ["left", "up", "right", "down"]:
+                response = await ac.post("/api/move", json={
+                    "state_token": token, "direction": direction, "recommender": "heuristic/expectimax",
+                })
+                if response.json()["turns"] > 0:
+                    break
+            grid = response.json()["grid"]
+            speculator.speculate.assert_called_once_with("heuristic", "expectimax", grid)
+
+            cache.put(cache_key("heuristic", "expectimax", grid), ("up", "Precomputed."))
+            recommendation = await ac.post("/api/recommend", json={
+                "grid": grid, "provider": "heuristic", "model": "expectimax",
+            })
+
+    assert recommendation.status_code == 200
+    assert recommendation.json()["rationale"] == "Precomputed."
@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import websocket
+from src.app.app import app
+from src.game.board import GameBoard
+from src.config.settings import SETTINGS
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    websocket._rate_storage.reset()
+
+
+def test_play_over_websocket():
+    """Test playing moves and requesting a recommendation on one connection."""
+    with client.websocket_connect("/ws/game") as ws:
+        ws.send_json({"type": "new"})
+        board = ws.receive_json()
+        assert board["type"] == "board"
+        assert len(board["grid"]) == 4
+        assert board["turns"] == 0
+
+        ws.send_json({"type": "recommend", "id": 7, "provider": "heuristic", "model": "simple"})
+        recommendation = ws.receive_json()
+        assert recommendation["type"] == "recommendation"
+        assert recommendation["id"] == 7
+        assert recommendation["suggested_move"] in ["up", "down", "left", "right"]
+
+        ws.send_json({"type": "move", "direction": recommendation["suggested_move"]})
+        board = ws.receive_json()
+        assert board["type"] == "board"
+        assert board["turns"] == 1
+
+
+def test_recommendation_on_finished_game_with_speculation():
+    """Test that a recommendation request on a finished game always gets a reply."""
+    won = GameBoard([[2048, 2, None, None]] + [[None] * 4 for _ in range(3)], goal=2048, prop_numbers=[2, 4], seed=1)
+    lost = GameBoard([[2, 4], [4, 2]], goal=2048, prop_numbers=[2, 4], seed=1)
+    with patch("src.recommendation.speculation.speculator", MagicMock()):
+        for game, status in ((won, "WIN"), (lost, "LOSE")):
+            with patch("src.api.websocket.GameBoard.create_new", return_value=game):
+                with client.websocket_connect("/ws/game") as ws:
+                    ws.send_json({"type": "new"})
+                    assert ws.receive_json()["status"] == status
+                    ws.send_json({"type": "recommend", "id": 3, "provider": "heuristic", "model": "expectimax"})
+                    recommendation = ws.receive_json()
+            assert recommendation["type"] == "error"
+            assert recommendation["id"] == 3
+            assert "game is over" in recommendation["detail"]
+
+
+def test_websocket_errors_keep_connection_open():
+    """Test that invalid messages get error replies without closing the socket."""
+    with client.websocket_connect("/ws/game") as ws:
+        ws.send_json({"type": "move", "direction": "up"})
+        assert "No game in progress" in ws.receive_json()["detail"]
+
+        ws.send_json({"type": "new"})
+        ws.receive_json()
+        ws.send_json({"type": "move", "direction": "sideways", "id": "m1"})
+        error = ws.receive_json()
+        assert error["type"] == "error"
+        assert error["id"] == "m1"
+
+        ws.send_text("not json")
+        assert ws.receive_json()["type"] == "error"
+
+        ws.send_bytes(b"\x00\x01")
+        assert ws.receive_json()["type"] == "error"
+
+        ws.send_json({"type": "teleport"})
+        assert "Unknown message type" in ws.receive_json()["detail"]
+
+
+def test_websocket_rate_limit_per_client():
+    """Test that rate limits follow the client address, so reconnecting does not reset them."""
+    limit = int(SETTINGS.rate_limit.new_game.split("/")[0])
+    with client.websocket_connect("/ws/game") as ws:
+        for _ in range(limit):
+            ws.send_json({"type": "new"})
+            assert ws.receive_json()["type"] == "board"
+        ws.send_json({"type": "new"})
+        assert "Rate limit exceeded" in ws.receive_json()["detail"]
+
+    with client.websocket_connect("/ws/game") as ws:
+        ws.send_json({"type": "new"})
+        assert "Rate limit exceeded" in ws.receive_json()["detail"]
@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import patch
+
+from src.app.server import build_config, resolve_workers
+from src.config.settings import AppSettings
+
+
+class TestProductionServer(unittest.TestCase):
+    def test_build_config(self):
+        """Test that tuning settings are passed to uvicorn."""
+        settings = AppSettings(
+            host="0.0.0.0",
+            port=9000,
+            loop="asyncio",
+            http="h11",
+            backlog=512,
+            timeout_keep_alive=15,
+            timeout_graceful_shutdown=10,
+        )
+        config = build_config(settings)
+
+        self.assertEqual(config.host, "0.0.0.0")
+        self.assertEqual(config.port, 9000)
+        self.assertEqual(config.loop, "asyncio")
+        self.assertEqual(config.http, "h11")
+        self.assertEqual(config.backlog, 512)
+        self.assertEqual(config.timeout_keep_alive, 15)
+        self.assertEqual(config.timeout_graceful_shutdown, 10)
+
+    @patch("src.app.server.os.cpu_count", return_value=6)
+    def test_resolve_workers(self, _):
+        """Test that zero workers means one per CPU."""
+        self.assertEqual(resolve_workers(AppSettings(workers=0)), 6)
+        self.assertEqual(resolve_workers(AppSettings(workers=3)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
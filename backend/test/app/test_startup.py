@@ -0,0 +1,26 @@
+import unittest
+
+from src.app.startup import StartupTimer
+
+
+class TestStartupTimer(unittest.TestCase):
+    def test_phases_and_report(self):
+        now = [10.0]
+        timer = StartupTimer(clock=lambda: now[0])
+        now[0] = 10.4
+        timer.mark("import")
+        with timer.phase("static"):
+            now[0] = 10.45
+        now[0] = 10.5
+
+        self.assertAlmostEqual(timer.phases["import"], 0.4)
+        self.assertAlmostEqual(timer.phases["static"], 0.05)
+        self.assertEqual(
+            timer.report(),
+            "Startup: ready in 500ms (import 400ms, static 50ms, discovery in background)",
+        )
+        self.assertIn("discovery 120ms", timer.report(discovery_seconds=0.12))
+
+
+if __name__ == '__main__':
+    unittest.main()
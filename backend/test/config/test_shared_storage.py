@@ -0,0 +1,98 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+
+from limits import RateLimitItemPerMinute
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+from src.config.shared_storage import SharedMemoryStorage
+
+
+def _hit_many(uri: str, key: str, count: int) -> None:
+    storage = SharedMemoryStorage(uri)
+    for _ in range(count):
+        storage.incr(key, 60)
+
+
+class TestSharedMemoryStorage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.uri = f"shm://{os.path.join(self.directory.name, 'limits')}?slots=64"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_scheme_is_registered(self):
+        self.assertIsInstance(storage_from_string(self.uri), SharedMemoryStorage)
+
+    def test_incr_get_clear(self):
+        storage = SharedMemoryStorage(self.uri)
+        self.assertEqual(storage.get("a"), 0)
+        self.assertEqual(storage.incr("a", 60), 1)
+        self.assertEqual(storage.incr("a", 60, amount=2), 3)
+        self.assertEqual(storage.get("a"), 3)
+        self.assertGreater(storage.get_expiry("a"), time.time())
+
+        storage.clear("a")
+        self.assertEqual(storage.get("a"), 0)
+        self.assertEqual(storage.incr("a", 60), 1)
+
+    def test_expired_window_restarts(self):
+        storage = SharedMemoryStorage(self.uri)
+        storage.incr("a", 0)
+        self.assertEqual(storage.get("a"), 0)
+        self.assertEqual(storage.incr("a", 60), 1)
+
+    def test_counts_are_shared_between_instances(self):
+        first = SharedMemoryStorage(self.uri)
+        second = SharedMemoryStorage(self.uri)
+        first.incr("a", 60)
+        second.incr("a", 60)
+        self.assertEqual(first.get("a"), 2)
+
+    def test_counts_are_shared_between_processes(self):
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_hit_many, args=(self.uri, "a", 200)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(SharedMemoryStorage(self.uri).get("a"), 800)
+
+    def test_memory_is_bounded(self):
+        storage = SharedMemoryStorage(self.uri)
+        for index in range(1000):
+            storage.incr(f"key-{index}", 60)
+        self.assertEqual(storage.get("key-999"), 1)
+        self.assertEqual(os.path.getsize(self.uri[len("shm://"):].split("?")[0]), 16 + 64 * 24)
+
+    def test_refuses_a_table_of_another_size(self):
+        storage = SharedMemoryStorage(self.uri)
+        storage.incr("a", 60)
+        with self.assertRaises(ValueError):
+            SharedMemoryStorage(self.uri.replace("slots=64", "slots=128"))
+        self.assertEqual(storage.incr("a", 60), 2)
+
+    def test_refuses_a_foreign_file(self):
+        path = os.path.join(self.directory.name, "other")
+        with open(path, "wb") as file:
+            file.write(b"not a rate limit table")
+        with self.assertRaises(ValueError):
+            SharedMemoryStorage(f"shm://{path}")
+        with open(path, "rb") as file:
+            self.assertEqual(file.read(), b"not a rate limit table")
+
+    def test_limiter_enforces_limit(self):
+        limiter = FixedWindowRateLimiter(SharedMemoryStorage(self.uri))
+        item = RateLimitItemPerMinute(2)
+        self.assertTrue(limiter.hit(item, "127.0.0.1"))
+        self.assertTrue(limiter.hit(item, "127.0.0.1"))
+        self.assertFalse(limiter.hit(item, "127.0.0.1"))
+        self.assertTrue(limiter.hit(item, "127.0.0.2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
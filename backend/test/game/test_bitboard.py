@@ -0,0 +1,49 @@
+import random
+import unittest
+from copy import deepcopy
+
+from src.game.bitboard import DIRECTIONS, can_move, empty_cells, max_exponent, move, transpose
+from src.game.board import GameBoard
+from src.game.codec import pack_board, unpack_board
+
+
+class TestBitboard(unittest.TestCase):
+    def test_moves_match_game_board(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            grid = [
+                [rng.choice([None, None, 2, 4, 8, 16]) for _ in range(4)]
+                for _ in range(4)
+            ]
+            for direction in DIRECTIONS:
+                game = GameBoard(board=deepcopy(grid), goal=1 << 20, prop_numbers=[])
+                if not game.status().is_terminal:
+                    direction.apply_to_board(game)
+                moved, _ = move(pack_board(grid), direction)
+                self.assertEqual(unpack_board(moved, 4), game.get_board())
+
+    def test_merge_score(self):
+        grid = [[2, 2, 4, 4], [None] * 4, [None] * 4, [8, None, 8, None]]
+        moved, gained = move(pack_board(grid), DIRECTIONS[2])  # left
+        self.assertEqual(gained, 4 + 8 + 16)
+        self.assertEqual(unpack_board(moved, 4)[0], [4, 8, None, None])
+
+    def test_transpose_and_empty_cells(self):
+        grid = [[2, None, None, None], [4, None, None, None], [None] * 4, [None] * 4]
+        transposed = unpack_board(transpose(pack_board(grid)), 4)
+        self.assertEqual(transposed[0], [2, 4, None, None])
+        self.assertEqual(len(empty_cells(pack_board(grid))), 14)
+
+    def test_can_move_matches_game_status(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            grid = [[rng.choice([2, 4, 8, 16, 32]) for _ in range(4)] for _ in range(4)]
+            if rng.random() < 0.3:
+                grid[rng.randrange(4)][rng.randrange(4)] = None
+            game = GameBoard(board=grid, goal=1 << 20, prop_numbers=[])
+            self.assertEqual(can_move(pack_board(grid)), not game.status().is_terminal)
+            self.assertEqual(1 << max_exponent(pack_board(grid)), game.largest_number())
+
+
+if __name__ == '__main__':
+    unittest.main()
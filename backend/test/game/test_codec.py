@@ -0,0 +1,81 @@
+import unittest
+
+from src.game.codec import (
+    BoardCodecException,
+    GridFormat,
+    decode_grid,
+    encode_grid,
+    from_exponents,
+    pack_board,
+    to_exponents,
+    unpack_board,
+)
+
+
+class TestBoardCodec(unittest.TestCase):
+    def setUp(self):
+        self.board = [
+            [2, None, None, 4],
+            [None, 8, None, None],
+            [None, None, 2048, None],
+            [32768, None, None, 2],
+        ]
+
+    def test_exponents_round_trip(self):
+        exponents = to_exponents(self.board)
+        self.assertEqual(exponents[:4], [1, 0, 0, 2])
+        self.assertEqual(from_exponents(exponents, 4), self.board)
+
+    def test_pack_round_trip(self):
+        packed = pack_board(self.board)
+        self.assertLess(packed, 1 << 64)
+        self.assertEqual(unpack_board(packed, 4), self.board)
+
+    def test_pack_empty_board(self):
+        empty = [[None] * 3 for _ in range(3)]
+        self.assertEqual(pack_board(empty), 0)
+        self.assertEqual(unpack_board(0, 3), empty)
+
+    def test_rejects_non_power_of_two(self):
+        with self.assertRaises(BoardCodecException):
+            to_exponents([[3, None], [None, None]])
+
+    def test_rejects_tiles_too_large_to_pack(self):
+        with self.assertRaises(BoardCodecException):
+            pack_board([[65536, None], [None, None]])
+
+    def test_rejects_wrong_cell_count(self):
+        with self.assertRaises(BoardCodecException):
+            from_exponents([1, 0, 0], 2)
+
+    def test_rejects_out_of_range_exponents(self):
+        for exponent in (-1, 16, 200_000_000):
+            with self.assertRaises(BoardCodecException):
+                from_exponents([exponent, 0, 0, 0], 2)
+
+    def test_wire_formats_round_trip(self):
+        for grid_format in GridFormat:
+            encoded = encode_grid(self.board, grid_format)
+            self.assertEqual(decode_grid(encoded, grid_format, grid_length=4), self.board)
+
+    def test_compact_wire_formats(self):
+        self.assertEqual(encode_grid(self.board, GridFormat.HEX), "1002030000b0f001")
+        self.assertEqual(len(encode_grid(self.board, GridFormat.BASE64)), 11)
+        self.assertEqual(
+            encode_grid(self.board, GridFormat.EXPONENTS),
+            [1, 0, 0, 2, 0, 3, 0, 0, 0, 0, 11, 0, 15, 0, 0, 1],
+        )
+
+    def test_decode_rejects_mismatched_formats(self):
+        with self.assertRaises(BoardCodecException):
+            decode_grid("1002", GridFormat.NESTED)
+        with self.assertRaises(BoardCodecException):
+            decode_grid("100203", GridFormat.HEX)  # not a square
+        with self.assertRaises(BoardCodecException):
+            decode_grid("zz", GridFormat.HEX)
+        with self.assertRaises(BoardCodecException):
+            decode_grid("ASAw", GridFormat.BASE64, grid_length=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from src.game.direction import Direction
+from src.game.history import GameHistory
+
+
+class TestGameHistory(unittest.TestCase):
+    def test_undo_redo_and_branching(self):
+        history = GameHistory(board=0, depth=8)
+        history.push(1, Direction.LEFT)
+        history.push(2, Direction.UP)
+
+        self.assertEqual(history.undo(), 1)
+        self.assertEqual(history.undo(), 0)
+        self.assertIsNone(history.undo())
+        self.assertEqual(history.redo(), (1, Direction.LEFT))
+
+        # A new move after an undo discards the undone boards
+        history.push(3, Direction.RIGHT)
+        self.assertFalse(history.can_redo)
+        self.assertEqual(history.undo(), 1)
+        self.assertEqual(history.redo(), (3, Direction.RIGHT))
+
+    def test_depth_bounds_undo(self):
+        history = GameHistory(board=0, depth=2)
+        for board in range(1, 6):
+            history.push(board, Direction.DOWN)
+        self.assertEqual(history.undo(), 4)
+        self.assertEqual(history.undo(), 3)
+        self.assertIsNone(history.undo())
+        self.assertEqual(len(history.boards), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.game.board import GameBoard
+from src.game.direction import Direction
+from src.game.journal import GameJournal, JournalRecord, MoveLog, read_segment
+from src.game.session import SessionStore
+
+
+def _play(seed: int, count: int):
+    """Play a seeded game, returning the final board and the moves that changed it."""
+    game = GameBoard.create_new(seed=seed)
+    moves = MoveLog()
+    directions = [Direction.LEFT, Direction.DOWN, Direction.RIGHT, Direction.UP]
+    for index in range(count):
+        if game.status().is_terminal:
+            break
+        turns = game.turns
+        direction = directions[index % 4]
+        direction.apply_to_board(game)
+        if game.turns > turns:
+            moves.append(direction)
+    return game, moves
+
+
+class TestGameJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_seeded_games_are_deterministic(self):
+        first, _ = _play(seed=7, count=50)
+        second, _ = _play(seed=7, count=50)
+        self.assertEqual(first.get_board(), second.get_board())
+
+    def test_move_log_packs_two_bits_per_move(self):
+        moves = MoveLog()
+        directions = [Direction.UP, Direction.RIGHT, Direction.LEFT, Direction.DOWN, Direction.RIGHT]
+        for direction in directions:
+            moves.append(direction)
+        self.assertEqual(len(moves.data), 2)
+        self.assertEqual(list(moves), directions)
+
+        moves.truncate(3)
+        moves.append(Direction.UP)
+        self.assertEqual(list(moves), directions[:3] + [Direction.UP])
+
+    def test_replay_rebuilds_board(self):
+        game, moves = _play(seed=42, count=200)
+        journal = GameJournal(self.directory.name, segment_bytes=1 << 20)
+        journal.append(JournalRecord(42, 4, moves))
+        journal.close()
+
+        (record,) = list(journal)
+        self.assertEqual(record.turns, game.turns)
+        self.assertEqual(record.replay().get_board(), game.get_board())
+
+        partial, _ = _play(seed=42, count=10)
+        self.assertEqual(record.replay(partial.turns).get_board(), partial.get_board())
+
+    def test_segments_rotate_and_torn_records_are_skipped(self):
+        journal = GameJournal(self.directory.name, segment_bytes=64)
+        for seed in range(6):
+            _, moves = _play(seed=seed, count=40)
+            journal.append(JournalRecord(seed, 4, moves))
+        journal.close()
+
+        segments = journal.segments()
+        self.assertGreater(len(segments), 1)
+        self.assertEqual([record.seed for record in journal], list(range(6)))
+
+        with open(segments[-1], "ab") as file:
+            file.write(b"\x04\x01\x02")
+        self.assertEqual([record.seed for record in journal], list(range(6)))
+        self.assertTrue(all(os.path.basename(path).startswith(f"journal-{os.getpid()}-") for path in segments))
+
+    def test_each_process_writes_its_own_segments(self):
+        journal = GameJournal(self.directory.name, segment_bytes=1 << 20)
+        _, moves = _play(seed=1, count=20)
+        journal.append(JournalRecord(1, 4, moves))
+        with patch("src.game.journal.os.getpid", return_value=os.getpid() + 1):
+            journal.append(JournalRecord(2, 4, moves))
+        journal.close()
+
+        self.assertEqual(len(journal.segments()), 2)
+        self.assertEqual(sorted(record.seed for record in journal), [1, 2])
+
+    def test_evicted_sessions_are_journaled(self):
+        journal = GameJournal(self.directory.name, segment_bytes=1 << 20)
+        store = SessionStore(idle_seconds=60, max_sessions=1)
+        game = GameBoard.create_new(seed=3)
+        session_id = store.create(game)
+
+        Direction.LEFT.apply_to_board(game)
+        Direction.RIGHT.apply_to_board(game)
+        session = store.get(session_id)
+        session.moves.append(Direction.LEFT)
+
+        with patch("src.game.journal.journal", journal):
+            store.create(GameBoard.create_new(seed=4))
+            store.clear()
+        journal.close()
+
+        self.assertEqual([(record.seed, record.turns) for record in journal], [(3, 1), (4, 0)])
+        self.assertEqual(len(list(read_segment(journal.segments()[0]))), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+
+from src.game.board import GameBoard
+from src.game.direction import Direction
+from src.game.session import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.game = GameBoard(
+            board=[
+                [2, None, None, None],
+                [None, None, None, None],
+                [None, None, 4, None],
+                [None, None, None, None],
+            ],
+            goal=2048,
+            prop_numbers=[2, 4],
+            turns=3,
+        )
+
+    def test_session_round_trip(self):
+        store = SessionStore(idle_seconds=60, max_sessions=10, clock=self.clock)
+        session_id = store.create(self.game)
+
+        game = store.get(session_id).to_game()
+        self.assertEqual(game.get_board(), self.game.get_board())
+        self.assertEqual(game.turns, 3)
+
+        game.move_right()
+        store.get(session_id).update(game, Direction.RIGHT)
+        self.assertEqual(store.get(session_id).to_game().get_board(), game.get_board())
+        self.assertEqual(store.get(session_id).turns, 4)
+        self.assertEqual(list(store.get(session_id).moves), [Direction.RIGHT])
+
+    def test_undo_and_redo(self):
+        store = SessionStore(idle_seconds=60, max_sessions=10, clock=self.clock, undo_depth=4)
+        session = store.get(store.create(GameBoard.create_new(seed=5)))
+        start = session.board
+
+        game = session.to_game()
+        for direction in (Direction.LEFT, Direction.UP, Direction.RIGHT):
+            direction.apply_to_board(game)
+            session.update(game, direction)
+        played = session.board
+        moves = list(session.moves)
+
+        self.assertTrue(session.undo())
+        self.assertEqual(session.turns, game.turns - 1)
+        self.assertEqual(len(session.moves), len(moves) - 1)
+        self.assertTrue(session.redo())
+        self.assertEqual((session.board, list(session.moves)), (played, moves))
+
+        while session.undo():
+            pass
+        self.assertEqual((session.board, session.turns, len(session.moves)), (start, 0, 0))
+
+        without_undo = SessionStore(idle_seconds=60, max_sessions=10, clock=self.clock)
+        self.assertFalse(without_undo.get(without_undo.create(self.game)).undo())
+
+    def test_finished_games_cannot_be_undone(self):
+        store = SessionStore(idle_seconds=60, max_sessions=10, clock=self.clock, undo_depth=4)
+        grid = [[1024, 1024, None, None], [2, None, None, None], [None] * 4, [None] * 4]
+        session = store.get(store.create(GameBoard(grid, goal=2048, prop_numbers=[2, 4], seed=1)))
+
+        game = session.to_game()
+        Direction.DOWN.apply_to_board(game)
+        session.update(game, Direction.DOWN)
+        self.assertTrue(session.undo())
+        self.assertTrue(session.assisted)
+
+        game = session.to_game()
+        Direction.LEFT.apply_to_board(game)
+        session.update(game, Direction.LEFT)
+        self.assertTrue(session.finished)
+        self.assertFalse(session.undo())
+
+    def test_redone_game_ending_move_finishes_the_game(self):
+        store = SessionStore(idle_seconds=60, max_sessions=10, clock=self.clock, undo_depth=4)
+        grid = [[1024, 1024, None, None], [2, None, None, None], [None] * 4, [None] * 4]
+        session = store.get(store.create(GameBoard(grid, goal=2048, prop_numbers=[2, 4], seed=1)))
+
+        game = session.to_game()
+        Direction.LEFT.apply_to_board(game)
+        session.update(game, Direction.LEFT)
+        # Take the winning move back through the history, as undo itself refuses to
+        session.finished = False
+        self.assertTrue(session.undo())
+        self.assertFalse(session.finished)
+
+        self.assertTrue(session.redo())
+        self.assertTrue(session.finished)
+        self.assertFalse(session.undo())
+
+    def test_idle_sessions_are_evicted(self):
+        store = SessionStore(idle_seconds=60, max_sessions=10, clock=self.clock)
+        stale = store.create(self.game)
+        self.clock.now = 30
+        fresh = store.create(self.game)
+
+        self.clock.now = 61
+        self.assertIsNone(store.get(stale))
+        self.assertIsNotNone(store.get(fresh))
+        self.assertEqual(len(store), 1)
+
+    def test_least_recently_used_session_is_evicted_at_capacity(self):
+        store = SessionStore(idle_seconds=60, max_sessions=2, clock=self.clock)
+        first = store.create(self.game)
+        second = store.create(self.game)
+        store.get(first)  # first is now the most recently used
+
+        third = store.create(self.game)
+
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get(second))
+        self.assertIsNotNone(store.get(first))
+        self.assertIsNotNone(store.get(third))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import base64
+import unittest
+
+from src.game.board import GameBoard
+from src.game.direction import Direction
+from src.game.state_token import StateTokenException, StateTokenSigner
+
+
+class TestStateToken(unittest.TestCase):
+    def setUp(self):
+        self.signer = StateTokenSigner(b"secret")
+
+    def test_round_trip_continues_the_same_game(self):
+        game = GameBoard.create_new(seed=99)
+        Direction.LEFT.apply_to_board(game)
+        token = self.signer.issue(game)
+        self.assertEqual(len(token), 62)
+
+        restored = self.signer.verify(token)
+        self.assertEqual(restored, game)
+        self.assertEqual(restored.seed, 99)
+
+        for direction in (Direction.UP, Direction.RIGHT, Direction.DOWN):
+            direction.apply_to_board(game)
+            direction.apply_to_board(restored)
+        self.assertEqual(restored.get_board(), game.get_board())
+
+    def test_tampered_or_foreign_tokens_are_rejected(self):
+        token = self.signer.issue(GameBoard.create_new(seed=1))
+        raw = bytearray(base64.urlsafe_b64decode(token + "=="))
+        raw[2] ^= 1  # bump the turn count
+        tampered = base64.urlsafe_b64encode(bytes(raw)).rstrip(b"=").decode()
+
+        for bad in (tampered, token[:-4], "not a token!", ""):
+            with self.assertRaises(StateTokenException):
+                self.signer.verify(bad)
+        with self.assertRaises(StateTokenException):
+            StateTokenSigner(b"other").verify(token)
+
+    def test_seed_is_not_readable(self):
+        game = GameBoard.create_new(seed=0x0123456789ABCDEF)
+        first, second = self.signer.issue(game), self.signer.issue(game)
+        self.assertNotEqual(first, second)
+        for token in (first, second):
+            raw = base64.urlsafe_b64decode(token + "==")
+            self.assertNotIn(game.seed.to_bytes(8, "little"), raw)
+            self.assertEqual(self.signer.verify(token).seed, game.seed)
+
+    def test_unseeded_games_have_no_token(self):
+        game = GameBoard(board=[[2, None], [None, None]], goal=2048, prop_numbers=[2, 4])
+        with self.assertRaises(StateTokenException):
+            self.signer.issue(game)
+
+
+if __name__ == '__main__':
+    unittest.main()
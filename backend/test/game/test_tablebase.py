@@ -0,0 +1,93 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.game.bitboard import DIRECTIONS
+from src.game.codec import pack_board
+from src.game.direction import Direction
+from src.game.tablebase import (
+    SmallBoards,
+    Tablebase,
+    TablebaseException,
+    encode_tablebase,
+    solve,
+    tablebase_name,
+)
+
+
+class TestSmallBoards(unittest.TestCase):
+    def test_moves_match_the_game_rules(self):
+        boards = SmallBoards(3)
+        board = pack_board([[2, 2, 4], [None, 4, None], [2, None, 2]])
+        self.assertEqual(boards.move(board, Direction.LEFT), pack_board([[4, 4, None], [4, None, None], [4, None, None]]))
+        self.assertEqual(boards.move(board, Direction.DOWN), pack_board([[None, None, None], [None, 2, 4], [4, 4, 2]]))
+
+    def test_symmetries_commute_with_moves(self):
+        boards = SmallBoards(3)
+        rng = random.Random(7)
+        for _ in range(200):
+            board = sum(rng.choice((0, 0, 1, 2, 3)) << (4 * cell) for cell in range(9))
+            for symmetry, image in enumerate(boards.images(board)):
+                for direction in DIRECTIONS:
+                    mapped = SmallBoards.map_direction(direction, symmetry)
+                    self.assertEqual(boards.images(boards.move(board, direction))[symmetry], boards.move(image, mapped))
+                    self.assertEqual(SmallBoards.map_direction(mapped, symmetry, inverse=True), direction)
+
+    def test_rejects_large_grids(self):
+        with self.assertRaises(TablebaseException):
+            SmallBoards(4)
+
+
+class TestSolve(unittest.TestCase):
+    def setUp(self):
+        self.solution = solve(2, 16, 2, 2, 4)
+        self.tablebase = Tablebase(encode_tablebase(self.solution, 2, 16, 2))
+
+    def test_values_follow_the_spawn_distribution(self):
+        boards = SmallBoards(2)
+        # Up wins only if a 2 spawns next to the 4 (one of the four outcomes); right never loses the 8
+        board = pack_board([[8, 4], [2, 4]])
+        direction, win = self.tablebase.lookup(board)
+        self.assertEqual(direction, Direction.UP)
+        self.assertEqual(boards.move(board, Direction.UP), pack_board([[8, 8], [2, None]]))
+        self.assertGreater(win, 0.0)
+        self.assertLessEqual(win, 1.0)
+
+    def test_terminal_positions(self):
+        self.assertEqual(self.tablebase.lookup(pack_board([[16, 8], [4, None]])), (None, 1.0))
+        self.assertEqual(self.tablebase.lookup(pack_board([[2, 4], [4, 2]])), (None, 0.0))
+
+    def test_symmetric_boards_get_mapped_moves(self):
+        boards = SmallBoards(2)
+        board = pack_board([[4, 2], [None, 2]])
+        direction, win = self.tablebase.lookup(board)
+        for symmetry, image in enumerate(boards.images(board)):
+            self.assertEqual(
+                self.tablebase.lookup(image),
+                (SmallBoards.map_direction(direction, symmetry), win),
+            )
+
+    def test_unreachable_positions_are_not_found(self):
+        self.assertIsNone(self.tablebase.lookup(pack_board([[32, None], [None, None]])))
+
+    def test_memory_mapped_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, tablebase_name(2, 16))
+            with open(path, "wb") as file:
+                file.write(encode_tablebase(self.solution, 2, 16, 2))
+            tablebase = Tablebase.open(path)
+            self.assertEqual((tablebase.grid_length, tablebase.goal_number, tablebase.count), (2, 16, len(self.solution)))
+            board = pack_board([[4, 2], [None, 2]])
+            self.assertEqual(tablebase.lookup(board), self.tablebase.lookup(board))
+
+    def test_rejects_truncated_tablebases(self):
+        data = encode_tablebase(self.solution, 2, 16, 2)
+        with self.assertRaises(TablebaseException):
+            Tablebase(data[:-1])
+        with self.assertRaises(TablebaseException):
+            Tablebase(b"not a tablebase" * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from src.game.board import GameBoard
+from src.game.direction import Direction
+from src.game.status import GameStatus
+from src.game.validation import Violation, _replay_game, validate_game
+
+
+def _play(seed: int, grid_length: int = 4):
+    """Play a seeded game to the end at random, returning the board and its moves."""
+    rng = random.Random(seed)
+    game = GameBoard.create_new(grid_length=grid_length, seed=seed)
+    moves = []
+    while not game.status().is_terminal:
+        direction = rng.choice(list(Direction))
+        turns = game.turns
+        direction.apply_to_board(game)
+        if game.turns > turns:
+            moves.append(direction)
+    return game, moves
+
+
+class TestValidation(unittest.TestCase):
+    def test_valid_games_match_live_games(self):
+        for seed in range(5):
+            game, moves = _play(seed)
+            result = validate_game(seed, moves, claims={"turns": game.turns, "status": "lose"})
+            self.assertTrue(result.valid, result.detail)
+            self.assertEqual(result.turns, game.turns)
+            self.assertEqual(result.largest_number, game.largest_number())
+            self.assertEqual(result.status, GameStatus.LOSE)
+
+            replayed = _replay_game(GameBoard.create_new(seed=seed), moves, seed)
+            self.assertEqual((replayed.turns, replayed.largest_number), (result.turns, result.largest_number))
+
+    def test_small_grids_use_game_board(self):
+        game, moves = _play(3, grid_length=3)
+        result = validate_game(3, "".join(move.value[0] for move in moves), grid_length=3)
+        self.assertTrue(result.valid)
+        self.assertEqual(result.turns, game.turns)
+
+    def test_first_illegal_step_is_reported(self):
+        _, moves = _play(1)
+        self.assertEqual(validate_game(1, moves + [Direction.UP]).violation, Violation.GAME_OVER)
+
+        tampered = validate_game(1, moves[:10] + ["sideways"] + moves[10:])
+        self.assertEqual((tampered.violation, tampered.step, tampered.turns), (Violation.UNKNOWN_MOVE, 10, 10))
+
+        # Replaying a prefix under another seed diverges at the first move that no longer changes the board
+        diverged = validate_game(2, moves)
+        self.assertFalse(diverged.valid)
+        self.assertEqual(diverged.step, diverged.turns)
+
+        claimed = validate_game(1, moves, claims={"largest_number": 1 << 20})
+        self.assertEqual(claimed.violation, Violation.CLAIM_MISMATCH)
+        self.assertEqual(validate_game(-1, moves).violation, Violation.MALFORMED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.leaderboard.leaderboard import GameOutcome, Leaderboard
+
+DAY = 86400.0
+NOW = 1_700_000_000.0
+
+
+def _outcome(score: int, finished_at: float = NOW, status: str = "LOSE", recommender: str = "") -> GameOutcome:
+    return GameOutcome(score, 256, score // 2, status, recommender, "session", finished_at)
+
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "leaderboard.sqlite3")
+        self.now = NOW
+        self.board = self.__open()
+
+    def tearDown(self):
+        self.board.close()
+        self.directory.cleanup()
+
+    def __open(self) -> Leaderboard:
+        return Leaderboard(self.path, top_k=3, bucket_seconds=3600, retention_days=2, clock=lambda: self.now)
+
+    def test_keeps_top_k_per_board(self):
+        for score in (10, 50, 20, 40, 30, 5):
+            self.board.record(_outcome(score))
+        self.board.record(_outcome(100, finished_at=NOW - DAY))
+
+        self.assertEqual([game.score for game in self.board.top()], [100, 50, 40])
+        self.assertEqual([game.score for game in self.board.top("today")], [50, 40, 30])
+        self.assertEqual([game.score for game in self.board.top("today", limit=1)], [50])
+
+        # Reopening loads the heaps from the database
+        self.board.close()
+        self.board = self.__open()
+        self.board.record(_outcome(45))
+        self.assertEqual([game.score for game in self.board.top("today")], [50, 45, 40])
+
+    def test_shared_database_stays_exact(self):
+        other = self.__open()
+        try:
+            for score in (10, 20, 30):
+                self.board.record(_outcome(score))
+            for score in (15, 25, 35):
+                other.record(_outcome(score))
+            self.assertEqual([game.score for game in self.board.top()], [35, 30, 25])
+        finally:
+            other.close()
+
+    def test_stats_per_recommender(self):
+        self.board.record(_outcome(10, status="WIN", recommender="heuristic/expectimax"))
+        self.board.record(_outcome(20, recommender="heuristic/expectimax"))
+        self.board.record(_outcome(30))
+        self.board.record(_outcome(40, finished_at=NOW - DAY))
+
+        stats = {entry.recommender: entry for entry in self.board.stats(3600)}
+        self.assertEqual(stats["heuristic/expectimax"].games, 2)
+        self.assertEqual(stats["heuristic/expectimax"].win_rate, 0.5)
+        self.assertEqual(stats["heuristic/expectimax"].turns, {4: 1, 8: 1})
+        self.assertEqual(stats[""].games, 1)
+        self.assertEqual(stats[""].max_tiles, {256: 1})
+        self.assertEqual({entry.recommender: entry.games for entry in self.board.stats(2 * DAY)}[""], 2)
+
+    def test_old_days_are_pruned(self):
+        self.board.record(_outcome(10, finished_at=NOW - 3 * DAY))
+        self.board.record(_outcome(20))
+        day = "2023-11-11"  # three days before NOW
+        self.assertEqual(self.board.top(day), [])
+        self.assertEqual(self.board.stats(10 * DAY)[0].games, 1)
+
+    def test_seeded_games_are_recorded_once(self):
+        first = GameOutcome(10, 8, 5, "LOSE", "", "token", NOW, seed=42)
+        replayed = GameOutcome(30, 16, 9, "LOSE", "", "token", NOW, seed=42)
+        self.assertTrue(self.board.record(first))
+        self.assertFalse(self.board.record(replayed))
+        self.assertTrue(self.board.record(GameOutcome(20, 8, 7, "LOSE", "", "token", NOW, seed=43)))
+
+        self.assertEqual([game.score for game in self.board.top()], [20, 10])
+        self.assertEqual(self.board.stats(3600)[0].games, 2)
+
+    def test_recorded_seeds_are_pruned(self):
+        self.assertTrue(self.board.record(GameOutcome(10, 8, 5, "LOSE", "", "token", NOW - 3 * DAY, seed=42)))
+        self.board.record(_outcome(20))
+        self.assertTrue(self.board.record(GameOutcome(30, 16, 9, "LOSE", "", "token", NOW, seed=42)))
+
+    def test_connection_is_opened_per_process(self):
+        board = Leaderboard(os.path.join(self.directory.name, "lazy.sqlite3"), top_k=3, bucket_seconds=3600,
+                            retention_days=2, clock=lambda: self.now)
+        self.assertFalse(os.path.exists(board.path))
+        board.record(_outcome(10))
+        # A forked worker opens its own connection instead of using the inherited one
+        with mock.patch("src.leaderboard.leaderboard.os.getpid", return_value=-1):
+            board.record(_outcome(20))
+            self.assertEqual([game.score for game in board.top()], [20, 10])
+            board.close()
+        self.assertEqual([game.score for game in board.top()], [20, 10])
+        board.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
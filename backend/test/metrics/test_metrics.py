@@ -0,0 +1,112 @@
+import asyncio
+import os
+import threading
+import time
+import unittest
+
+from src.metrics.metrics import EventLoopLagMonitor, Histogram, MetricsRegistry, _ThreadShards
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_sums_threads(self):
+        counter = self.registry.counter("hits_total", "Hits.", ("route",))
+
+        def hit():
+            for _ in range(1000):
+                counter.inc("/a")
+
+        threads = [threading.Thread(target=hit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(counter.value("/a"), 4000)
+        self.assertIn('hits_total{route="/a"} 4000', self.registry.render())
+
+    def test_exited_threads_are_folded_into_the_base_shard(self):
+        counter = self.registry.counter("hits_total", "Hits.", ("route",))
+        histogram = self.registry.histogram("latency_seconds", "Latency.", buckets=(1.0,))
+
+        def hit():
+            counter.inc("/a")
+            histogram.observe(0.5)
+
+        for _ in range(20):
+            thread = threading.Thread(target=hit)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(counter.value("/a"), 20)
+        self.assertEqual(histogram.count(), 20)
+        self.assertIn("latency_seconds_sum 10", self.registry.render())
+
+    def test_thread_shards_follow_live_threads(self):
+        shards = _ThreadShards(lambda total, value: total + value)
+        release = threading.Event()
+
+        def record():
+            shards.local()["hits"] = shards.local().get("hits", 0) + 1
+            release.wait()
+
+        threads = [threading.Thread(target=record) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while len(shards) < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(shards), 0)
+        self.assertEqual(sum(shard.get("hits", 0) for shard in shards.snapshot()), 3)
+
+    def test_histogram_renders_cumulative_buckets(self):
+        histogram = self.registry.histogram("latency_seconds", "Latency.", ("route",),
+                                            buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, "/a")
+
+        rendered = self.registry.render()
+        self.assertIn("# TYPE latency_seconds histogram", rendered)
+        self.assertIn('latency_seconds_bucket{route="/a",le="0.1"} 1', rendered)
+        self.assertIn('latency_seconds_bucket{route="/a",le="1"} 3', rendered)
+        self.assertIn('latency_seconds_bucket{route="/a",le="+Inf"} 4', rendered)
+        self.assertIn('latency_seconds_sum{route="/a"} 6.05', rendered)
+        self.assertIn('latency_seconds_count{route="/a"} 4', rendered)
+        self.assertEqual(histogram.count("/a"), 4)
+
+    def test_callback_and_label_escaping(self):
+        self.registry.callback("queue_depth", "Depth.", lambda: {('a"b',): 3}, ("name",))
+        self.assertIn('queue_depth{name="a\\"b"} 3', self.registry.render())
+
+    def test_worker_label(self):
+        registry = MetricsRegistry(worker_label=True)
+        registry.counter("hits_total", "Hits.", ("route",)).inc("/a")
+        registry.counter("starts_total", "Starts.").inc()
+
+        rendered = registry.render()
+        self.assertIn(f'hits_total{{route="/a",worker="{os.getpid()}"}} 1', rendered)
+        self.assertIn(f'starts_total{{worker="{os.getpid()}"}} 1', rendered)
+
+    def test_duplicate_names_rejected(self):
+        self.registry.counter("hits_total", "Hits.")
+        with self.assertRaises(ValueError):
+            self.registry.counter("hits_total", "Hits.")
+
+
+class TestEventLoopLagMonitor(unittest.IsolatedAsyncioTestCase):
+    async def test_records_lag(self):
+        histogram = Histogram("lag_seconds", "Lag.")
+        monitor = EventLoopLagMonitor(histogram, interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        self.assertGreater(histogram.count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.profiles import router as profiles_router
+from src.profiling.middleware import ProfilingMiddleware
+from src.profiling.profiler import ProfileStore
+
+
+class TestProfilingMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ProfileStore(self.directory.name, max_files=10)
+
+        app = FastAPI()
+
+        @app.post("/api/move")
+        def move():
+            return {"ok": True}
+
+        app.include_router(profiles_router, prefix="/api")
+        app.add_middleware(
+            ProfilingMiddleware,
+            store=self.store,
+            admin_token="secret",
+            sample_rate=0.0,
+            routes=["/api/move"],
+            interval=0.001,
+        )
+        self.client = TestClient(app)
+        self.patches = [
+            patch("src.api.profiles.profile_store", self.store),
+            patch("src.api.profiles.SETTINGS.profiling.admin_token", "secret"),
+        ]
+        for patcher in self.patches:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patches:
+            patcher.stop()
+        self.directory.cleanup()
+
+    def test_header_triggers_profile(self):
+        response = self.client.post("/api/move", headers={"X-Profile-Token": "secret"})
+        name = response.headers["x-profile-id"]
+
+        listing = self.client.get("/api/profiles", headers={"X-Profile-Token": "secret"})
+        self.assertEqual([p["name"] for p in listing.json()["profiles"]], [name])
+
+        profile = self.client.get(f"/api/profiles/{name}", headers={"X-Profile-Token": "secret"})
+        self.assertEqual(profile.status_code, 200)
+        self.assertIn("# route POST /api/move", profile.text)
+        self.assertIn("# trigger header", profile.text)
+
+    def test_requests_without_token_are_not_profiled(self):
+        response = self.client.post("/api/move", headers={"X-Profile-Token": "wrong"})
+        self.assertNotIn("x-profile-id", response.headers)
+        self.assertEqual(self.store.list(), [])
+        self.assertEqual(self.client.get("/api/profiles").status_code, 404)
+
+    def test_non_ascii_token_is_rejected(self):
+        listing = self.client.get("/api/profiles", headers={"X-Profile-Token": "s\u00e9cret".encode()})
+        self.assertEqual(listing.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
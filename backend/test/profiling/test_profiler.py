@@ -0,0 +1,58 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.game.board import GameBoard
+from src.profiling.profiler import ProfileStore, StackSampler
+
+
+def _play(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        game = GameBoard.create_new()
+        for _ in range(20):
+            if game.status().is_terminal:
+                break
+            game.move_left()
+
+
+class TestStackSampler(unittest.TestCase):
+    def test_samples_project_frames(self):
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        _play(0.05)
+        sampler.stop()
+
+        self.assertGreater(sampler.samples, 0)
+        folded = sampler.folded()
+        self.assertIn("(src/game/board.py:", folded)
+        self.assertTrue(folded.startswith("MainThread;"))
+
+
+class TestProfileStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ProfileStore(self.directory.name, max_files=3)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_ring_keeps_newest(self):
+        names = []
+        for index in range(5):
+            name = f"{1700000000000 + index:013d}-api-move-0000000{index}.folded"
+            self.store.save(name, f"stack {index}\n")
+            names.append(name)
+
+        self.assertEqual([name for name, _ in self.store.list()], names[:1:-1])
+        self.assertIsNone(self.store.path(names[0]))
+        self.assertEqual(self.store.path(names[-1]), os.path.join(self.directory.name, names[-1]))
+
+    def test_rejects_foreign_names(self):
+        self.assertIsNone(self.store.path("../../etc/passwd"))
+        self.assertRegex(self.store.new_name("/api/recommend"), r"^\d{13}-api-recommend-[0-9a-f]{8}\.folded$")
+
+
+if __name__ == '__main__':
+    unittest.main()
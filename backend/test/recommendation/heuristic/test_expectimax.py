@@ -0,0 +1,42 @@
+import unittest
+
+from src.recommendation.heuristic.expectimax import ExpectimaxRecommender
+from src.recommendation.heuristic.provider import HeuristicProvider
+
+
+class TestExpectimaxRecommender(unittest.TestCase):
+    def test_suggests_legal_move(self):
+        grid = [
+            [2, 2, None, None],
+            [None, None, None, None],
+            [None, None, None, None],
+            [None, None, None, None]
+        ]
+        move, rationale = ExpectimaxRecommender(depth=1).suggest_move(grid, "expectimax")
+
+        self.assertIn(move, ['left', 'right', 'up', 'down'])
+        self.assertGreater(len(rationale), 0)
+
+    def test_only_legal_move_is_chosen(self):
+        grid = [
+            [2, 4, 2, 4],
+            [4, 2, 4, 2],
+            [2, 4, 2, 4],
+            [4, 2, 4, None],
+        ]
+        move, _ = ExpectimaxRecommender(depth=2).suggest_move(grid, "expectimax")
+        self.assertIn(move, ['right', 'down'])
+
+    def test_rejects_other_grid_sizes(self):
+        with self.assertRaises(ValueError):
+            ExpectimaxRecommender().suggest_move([[2, None], [None, None]], "expectimax")
+
+    def test_provider_dispatches_by_model(self):
+        provider = HeuristicProvider.create()
+        self.assertEqual(provider.models, ["simple", "expectimax"])
+        with self.assertRaises(ValueError):
+            provider.suggest_move([[2, None], [None, None]], "missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.config.settings import SETTINGS
+from src.game.tablebase import encode_tablebase, solve, tablebase_name
+from src.recommendation.heuristic.perfect import PerfectRecommender
+
+
+class TestPerfectRecommender(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_solves_2x2_in_memory(self):
+        move, rationale = PerfectRecommender(self.directory.name).suggest_move([[2, 2], [None, None]], "perfect")
+
+        self.assertIn(move, ['left', 'right', 'up', 'down'])
+        self.assertIn("cannot be reached", rationale)
+
+    def test_game_over(self):
+        move, rationale = PerfectRecommender(self.directory.name).suggest_move([[2, 4], [4, 2]], "perfect")
+        self.assertEqual(move, "left")
+        self.assertIn("No moves", rationale)
+
+    def test_reads_3x3_tablebase(self):
+        with mock.patch.object(SETTINGS.game, "goal_number", 8):
+            path = os.path.join(self.directory.name, tablebase_name(3, 8))
+            with open(path, "wb") as file:
+                file.write(encode_tablebase(solve(3, 8, 2, 2, 2), 3, 8, 2))
+            grid = [[4, 2, None], [2, None, None], [None, None, None]]
+            move, rationale = PerfectRecommender(self.directory.name).suggest_move(grid, "perfect")
+
+        self.assertIn(move, ['left', 'right', 'up', 'down'])
+        self.assertIn("reaches 8", rationale)
+
+    def test_3x3_needs_a_tablebase(self):
+        with self.assertRaises(ValueError):
+            PerfectRecommender(self.directory.name).suggest_move([[2, None, None]] * 3, "perfect")
+
+    def test_availability_follows_grid_size_and_tablebases(self):
+        recommender = PerfectRecommender(self.directory.name)
+        self.assertTrue(recommender.is_available(2))
+        self.assertFalse(recommender.is_available(3))
+        self.assertFalse(recommender.is_available(4))
+
+        open(os.path.join(self.directory.name, tablebase_name(3, SETTINGS.game.goal_number)), "wb").close()
+        self.assertTrue(recommender.is_available(3))
+
+    def test_tablebase_for_another_game_is_rejected(self):
+        with open(os.path.join(self.directory.name, tablebase_name(2, SETTINGS.game.goal_number)), "wb") as file:
+            file.write(encode_tablebase(solve(2, 16, 4, 2, 2), 2, SETTINGS.game.goal_number, 4))
+        with self.assertRaises(ValueError):
+            PerfectRecommender(self.directory.name).suggest_move([[2, None], [None, None]], "perfect")
+
+    def test_rejects_larger_grids(self):
+        with self.assertRaises(ValueError):
+            PerfectRecommender(self.directory.name).suggest_move([[2, None, None, None]] * 4, "perfect")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,6 +40,8 @@ class TestGeminiRecommender(unittest.TestCase):
         mock_response.text = (
             '{"move": "left", "rationale": "Merging tiles on the left is optimal."}'
         )
+        mock_response.usage_metadata.prompt_token_count = 120
+        mock_response.usage_metadata.candidates_token_count = 18
         mock_client.models.generate_content.return_value = mock_response
         mock_client_class.return_value = mock_client
 
@@ -50,6 +52,11 @@ class TestGeminiRecommender(unittest.TestCase):
             self.assertEqual(move, "left")
             self.assertEqual(rationale, "Merging tiles on the left is optimal.")
 
+            usage = recommender.usage.snapshot()[self.test_model]
+            self.assertEqual(usage.calls, 1)
+            self.assertEqual(usage.prompt_tokens, 120)
+            self.assertEqual(usage.response_tokens, 18)
+
     @patch("src.recommendation.prompt.gemini.genai.Client")
     def test_gemini_recommender_with_markdown(self, mock_client_class):
         """Test parsing response with markdown code blocks."""
@@ -57,6 +64,7 @@ class TestGeminiRecommender(unittest.TestCase):
 
         mock_response = MagicMock()
         mock_response.text = '```json\n{"move": "right", "rationale": "Best move."}\n```'
+        mock_response.usage_metadata = None
         mock_client.models.generate_content.return_value = mock_response
         mock_client_class.return_value = mock_client
 
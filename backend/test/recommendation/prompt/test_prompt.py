@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.recommendation.prompt.prompt import PromptBasedRecommender, QueryResult
+
+
+class StubRecommender(PromptBasedRecommender):
+    """Prompt recommender answering with a canned response."""
+
+    def __init__(self, text: str):
+        super().__init__()
+        self.query = MagicMock(return_value=QueryResult(text, 50, 10))
+
+    def query_model(self, prompt: str, model: str) -> QueryResult:
+        return self.query(prompt, model)
+
+    def list_available_models_from_client(self):
+        return []
+
+    @staticmethod
+    def list_available_models(host: str):
+        return []
+
+
+class TestPromptBasedRecommender(unittest.TestCase):
+    def setUp(self):
+        self.grid = [
+            [2, 2, None, None],
+            [None, None, None, None],
+            [None, None, None, None],
+            [None, None, None, None]
+        ]
+
+    def test_prompt_lists_only_legal_moves(self):
+        """Test that the prompt is compact and lists only moves changing the board."""
+        recommender = StubRecommender('{"move": "left", "rationale": "Merge."}')
+        recommender.suggest_move(self.grid, "model")
+
+        prompt = recommender.query.call_args.args[0]
+        self.assertIn("2 2 . .", prompt)
+        self.assertIn("left:\n4 . . .", prompt)
+        self.assertIn("right:\n. . . 4", prompt)
+        self.assertIn("down:\n. . . .", prompt)
+        self.assertNotIn("up:", prompt)
+        self.assertNotIn("None", prompt)
+
+    def test_illegal_answer_is_replaced_by_legal_move(self):
+        """Test that a move that does not change the board is never returned."""
+        recommender = StubRecommender('{"move": "up", "rationale": "Stay."}')
+        move, _ = recommender.suggest_move(self.grid, "model")
+
+        self.assertIn(move, ["down", "left", "right"])
+
+    def test_single_legal_move_skips_query(self):
+        """Test that the model is not queried when only one move is legal."""
+        grid = [
+            [2, 4, 2, 4],
+            [4, 2, 4, 2],
+            [2, 4, 2, 4],
+            [None, None, None, None],
+        ]
+        recommender = StubRecommender('{"move": "up", "rationale": "Unused."}')
+        move, _ = recommender.suggest_move(grid, "model")
+
+        self.assertEqual(move, "down")
+        recommender.query.assert_not_called()
+
+    def test_usage_is_recorded_per_model(self):
+        """Test that token counts and latency are tracked per model."""
+        recommender = StubRecommender('{"move": "left", "rationale": "Merge."}')
+        recommender.suggest_move(self.grid, "model-a")
+        recommender.suggest_move(self.grid, "model-a")
+
+        usage = recommender.usage.snapshot()["model-a"]
+        self.assertEqual(usage.calls, 2)
+        self.assertEqual(usage.prompt_tokens, 100)
+        self.assertEqual(usage.response_tokens, 20)
+        self.assertGreaterEqual(usage.mean_latency, 0.0)
+
+    def test_errors_are_recorded(self):
+        """Test that failed queries are counted and re-raised."""
+        recommender = StubRecommender("")
+        recommender.query.side_effect = RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            recommender.suggest_move(self.grid, "model")
+        self.assertEqual(recommender.usage.snapshot()["model"].errors, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.recommendation.prompt.scheduler import BatchScheduler
+
+
+class RecordingSender:
+    """Fake model server call tracking how many queries run at once, per model."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = {}
+        self.max_active = 0
+        self.started = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, model: str, prompt: str) -> str:
+        self.gate.wait()
+        with self.lock:
+            self.started.append(model)
+            self.active[model] = self.active.get(model, 0) + 1
+            self.max_active = max(self.max_active, sum(self.active.values()))
+        time.sleep(1.0 if prompt == "slow" else self.delay)
+        with self.lock:
+            self.active[model] -= 1
+        if prompt == "fail":
+            raise RuntimeError("server error")
+        return f"{model}:{prompt}"
+
+
+class TestBatchScheduler(unittest.TestCase):
+    def test_responses_are_routed_to_callers(self):
+        """Test that every caller receives the response to its own prompt."""
+        scheduler = BatchScheduler(RecordingSender(delay=0.001), max_parallel=3, window=0.01)
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            results = list(pool.map(lambda i: scheduler.query("m", str(i)), range(10)))
+
+        self.assertEqual(results, [f"m:{i}" for i in range(10)])
+
+    def test_parallelism_is_bounded(self):
+        """Test that no more than max_parallel queries are in flight."""
+        sender = RecordingSender()
+        scheduler = BatchScheduler(sender, max_parallel=4, window=0.01)
+
+        futures = [scheduler.submit("m", str(i)) for i in range(10)]
+        for future in futures:
+            future.result(timeout=5)
+
+        self.assertEqual(sender.max_active, 4)
+        stats = scheduler.stats()["m"]
+        self.assertEqual(stats.queue_depth, 0)
+        self.assertEqual(stats.dispatched, 10)
+        self.assertGreaterEqual(stats.batches, 3)
+        self.assertGreater(stats.mean_wait, 0.0)
+        self.assertGreaterEqual(stats.max_wait, stats.mean_wait)
+
+    def test_model_in_flight_is_served_first(self):
+        """Test that free slots go to the model in flight before another model is started."""
+        sender = RecordingSender(delay=0.01)
+        sender.gate.clear()  # hold the first batch until every query is queued
+        scheduler = BatchScheduler(sender, max_parallel=4, window=0.01)
+
+        # The slow first query keeps model b in flight while the other slots free up
+        futures = [scheduler.submit("a" if i % 2 else "b", "slow" if i == 0 else str(i)) for i in range(12)]
+        sender.gate.set()
+        for future in futures:
+            future.result(timeout=5)
+
+        self.assertEqual(sender.started, ["b"] * 6 + ["a"] * 6)
+        self.assertEqual(scheduler.stats()["a"].dispatched, 6)
+        self.assertEqual(scheduler.stats()["b"].dispatched, 6)
+
+    def test_busy_model_does_not_starve_others(self):
+        """Test that a waiting model is served after a bounded number of batches of the model in flight."""
+        sender = RecordingSender(delay=0.005)
+        sender.gate.clear()
+        scheduler = BatchScheduler(sender, max_parallel=2, window=0.0, max_consecutive_batches=2)
+
+        futures = [scheduler.submit("a", "0"), scheduler.submit("a", "1"), scheduler.submit("b", "b")]
+        futures += [scheduler.submit("a", str(i)) for i in range(2, 22)]
+        sender.gate.set()
+        for future in futures:
+            future.result(timeout=5)
+
+        # Two queries in flight, then at most two batches of at most two queries before b
+        self.assertLessEqual(sender.started.index("b"), 6)
+
+    def test_slow_query_only_holds_its_own_slot(self):
+        """Test that queries keep flowing through the other slots while one is slow."""
+        sender = RecordingSender(delay=0.01)
+        scheduler = BatchScheduler(sender, max_parallel=2, window=0.0)
+
+        slow = scheduler.submit("m", "slow")
+        start = time.monotonic()
+        for future in [scheduler.submit("m", str(i)) for i in range(5)]:
+            future.result(timeout=5)
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertFalse(slow.done())
+        self.assertEqual(slow.result(timeout=5), "m:slow")
+
+    def test_errors_are_routed_to_callers(self):
+        """Test that a failing query raises only in its own caller."""
+        scheduler = BatchScheduler(RecordingSender(delay=0.001), max_parallel=2, window=0.01)
+
+        failing = scheduler.submit("m", "fail")
+        passing = scheduler.submit("m", "ok")
+
+        with self.assertRaises(RuntimeError):
+            failing.result(timeout=5)
+        self.assertEqual(passing.result(timeout=5), "m:ok")
+
+
+if __name__ == '__main__':
+    unittest.main()
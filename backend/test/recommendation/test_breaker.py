@@ -0,0 +1,89 @@
+import unittest
+
+from src.config.settings import CircuitBreakerSettings
+from src.recommendation.breaker import CircuitBreaker, CircuitBreakers, CircuitState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.settings = CircuitBreakerSettings(
+            window_size=4,
+            min_calls=4,
+            failure_rate_threshold=0.5,
+            slow_call_seconds=1.0,
+            open_seconds=10.0,
+            half_open_probes=1,
+        )
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(self.settings, clock=self.clock)
+
+    def test_opens_when_failure_rate_reached(self):
+        """Test that the circuit opens once the window holds enough failures."""
+        self.breaker.record_success(0.1)
+        self.breaker.record_failure(0.1)
+        self.breaker.record_success(0.1)
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+        self.breaker.record_failure(0.1)
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_slow_calls_count_as_failures(self):
+        """Test that calls slower than the threshold trip the circuit."""
+        for _ in range(4):
+            self.breaker.record_success(2.0)
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.assertEqual(self.breaker.mean_latency, 2.0)
+
+    def test_half_open_probe_closes_circuit(self):
+        """Test that a successful probe after the open period closes the circuit."""
+        for _ in range(4):
+            self.breaker.record_failure(0.1)
+        self.clock.now = 10.0
+
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())  # only one probe at a time
+
+        self.breaker.record_success(0.1)
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+        self.assertEqual(self.breaker.failure_rate, 0.0)
+
+    def test_half_open_probe_failure_reopens_circuit(self):
+        """Test that a failed probe re-opens the circuit for another period."""
+        for _ in range(4):
+            self.breaker.record_failure(0.1)
+        self.clock.now = 10.0
+        self.assertTrue(self.breaker.allow_request())
+
+        self.breaker.record_failure(0.1)
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.clock.now = 15.0
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.clock.now = 20.0
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+
+
+class TestCircuitBreakers(unittest.TestCase):
+    def test_breakers_are_per_model_and_revisioned(self):
+        """Test that breakers are independent and state changes bump the revision."""
+        collection = CircuitBreakers(CircuitBreakerSettings(window_size=1, min_calls=1))
+        self.assertEqual(collection.state("gemini", "a"), CircuitState.CLOSED)
+
+        collection.get("gemini", "a").record_failure(0.1)
+
+        self.assertEqual(collection.state("gemini", "a"), CircuitState.OPEN)
+        self.assertEqual(collection.state("gemini", "b"), CircuitState.CLOSED)
+        self.assertEqual(collection.revision, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
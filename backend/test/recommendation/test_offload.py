@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+
+from src.recommendation.offload import OffloadQueueFullException, RecommendationPool
+
+
+class TestRecommendationPool(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.grid = [
+            [2, 2, None, None],
+            [None, None, None, None],
+            [None, None, None, None],
+            [None, None, None, None]
+        ]
+
+    def test_handles_only_local_configured_models(self):
+        pool = RecommendationPool(workers=1, max_pending=4,
+                                  models=["heuristic/expectimax", "ollama/llama2"])
+        self.assertTrue(pool.handles("heuristic", "expectimax"))
+        self.assertFalse(pool.handles("heuristic", "simple"))
+        self.assertFalse(pool.handles("ollama", "llama2"))
+        self.assertFalse(RecommendationPool(0, 4, ["heuristic/expectimax"]).handles("heuristic", "expectimax"))
+
+    async def test_runs_in_pool_and_bounds_pending(self):
+        pool = RecommendationPool(workers=1, max_pending=2, models=["heuristic/expectimax"])
+        try:
+            move, _ = await pool.suggest_move("heuristic", "expectimax", self.grid)
+            self.assertIn(move, ['left', 'right', 'up', 'down'])
+
+            first = asyncio.ensure_future(pool.suggest_move("heuristic", "expectimax", self.grid))
+            second = asyncio.ensure_future(pool.suggest_move("heuristic", "expectimax", self.grid))
+            await asyncio.sleep(0)
+            with self.assertRaises(OffloadQueueFullException):
+                await pool.suggest_move("heuristic", "expectimax", self.grid)
+
+            second.cancel()
+            await first
+            with self.assertRaises(asyncio.CancelledError):
+                await second
+            for _ in range(100):
+                if pool.pending == 0:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(pool.pending, 0)
+        finally:
+            pool.shutdown()
+
+    async def test_speculation_only_uses_idle_workers(self):
+        pool = RecommendationPool(workers=1, max_pending=2, models=["heuristic/expectimax"])
+        try:
+            # Not started yet
+            self.assertIsNone(pool.speculate("heuristic", "expectimax", self.grid))
+            pool.start()
+            self.assertIsNone(pool.speculate("heuristic", "simple", self.grid))
+
+            speculative = pool.speculate("heuristic", "expectimax", self.grid)
+            self.assertIsNotNone(speculative)
+            self.assertEqual(pool.speculating, 1)
+            self.assertEqual(pool.pending, 0)
+            self.assertIsNone(pool.speculate("heuristic", "expectimax", self.grid))
+
+            # A real request is served whether the speculation started or gave way
+            move, _ = await pool.suggest_move("heuristic", "expectimax", self.grid)
+            self.assertIn(move, ['left', 'right', 'up', 'down'])
+            if not speculative.cancelled():
+                direction, _, cpu_seconds = speculative.result(timeout=10)
+                self.assertEqual(direction, move)
+                self.assertGreaterEqual(cpu_seconds, 0.0)
+        finally:
+            pool.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,16 @@
+import subprocess
+import sys
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from src.recommendation.registry import ModelRegistry
 
 
+def _provider_classes(**classes: MagicMock):
+    """Patch the lazy provider class loader to return the given mocks."""
+    return patch("src.recommendation.registry.load_provider_class", side_effect=lambda name: classes[name])
+
+
 class TestModelRegistry(unittest.TestCase):
     def setUp(self):
         # Reset singleton instance before each test
@@ -11,21 +18,31 @@ class TestModelRegistry(unittest.TestCase):
         ModelRegistry._initialized = False
 
     @patch("src.recommendation.registry.SETTINGS")
-    @patch("src.recommendation.registry.GeminiRecommender")
-    @patch("src.recommendation.registry.OllamaRecommender")
-    def test_registry_discovery(self, mock_ollama, mock_gemini, mock_settings):
+    def test_registry_discovery(self, mock_settings):
         """Test that models are discovered and registered correctly."""
+        mock_gemini, mock_ollama = MagicMock(), MagicMock()
         # Setup mocks
+        mock_settings.recommendation.discovery_ttl_seconds = 300
         mock_settings.recommendation.gemini.api_key = "fake-key"
         mock_settings.recommendation.gemini.allowed_models = ["gemini-pro"]
+        mock_settings.recommendation.gemini.timeout_seconds = 10
         mock_settings.recommendation.ollama.host = "http://localhost:11434"
         mock_settings.recommendation.ollama.allowed_models = ["llama2"]
+        mock_settings.recommendation.ollama.timeout_seconds = 5
+        mock_settings.recommendation.ollama.num_parallel = 2
+        mock_settings.recommendation.ollama.batch_window_seconds = 0.01
 
-        mock_gemini.list_available_models.return_value = ["gemini-pro", "gemini-ultra"]
-        mock_ollama.list_available_models.return_value = ["llama2", "mistral"]
+        mock_gemini.return_value.list_available_models_from_client.return_value = [
+            "gemini-pro", "gemini-ultra"
+        ]
+        mock_ollama.return_value.list_available_models_from_client.return_value = [
+            "llama2", "mistral"
+        ]
 
         # Initialize registry
         registry = ModelRegistry()
+        with _provider_classes(gemini=mock_gemini, ollama=mock_ollama):
+            registry.refresh()
 
         # Check heuristic registration
         heuristic = registry.get_recommender("heuristic", "simple")
@@ -34,6 +51,7 @@ class TestModelRegistry(unittest.TestCase):
         # Check Gemini registration
         gemini = registry.get_recommender("gemini", "gemini-pro")
         self.assertIsNotNone(gemini)
+        mock_gemini.assert_called_once_with(api_key="fake-key", timeout=10)
         # Should not register excluded models
         with self.assertRaises(ValueError):
             registry.get_recommender("gemini", "gemini-ultra")
@@ -41,24 +59,112 @@ class TestModelRegistry(unittest.TestCase):
         # Check Ollama registration
         ollama = registry.get_recommender("ollama", "llama2")
         self.assertIsNotNone(ollama)
+        mock_ollama.assert_called_once_with(
+            host="http://localhost:11434", timeout=5, num_parallel=2, batch_window=0.01
+        )
         # Should not register excluded models
         with self.assertRaises(ValueError):
             registry.get_recommender("ollama", "mistral")
 
     @patch("src.recommendation.registry.SETTINGS")
-    @patch("src.recommendation.registry.GeminiRecommender")
-    def test_registry_empty_allowlist_gemini(self, mock_gemini, mock_settings):
+    def test_registry_empty_allowlist_gemini(self, mock_settings):
         """Test that empty allowlist prevents registration."""
+        mock_gemini = MagicMock()
+        mock_settings.recommendation.discovery_ttl_seconds = 300
         mock_settings.recommendation.gemini.api_key = "fake-key"
         mock_settings.recommendation.gemini.allowed_models = []  # Empty allowlist
+        mock_settings.recommendation.ollama.host = ""
 
-        mock_gemini.list_available_models.return_value = ["gemini-pro"]
+        mock_gemini.return_value.list_available_models_from_client.return_value = ["gemini-pro"]
 
         registry = ModelRegistry()
+        with _provider_classes(gemini=mock_gemini) as loader:
+            registry.refresh()
+        loader.assert_not_called()
 
         # Should prompt Gemini registration to be skipped
         with self.assertRaises(ValueError):
             registry.get_recommender("gemini", "gemini-pro")
+        mock_gemini.assert_not_called()
+
+    @patch("src.recommendation.registry.SETTINGS")
+    def test_registry_serves_heuristic_before_discovery(self, mock_settings):
+        """Test that heuristic models are served without waiting for providers."""
+        mock_ollama = MagicMock()
+        mock_settings.recommendation.discovery_ttl_seconds = 300
+        mock_settings.recommendation.gemini.api_key = ""
+        mock_settings.recommendation.ollama.host = "http://localhost:11434"
+        mock_settings.recommendation.ollama.allowed_models = ["llama2"]
+        mock_ollama.return_value.list_available_models_from_client.return_value = ["llama2"]
+
+        registry = ModelRegistry()
+        self.assertEqual(registry.revision, 0)
+        with _provider_classes(ollama=mock_ollama):
+            self.assertIsNotNone(registry.get_recommender("heuristic", "simple"))
+
+            # The lookup above kicked off discovery in the background
+            self.assertTrue(registry.wait_for_discovery(timeout=5))
+        self.assertIsNotNone(registry.discovery_seconds)
+        self.assertEqual(registry.revision, 1)
+        self.assertIsNotNone(registry.get_recommender("ollama", "llama2"))
+
+    @patch("src.recommendation.registry.SETTINGS")
+    def test_registry_refresh_after_ttl(self, mock_settings):
+        """Test that stale provider lists are refreshed and reuse the same client."""
+        mock_ollama = MagicMock()
+        mock_settings.recommendation.discovery_ttl_seconds = 0
+        mock_settings.recommendation.gemini.api_key = ""
+        mock_settings.recommendation.ollama.host = "http://localhost:11434"
+        mock_settings.recommendation.ollama.allowed_models = ["llama2", "mistral"]
+        listing = mock_ollama.return_value.list_available_models_from_client
+        listing.return_value = ["llama2"]
+
+        registry = ModelRegistry()
+        with _provider_classes(ollama=mock_ollama):
+            registry.refresh()
+            self.assertEqual([m.model for m in registry.list_models()], ["simple", "expectimax", "llama2"])
+
+            listing.return_value = ["llama2", "mistral"]
+            registry.wait_for_discovery(timeout=5)
+            registry.list_models()  # stale again, triggers another refresh
+            registry.wait_for_discovery(timeout=5)
+
+        self.assertEqual(
+            [m.model for m in registry.list_models()],
+            ["simple", "expectimax", "llama2", "mistral"],
+        )
+        mock_ollama.assert_called_once()
+
+    @patch("src.recommendation.registry.SETTINGS")
+    def test_failed_discovery_keeps_last_models(self, mock_settings):
+        """Test that a transient listing error does not deregister a provider's models."""
+        mock_ollama = MagicMock()
+        mock_settings.recommendation.discovery_ttl_seconds = 300
+        mock_settings.recommendation.gemini.api_key = ""
+        mock_settings.recommendation.ollama.host = "http://localhost:11434"
+        mock_settings.recommendation.ollama.allowed_models = ["llama2"]
+        listing = mock_ollama.return_value.list_available_models_from_client
+        listing.return_value = ["llama2"]
+
+        registry = ModelRegistry()
+        with _provider_classes(ollama=mock_ollama):
+            registry.refresh()
+            listing.side_effect = ConnectionError("connection refused")
+            registry.refresh()
+
+        self.assertEqual(registry.revision, 1)
+        self.assertIsNotNone(registry.get_recommender("ollama", "llama2"))
+
+    def test_provider_sdks_load_lazily(self):
+        """Test that importing the app does not import provider SDKs until they are loaded."""
+        script = (
+            "import sys; import src.app.app; "
+            "from src.recommendation.registry import load_provider_class; "
+            "print('ollama' in sys.modules, 'google.genai' in sys.modules); "
+            "load_provider_class('ollama'); print('ollama' in sys.modules)"
+        )
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.split(), ["False", "False", "True"])
 
     def test_list_models_format(self):
         """Test that list_models returns correctly formatted info."""
@@ -1,7 +1,11 @@
+import asyncio
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from src.config.settings import SETTINGS
 from src.game.direction import Direction
+from src.recommendation.breaker import breakers
+from src.recommendation.offload import OffloadQueueFullException
 from src.recommendation.service import RecommendationService
 
 
@@ -13,6 +17,10 @@ class TestRecommendationService(unittest.TestCase):
             [None, None, None, None],
             [None, None, None, None]
         ]
+        breakers.reset()
+
+    def tearDown(self):
+        breakers.reset()
 
     @patch("src.recommendation.service.registry")
     @patch("src.recommendation.service.RecommendationService._simulate_move")
@@ -61,6 +69,22 @@ class TestRecommendationService(unittest.TestCase):
         self.assertIn("Fallback to Heuristic", response.rationale)
         self.assertIn("API Error", response.rationale)
 
+    @patch("src.recommendation.service.registry")
+    def test_get_recommendation_open_circuit_skips_provider(self, mock_registry):
+        """Test that an open circuit goes straight to the heuristic fallback."""
+        mock_recommender = MagicMock()
+        mock_recommender.suggest_move.side_effect = Exception("API Error")
+        mock_registry.get_recommender.return_value = mock_recommender
+
+        for _ in range(SETTINGS.recommendation.circuit_breaker.min_calls):
+            RecommendationService.get_recommendation(self.grid, "gemini", "pro")
+        calls = mock_recommender.suggest_move.call_count
+
+        response = RecommendationService.get_recommendation(self.grid, "gemini", "pro")
+
+        self.assertEqual(mock_recommender.suggest_move.call_count, calls)
+        self.assertIn("circuit open", response.rationale)
+
     def test_simulate_move(self):
         """Test internal move simulation logic."""
         # Setup a board where 'left' causes a merge
@@ -79,6 +103,21 @@ class TestRecommendationService(unittest.TestCase):
         # Ensure original grid is untouched (though simulated logic uses deepcopy internally,
         # we pass a list of list here so we check the result)
 
+    @patch("src.recommendation.service.offload_pool")
+    def test_offload_queue_full_falls_back(self, mock_pool):
+        """Test that a full process pool answers with the heuristic fallback."""
+        mock_pool.handles.return_value = True
+        mock_pool.suggest_move = AsyncMock(side_effect=OffloadQueueFullException("pool is full"))
+
+        response = asyncio.run(RecommendationService.get_recommendation_async(
+            grid=self.grid,
+            provider="heuristic",
+            model="expectimax"
+        ))
+
+        self.assertIn("Fallback to Heuristic", response.rationale)
+        self.assertIn("pool is full", response.rationale)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from concurrent.futures import Future
+
+from src.recommendation.speculation import RecommendationCache, Speculator, cache_key
+
+GRID = [
+    [2, 2, None, None],
+    [None, None, None, None],
+    [None, None, None, None],
+    [None, None, None, None],
+]
+
+
+class _FakePool:
+    """Pool double recording speculative requests and resolving them on demand."""
+
+    def __init__(self, workers: int = 2):
+        self.workers = workers
+        self.idle = True
+        self.futures = []
+
+    def handles(self, provider, model):
+        return (provider, model) == ("heuristic", "expectimax")
+
+    def speculate(self, provider, model, grid):
+        if not self.idle:
+            return None
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+class TestRecommendationCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = RecommendationCache(max_entries=2)
+        cache.put(("a",), ("left", "a"))
+        cache.put(("b",), ("right", "b"))
+        self.assertEqual(cache.get(("a",)), ("left", "a"))
+        cache.put(("c",), ("up", "c"))
+
+        self.assertIsNone(cache.get(("b",)))
+        self.assertIn(("a",), cache)
+        self.assertIn(("c",), cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_key_depends_on_recommender_and_grid(self):
+        key = cache_key("heuristic", "expectimax", GRID)
+        self.assertEqual(key, cache_key("heuristic", "expectimax", [list(row) for row in GRID]))
+        self.assertNotEqual(key, cache_key("heuristic", "simple", GRID))
+
+
+class TestSpeculator(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.pool = _FakePool(workers=2)
+        self.cache = RecommendationCache(max_entries=16)
+        self.speculator = Speculator(self.pool, self.cache, cpu_budget=0.5, clock=lambda: self.now)
+        self.key = cache_key("heuristic", "expectimax", GRID)
+
+    def test_caches_completed_speculation(self):
+        future = self.speculator.speculate("heuristic", "expectimax", GRID)
+        self.assertIsNotNone(future)
+        future.set_result(("left", "rationale", 0.01))
+
+        self.assertEqual(self.cache.get(self.key), ("left", "rationale"))
+        # Cached boards are not speculated on again
+        self.assertIsNone(self.speculator.speculate("heuristic", "expectimax", GRID))
+
+    def test_skips_models_outside_the_pool_and_busy_pools(self):
+        self.assertIsNone(self.speculator.speculate("heuristic", "simple", GRID))
+        self.pool.idle = False
+        self.assertIsNone(self.speculator.speculate("heuristic", "expectimax", GRID))
+        self.assertEqual(self.pool.futures, [])
+
+    def test_cancelled_or_failed_speculation_is_not_cached(self):
+        self.speculator.speculate("heuristic", "expectimax", GRID).cancel()
+        self.speculator.speculate("heuristic", "expectimax", GRID).set_exception(RuntimeError("boom"))
+        self.assertNotIn(self.key, self.cache)
+
+    def test_cpu_budget_bounds_speculation(self):
+        # The bucket holds 0.5 * 2 = 1 CPU second and refills at 1 CPU second per second
+        self.assertEqual(self.speculator.capacity, 1.0)
+        self.speculator.speculate("heuristic", "expectimax", GRID).set_result(("left", "", 1.5))
+
+        other = [[4, *GRID[0][1:]], *GRID[1:]]
+        self.assertIsNone(self.speculator.speculate("heuristic", "expectimax", other))
+        self.now += 0.4
+        self.assertIsNone(self.speculator.speculate("heuristic", "expectimax", other))
+        self.now += 0.2
+        self.assertIsNotNone(self.speculator.speculate("heuristic", "expectimax", other))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from src.game.board import GameBoard
+from src.game.codec import pack_board
+from src.game.journal import CODE_MOVES
+from src.tools.export_training import (
+    ExportException,
+    ShardWriter,
+    load_shards,
+    np,
+    play_game,
+    read_manifest,
+    run_export,
+)
+
+SETTINGS = {"depth": 1, "max_moves": 20, "shard_size": 16}
+
+
+@unittest.skipIf(np is None, "NumPy is not installed (training extra)")
+class TestExportTraining(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _records(self, path: str):
+        return np.concatenate(list(load_shards(path)))
+
+    def test_play_game_follows_the_seeded_game(self):
+        boards, moves, values = play_game(seed=3, depth=1, max_moves=10)
+        boards = np.frombuffer(boards, dtype="<u8")
+        self.assertEqual(len(boards), 10)
+        self.assertEqual(len(moves), 10)
+        self.assertEqual(len(values), 40)
+
+        game = GameBoard.create_new(grid_length=4, seed=3)
+        for board, code in zip(boards, moves):
+            self.assertEqual(int(board), pack_board(game.get_board()))
+            CODE_MOVES[code].apply_to_board(game)
+
+    def test_export_fills_shards_in_game_order(self):
+        writer = run_export(self.path, games=3, seed=5, workers=0, **SETTINGS)
+
+        self.assertEqual(writer.games, 3)
+        self.assertEqual(writer.records, 60)
+        self.assertEqual([shard["records"] for shard in read_manifest(self.path)["shards"]], [16, 16, 16, 12])
+        records = self._records(self.path)
+        expected = np.frombuffer(b"".join(play_game(seed, 1, 20)[0] for seed in (5, 6, 7)), dtype="<u8")
+        np.testing.assert_array_equal(records["board"], expected)
+
+    def test_resume_matches_an_uninterrupted_export(self):
+        whole = os.path.join(self.path, "whole")
+        run_export(whole, games=4, workers=0, **SETTINGS)
+
+        resumed = os.path.join(self.path, "resumed")
+        run_export(resumed, games=2, workers=0, **SETTINGS)
+        # Records written after the last commit are discarded on resume
+        writer = ShardWriter(resumed, 16, {"seed": 0, "depth": 1, "max_moves": 20})
+        writer.append(*play_game(99, 1, 5))
+        writer.close()
+        run_export(resumed, games=4, workers=0, **SETTINGS)
+
+        np.testing.assert_array_equal(self._records(resumed), self._records(whole))
+
+    def test_process_pool_matches_in_process(self):
+        inline = os.path.join(self.path, "inline")
+        pooled = os.path.join(self.path, "pooled")
+        run_export(inline, games=3, workers=0, **SETTINGS)
+        run_export(pooled, games=3, workers=1, **SETTINGS)
+        np.testing.assert_array_equal(self._records(pooled), self._records(inline))
+
+    def test_resume_with_other_settings_fails(self):
+        run_export(self.path, games=1, workers=0, **SETTINGS)
+        with self.assertRaises(ExportException):
+            run_export(self.path, games=2, workers=0, depth=2, max_moves=20, shard_size=16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from src.recommendation.prompt.ollama import OllamaRecommender
+from src.tools.fake_ollama import FakeOllamaConfig, FakeOllamaServer, LatencyDistribution
+
+
+class TestFakeOllamaServer(unittest.TestCase):
+    def setUp(self):
+        self.grid = [
+            [2, 2, None, None],
+            [None, None, None, None],
+            [None, None, None, None],
+            [None, None, None, None]
+        ]
+
+    def test_lists_configured_models(self):
+        """Test that the Ollama client discovers the configured models."""
+        with FakeOllamaServer(FakeOllamaConfig(models=["fake:1b"])) as server:
+            recommender = OllamaRecommender(server.url, timeout=5)
+            self.assertEqual(recommender.list_available_models_from_client(), ["fake:1b"])
+
+    def test_chat_picks_legal_move(self):
+        """Test that chat replies choose among the legal moves in the prompt."""
+        with FakeOllamaServer(FakeOllamaConfig(models=["fake:1b"], seed=1)) as server:
+            recommender = OllamaRecommender(server.url, timeout=5)
+            for _ in range(5):
+                move, rationale = recommender.suggest_move(self.grid, "fake:1b")
+                self.assertIn(move, ["down", "left", "right"])
+                self.assertTrue(rationale)
+            usage = recommender.usage.snapshot()["fake:1b"]
+            self.assertEqual(usage.calls, 5)
+            self.assertGreater(usage.prompt_tokens, 0)
+
+    def test_error_rate(self):
+        """Test that simulated server errors surface as query errors."""
+        config = FakeOllamaConfig(models=["fake:1b"], error_rate=1.0)
+        with FakeOllamaServer(config) as server:
+            recommender = OllamaRecommender(server.url, timeout=5)
+            with self.assertRaises(Exception):
+                recommender.suggest_move(self.grid, "fake:1b")
+
+    def test_malformed_rate(self):
+        """Test that non-JSON replies still yield a legal move without a rationale."""
+        config = FakeOllamaConfig(models=["fake:1b"], malformed_rate=1.0)
+        with FakeOllamaServer(config) as server:
+            recommender = OllamaRecommender(server.url, timeout=5)
+            move, rationale = recommender.suggest_move(self.grid, "fake:1b")
+            self.assertIn(move, ["down", "left", "right"])
+            self.assertEqual(rationale, "")
+
+    def test_latency_distributions(self):
+        """Test parsing and sampling of latency distributions."""
+        rng = random.Random(0)
+        self.assertEqual(LatencyDistribution.parse("fixed:0.25").sample(rng), 0.25)
+        self.assertTrue(0.1 <= LatencyDistribution.parse("uniform:0.1,0.2").sample(rng) <= 0.2)
+        self.assertGreater(LatencyDistribution.parse("lognormal:0.3,0.5").sample(rng), 0.0)
+        with self.assertRaises(ValueError):
+            LatencyDistribution.parse("gaussian:1")
+
+
+if __name__ == '__main__':
+    unittest.main()
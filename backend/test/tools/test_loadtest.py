@@ -0,0 +1,38 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.app.app import app
+from src.tools.loadtest import percentile, run_recommend_load, sample_grids
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 90) == 5.0
+    assert percentile(values, 0) == 1.0
+    assert percentile([], 99) == 0.0
+
+
+def test_sample_grids_are_reproducible():
+    """Test that seeded grids are identical across calls."""
+    assert sample_grids(3, seed=7) == sample_grids(3, seed=7)
+
+
+@pytest.mark.asyncio
+async def test_run_recommend_load():
+    """Test a short in-process run against the heuristic recommender."""
+    app.state.limiter.enabled = False
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            report = await run_recommend_load(
+                ac, rate=20, duration=0.25, provider="heuristic", model="simple",
+                grids=sample_grids(2, seed=1),
+            )
+    finally:
+        app.state.limiter.enabled = True
+
+    assert report.sent == 5
+    assert report.stats.statuses[200] == 5
+    assert report.fallbacks == 0
+    assert "p99" in report.format()
@@ -0,0 +1,46 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.app.app import app
+from src.tools.fake_ollama import LatencyDistribution
+from src.tools.players import run_players
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("session", [False, True])
+async def test_run_players(session):
+    """Test that players play token and session games and ask for recommendations."""
+    app.state.limiter.enabled = False
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            report = await run_players(
+                ac, players=3, duration=0.3, think_time=LatencyDistribution("fixed", [0.005]),
+                recommend_ratio=0.5, session=session, seed=1,
+            )
+    finally:
+        app.state.limiter.enabled = True
+
+    assert report.games_started >= 3
+    assert report.moves > 0
+    assert report.stats["/api/move"].statuses[200] > 0
+    assert report.stats["/api/recommend"].statuses[200] > 0
+    assert report.stats["/api/move"].statuses[429] == 0
+    assert "/api/recommend" in report.format()
+
+
+@pytest.mark.asyncio
+async def test_run_players_reports_rate_limits():
+    """Test that 429s from slowapi are counted per endpoint."""
+    app.state.limiter._storage.reset()
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            report = await run_players(
+                ac, players=12, duration=0.2, think_time=LatencyDistribution("fixed", [0.01]),
+                recommend_ratio=0.0, seed=2,
+            )
+    finally:
+        app.state.limiter._storage.reset()
+
+    new_game = report.stats["/api/new"]
+    assert new_game.statuses[429] > 0
+    assert new_game.summary(report.elapsed)["rate_limited"] > 0
@@ -0,0 +1,27 @@
+import tempfile
+import unittest
+
+from src.game.direction import Direction
+from src.game.journal import GameJournal, JournalRecord, MoveLog
+from src.tools.replay import find_record, format_stats
+
+
+class TestReplayTool(unittest.TestCase):
+    def test_find_and_stats(self):
+        with tempfile.TemporaryDirectory() as directory:
+            journal = GameJournal(directory, segment_bytes=1 << 20)
+            for seed in (11, 12):
+                moves = MoveLog()
+                moves.append(Direction.LEFT)
+                journal.append(JournalRecord(seed, 4, moves))
+            journal.close()
+
+            self.assertEqual(find_record(directory, 1).seed, 12)
+            self.assertIsNone(find_record(directory, 2))
+            stats = format_stats(directory)
+            self.assertIn("games:    2", stats)
+            self.assertIn("moves:    2", stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from src.tools.tournament import (
+    default_entrants,
+    mean_interval,
+    parse_entrant,
+    play_game,
+    run_tournament,
+    wilson_interval,
+)
+
+
+class TestIntervals(unittest.TestCase):
+    def test_wilson_interval(self):
+        low, high = wilson_interval(5, 10)
+        self.assertAlmostEqual(low, 0.2366, places=3)
+        self.assertAlmostEqual(high, 0.7634, places=3)
+        self.assertEqual(wilson_interval(10, 10)[1], 1.0)
+        self.assertGreater(wilson_interval(10, 10)[0], 0.6)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+
+    def test_mean_interval(self):
+        self.assertEqual(mean_interval([4.0]), (4.0, 0.0))
+        mean, spread = mean_interval([1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(mean, 2.5)
+        self.assertAlmostEqual(spread, 1.96 * (5 / 3 / 4) ** 0.5)
+
+
+class TestTournament(unittest.TestCase):
+    def test_parse_entrant(self):
+        self.assertEqual(parse_entrant("ollama/llama3.1:8b"), ("ollama", "llama3.1:8b", None))
+        self.assertEqual(parse_entrant("heuristic/expectimax@2"), ("heuristic", "expectimax", 2))
+        for entrant in ("simple", "heuristic/simple@2", "heuristic/expectimax@0"):
+            with self.assertRaises(ValueError):
+                parse_entrant(entrant)
+
+    def test_games_are_reproducible(self):
+        first = play_game("heuristic/expectimax@1", 4, 4, 64, 0)
+        second = play_game("heuristic/expectimax@1", 4, 4, 64, 0)
+        self.assertTrue(first.won)
+        self.assertEqual(first.max_tile, 64)
+        self.assertEqual((first.moves, first.max_tile), (second.moves, second.max_tile))
+        self.assertEqual(len(first.latencies), first.moves)
+
+    def test_max_moves_cuts_games_short(self):
+        result = play_game("heuristic/simple", 0, 4, 2048, 10)
+        self.assertEqual(result.moves, 10)
+        self.assertFalse(result.won)
+
+    def test_entrants_play_the_same_games(self):
+        entrants = ["heuristic/simple", "heuristic/expectimax@1"]
+        report = run_tournament(entrants, games=3, seed=2, goal_number=32, workers=0)
+
+        for entrant in entrants:
+            self.assertEqual(sorted(report.stats[entrant].results), [2, 3, 4])
+            summary = report.stats[entrant].to_dict()
+            self.assertEqual(summary["games"], 3)
+            self.assertEqual(summary["max_tile_mean"], 32.0)
+            self.assertGreater(summary["moves_per_second"], 0)
+        self.assertEqual(sum(report.head_to_head(*entrants)), 3)
+        wins, draws, losses = report.head_to_head(*entrants)
+        self.assertEqual(report.head_to_head(*reversed(entrants)), (losses, draws, wins))
+        self.assertIn("heuristic/simple vs heuristic/expectimax@1", report.format())
+
+    def test_process_pool_matches_in_process(self):
+        entrants = ["heuristic/simple", "heuristic/expectimax@1"]
+        inline = run_tournament(entrants, games=2, goal_number=32, workers=0)
+        pooled = run_tournament(entrants, games=2, goal_number=32, workers=1)
+        for entrant in entrants:
+            self.assertEqual(
+                [(r.seed, r.moves, r.max_tile) for r in inline.stats[entrant].results.values()],
+                [(r.seed, r.moves, r.max_tile) for r in pooled.stats[entrant].results.values()],
+            )
+
+    def test_default_entrants_skip_recommenders_that_cannot_play(self):
+        entrants = default_entrants(4)
+        self.assertIn("heuristic/expectimax", entrants)
+        self.assertNotIn("heuristic/perfect", entrants)
+
+    def test_unregistered_entrant(self):
+        with self.assertRaises(ValueError):
+            play_game("heuristic/missing", 0, 4, 2048, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
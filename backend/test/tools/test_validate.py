@@ -0,0 +1,63 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src.game.board import GameBoard
+from src.game.direction import Direction
+from src.game.journal import GameJournal, JournalRecord, MoveLog
+from src.tools.validate import run_validation
+
+
+def _moves(seed: int, count: int):
+    game = GameBoard.create_new(seed=seed)
+    moves = MoveLog()
+    for index in range(count):
+        direction = (Direction.LEFT, Direction.DOWN, Direction.RIGHT, Direction.UP)[index % 4]
+        if game.status().is_terminal:
+            break
+        turns = game.turns
+        direction.apply_to_board(game)
+        if game.turns > turns:
+            moves.append(direction)
+    return moves
+
+
+class TestValidateTool(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.ndjson = os.path.join(self.directory.name, "games.ndjson")
+        with open(self.ndjson, "w", encoding="utf-8") as file:
+            for seed in range(4):
+                moves = "".join(direction.value[0] for direction in _moves(seed, 60))
+                file.write(json.dumps({"id": seed, "seed": seed, "moves": moves}) + "\n")
+            file.write(json.dumps({"id": "forged", "seed": 0, "moves": "llllllll"}) + "\n")
+            file.write("not json\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_ndjson_inline(self):
+        failures = io.StringIO()
+        summary = run_validation([self.ndjson], workers=0, chunk_size=2, failures=failures)
+        self.assertEqual((summary.games, summary.valid), (6, 4))
+        self.assertEqual(summary.violations["malformed"], 1)
+        rejected = [json.loads(line) for line in failures.getvalue().splitlines()]
+        self.assertEqual([failure["id"] for failure in rejected], ["forged", f"{self.ndjson}:6"])
+
+    def test_journal_in_process_pool(self):
+        journal_directory = os.path.join(self.directory.name, "journal")
+        journal = GameJournal(journal_directory, segment_bytes=1 << 20)
+        for seed in range(8):
+            journal.append(JournalRecord(seed, 4, _moves(seed, 100)))
+        journal.close()
+
+        summary = run_validation([journal_directory, self.ndjson], workers=2, chunk_size=3)
+        self.assertEqual((summary.games, summary.valid), (14, 12))
+        self.assertGreater(summary.moves, 0)
+        self.assertIn("games:", summary.format())
+
+
+if __name__ == '__main__':
+    unittest.main()
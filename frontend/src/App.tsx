@@ -70,7 +70,9 @@ const App: React.FC = () => {
     if (!grid || isGameOver) return;
 
     try {
-      const data = await ServerTransport.move(grid, direction, turns);
+      // A player who asked for a recommendation before this move is likely to ask again
+      const recommender = recommendation ? `${selectedProvider}/${selectedModel}` : undefined;
+      const data = await ServerTransport.move(grid, direction, turns, recommender);
 
       // Only update if grid changed
       if (JSON.stringify(grid) !== JSON.stringify(data.grid)) {
@@ -87,7 +89,7 @@ const App: React.FC = () => {
     } catch (err) {
       handleApiError(err);
     }
-  }, [grid, isGameOver, turns, handleApiError]);
+  }, [grid, isGameOver, turns, recommendation, selectedProvider, selectedModel, handleApiError]);
 
   useEffect(() => {
     startNewGame();
@@ -35,7 +35,7 @@ export const ModelSelector: React.FC<ModelSelectorProps> = ({
             >
                 {models.map((m) => (
                     <option key={`${m.provider}/${m.model}`} value={`${m.provider}/${m.model}`}>
-                        {m.display_name}
+                        {m.display_name}{m.circuit_state === 'open' ? ' (unavailable)' : ''}
                     </option>
                 ))}
             </select>
@@ -43,11 +43,17 @@ export const ServerTransport = {
         return handleResponse<Grid>(response);
     },
 
-    move: async (grid: Grid, direction: string, turns: number): Promise<MoveResponse> => {
+    move: async (
+        grid: Grid,
+        direction: string,
+        turns: number,
+        recommender?: string
+    ): Promise<MoveResponse> => {
+        // "provider/model" the player is following, so the server can precompute its next recommendation
         const response = await fetch(`${SERVER_HOST}/api/move`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ grid, direction, turns }),
+            body: JSON.stringify({ grid, direction, turns, recommender }),
         });
         return handleResponse<MoveResponse>(response);
     },
@@ -18,6 +18,7 @@ export interface ModelInfo {
     provider: string;
     model: string;
     display_name: string;
+    circuit_state?: 'closed' | 'open' | 'half_open';
 }
 
 export interface ModelsResponse {
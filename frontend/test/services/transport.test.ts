@@ -72,6 +72,23 @@ describe('Transport Service', () => {
             });
             expect(result).toEqual(mockMoveResponse);
         });
+
+        it('should send the followed recommender when given', async () => {
+            fetchMock.mockResolvedValue({
+                ok: true,
+                json: async () => mockMoveResponse,
+            });
+
+            await ServerTransport.move(mockGrid, 'left', 0, 'heuristic/expectimax');
+
+            expect(fetchMock).toHaveBeenCalledWith('/api/move', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    grid: mockGrid, direction: 'left', turns: 0, recommender: 'heuristic/expectimax',
+                }),
+            });
+        });
     });
 
     describe('getRecommendation', () => {